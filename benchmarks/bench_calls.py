@@ -0,0 +1,72 @@
+#! /usr/bin/env python3
+
+"""Per-call overhead of the MediaPlayer getters.
+
+For each getter, this compares the cost of a call through:
+
+* the generated Python function, which looks up the ctypes function
+  in ``_Cfunctions`` on every call (the only behaviour before the
+  module functions were rebound, unless running ``python -O``),
+* the module function once it has been rebound to the ctypes
+  function object,
+* the :class:`MediaPlayer` method, which calls the ctypes function
+  object bound to the instance once it has been bound.
+
+Run it with the bindings to measure in the ``PYTHONPATH``, e.g.::
+
+    PYTHONPATH=generated/3.0 python3 benchmarks/bench_calls.py
+"""
+
+import sys
+import timeit
+
+import vlc
+
+GETTERS = (
+    ("get_time", "libvlc_media_player_get_time"),
+    ("get_position", "libvlc_media_player_get_position"),
+    ("get_state", "libvlc_media_player_get_state"),
+    ("get_rate", "libvlc_media_player_get_rate"),
+    ("get_length", "libvlc_media_player_get_length"),
+    ("get_fps", "libvlc_media_player_get_fps"),
+    ("is_playing", "libvlc_media_player_is_playing"),
+    ("audio_get_volume", "libvlc_audio_get_volume"),
+)
+
+
+def per_call(stmt, number, repeat=5):
+    """Return the best per-call time of *stmt* in nanoseconds."""
+    t = timeit.Timer(stmt)
+    return min(t.repeat(repeat=repeat, number=number)) * 1e9 / number
+
+
+def main(number=200000):
+    print("Checking %s (%s)" % (vlc.__file__, vlc.__version__))
+    # Keep the generated Python functions before they get rebound.
+    wrappers = dict((f, getattr(vlc, f)) for _, f in GETTERS)
+    player = vlc.Instance("--no-audio", "--no-video").media_player_new()
+
+    print("%-18s %10s %10s %10s" % ("getter", "wrapper", "rebound", "method"))
+    for meth, f in GETTERS:
+        try:
+            wrappers[f](player)  # first call binds (and rebinds) it
+        except NameError:
+            print("%-18s %10s" % (meth, "missing"))
+            continue
+        w = wrappers[f]
+        r = getattr(vlc, f)
+        m = getattr(player, meth)
+        print(
+            "%-18s %8.0fns %8.0fns %8.0fns"
+            % (
+                meth,
+                per_call(lambda: w(player), number),
+                per_call(lambda: r(player), number),
+                per_call(m, number),
+            )
+        )
+    player.release()
+
+
+if __name__ == "__main__":
+    main(*[int(a) for a in sys.argv[1:2]])
@@ -0,0 +1,88 @@
+#! /usr/bin/env python3
+
+"""Import time and memory of the vlc module.
+
+Each measure is done in a new interpreter:
+
+* cold: without cached bytecode, so that the module is compiled,
+* warm: with the bytecode cached by a previous import,
+
+reporting the import time (best of *repeat*) and the memory allocated
+by the import (from tracemalloc, in a separate run since tracing slows
+the import down). The libvlc library itself is loaded by both.
+
+Give the directories of the modules to compare (default: the one found
+in the ``PYTHONPATH``), e.g. to compare eager and lazy bindings::
+
+    python3 benchmarks/bench_import.py generated/3.0 build/lazy
+"""
+
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+
+# Run in the child interpreter
+CHILD = """
+import json, sys, time, tracemalloc
+if sys.argv[1] == "memory":
+    tracemalloc.start()
+t = time.perf_counter()
+import vlc
+t = time.perf_counter() - t
+json.dump({"time": t, "memory": tracemalloc.get_traced_memory()[0],
+           "lazy": len(getattr(vlc, "_Clazy", ())), "file": vlc.__file__},
+          sys.stdout)
+"""
+
+
+def measure(path, cache, what="time"):
+    """Import vlc from *path* with the bytecode cache in *cache*."""
+    env = dict(os.environ, PYTHONPYCACHEPREFIX=cache)
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    if path:
+        env["PYTHONPATH"] = os.pathsep.join(
+            [path] + [p for p in [os.environ.get("PYTHONPATH")] if p]
+        )
+    out = subprocess.run(
+        [sys.executable, "-c", CHILD, what], env=env, capture_output=True, check=True
+    ).stdout
+    return json.loads(out)
+
+
+def main(paths, repeat=5):
+    print("%-40s %5s %10s %10s %10s %10s" % ("module", "lazy", "cold", "", "warm", ""))
+    for path in paths or [""]:
+        cold, warm = [], []
+        for _ in range(repeat):
+            cache = tempfile.mkdtemp(prefix="bench_import")
+            try:
+                cold.append(measure(path, cache))
+                warm.append(measure(path, cache))
+            finally:
+                shutil.rmtree(cache)
+        c = min(cold, key=lambda r: r["time"])
+        w = min(warm, key=lambda r: r["time"])
+        cache = tempfile.mkdtemp(prefix="bench_import")
+        try:
+            c["memory"] = measure(path, cache, "memory")["memory"]
+            w["memory"] = measure(path, cache, "memory")["memory"]
+        finally:
+            shutil.rmtree(cache)
+        print(
+            "%-40s %5d %8.1fms %8.0fkB %8.1fms %8.0fkB"
+            % (
+                c["file"][-40:],
+                c["lazy"],
+                c["time"] * 1e3,
+                c["memory"] / 1e3,
+                w["time"] * 1e3,
+                w["memory"] / 1e3,
+            )
+        )
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
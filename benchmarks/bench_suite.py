@@ -0,0 +1,496 @@
+#! /usr/bin/env python3
+
+"""Benchmark suite of the bindings overhead.
+
+It measures, with the bindings found in the ``PYTHONPATH``:
+
+* import: the (warm) import time of the module, see bench_import.py,
+* bind: the first call of a libvlc function, which binds it,
+* call: steady state getter and setter calls,
+* constructor: the creation of a Python object for a libvlc pointer,
+* events: the EventManager dispatch to 1, 10 and 100 Python callbacks,
+  through its queue, coalesced, decoded, recorded, measured, and an
+  EventHub of 300 players,
+* video: the video lock/unlock/display callbacks, and VideoFrameSink
+  with a consumer and with its "latest" policy, and SharedFrameSink,
+* read: the media read callback,
+
+the last three (and the libvlc part of the others) being driven by the
+fake libvlc of tests/fakevlc, which must be loaded through the
+``PYTHON_VLC_LIB_PATH`` environment variable to get comparable
+results (with a real libvlc, only the first four are run). Build it
+with ``make fakevlc``, then::
+
+    PYTHON_VLC_LIB_PATH=tests/fakevlc/libvlc.so PYTHONPATH=generated/3.0 \\
+        python3 benchmarks/bench_suite.py -o results.json -b benchmarks/baseline.json
+
+Each result is the median of several runs of the whole suite, in as
+many processes, each taking the best of its measures. The results are written as JSON, and
+compared with a previous result file (e.g. the committed baseline.json,
+produced the same way) if given: the exit status is 1 if a result is
+worse than the baseline by more than the tolerance (scaled for the
+noisier units, see TOLERANCE_SCALE). ``make bench`` does all of this.
+"""
+
+import argparse
+import ctypes
+import io
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import vlc
+from bench_import import measure
+
+FAKEVLC = hasattr(vlc.dll, "fakevlc_emit")
+
+# Getters and setters of the call benchmark
+CALLS = (
+    ("get_time", ()),
+    ("get_position", ()),
+    ("get_state", ()),
+    ("is_playing", ()),
+    ("audio_get_volume", ()),
+    ("set_time", (0,)),
+    ("set_position", (0.0,)),
+    ("audio_set_volume", (50,)),
+    ("status", ()),
+)
+
+# Numbers of subscribers of the events benchmark
+SUBSCRIBERS = (1, 10, 100)
+
+# Functions of the bind benchmark
+BIND = (
+    "libvlc_media_player_get_time",
+    "libvlc_media_player_set_time",
+    "libvlc_media_player_get_media",
+    "libvlc_audio_get_volume",
+    "libvlc_video_get_size",
+)
+
+# Scale of the tolerance per unit: the timings of a few microseconds
+# or less vary more than the others between processes
+TOLERANCE_SCALE = {"ns": 2, "us": 2}
+
+benchmarks = []
+
+
+def benchmark(func):
+    """Register a benchmark function, which returns a dict of results
+    as returned by :func:`result`.
+    """
+    benchmarks.append(func)
+    return func
+
+
+def result(value, unit, better="lower"):
+    return {"value": value, "unit": unit, "better": better}
+
+
+def best(func, number, repeat=5):
+    """Return the best time of *repeat* calls of *func(number)*, divided
+    by *number*.
+    """
+    times = []
+    for _ in range(repeat):
+        t = time.perf_counter()
+        func(number)
+        times.append(time.perf_counter() - t)
+    return min(times) / number
+
+
+def timed(func, *args):
+    """Return a function calling *func* with *args* *number* times."""
+
+    def run(number):
+        for _ in range(number):
+            func(*args)
+
+    return run
+
+
+def fakevlc(name, restype, *argtypes):
+    """Return the *name* hook of the fake libvlc, see fakevlc.c."""
+    f = getattr(vlc.dll, name)
+    f.restype = restype
+    f.argtypes = argtypes
+    return f
+
+
+@benchmark
+def bench_import(ctx):
+    cache = tempfile.mkdtemp(prefix="bench_suite")
+    path = os.path.dirname(vlc.__file__)
+    try:
+        measure(path, cache)  # compile it
+        t = min(measure(path, cache)["time"] for _ in range(ctx.repeat))
+    finally:
+        shutil.rmtree(cache)
+    return {"import.warm": result(t * 1e3, "ms")}
+
+
+@benchmark
+def bench_bind(ctx):
+    res = {}
+    player = ctx.player
+    for name in BIND:
+        f = getattr(vlc, name)
+        args = [player] + [0] * (vlc.len_args(f) - 1)
+        f(*args)
+        f = vlc._Cfunctions[name]
+        # the Python function (or manifest stub) which bound it
+        func = getattr(f, "__wrapped__", f)
+
+        def bind(number):
+            for _ in range(number):
+                del vlc._Cfunctions[name]
+                vlc._Globals[name] = func
+                func(*args)
+
+        res["bind." + name] = result(best(bind, ctx.number // 100) * 1e6, "us")
+    return res
+
+
+@benchmark
+def bench_call(ctx):
+    res = {}
+    player = ctx.player
+    for meth, args in CALLS:
+        m = getattr(player, meth)
+        res["call." + meth] = result(best(timed(m, *args), ctx.number) * 1e9, "ns")
+    return res
+
+
+@benchmark
+def bench_constructor(ctx):
+    media = ctx.instance.media_new("fake://")
+    ptr = media._as_parameter_.value
+    ctx.player.set_media(media)
+    res = {
+        "constructor._Constructor": result(
+            best(timed(vlc._Constructor, vlc.Media, ptr), ctx.number) * 1e9, "ns"
+        ),
+        "constructor.get_media": result(
+            best(timed(ctx.player.get_media), ctx.number) * 1e9, "ns"
+        ),
+    }
+    ctx.player.set_media(None)
+    media.release()
+    return res
+
+
+@benchmark
+def bench_events(ctx):
+    if not FAKEVLC:
+        return {}
+    emit = fakevlc(
+        "fakevlc_emit", ctypes.c_int, vlc.EventManager, ctypes.c_int, ctypes.c_int
+    )
+    em = ctx.player.event_manager()
+    event = vlc.EventType.MediaPlayerTimeChanged
+    em.event_attach(event, lambda e: None)
+    t = best(lambda n: emit(em, event.value, n), ctx.number)
+    em.event_detach(event)
+    res = {"events.dispatch": result(1 / t, "events/s", "higher")}
+    for n in SUBSCRIBERS:
+        subs = [em.event_subscribe(event, lambda e: None) for _ in range(n)]
+        t = best(lambda number: emit(em, event.value, number), ctx.number // n)
+        for s in subs:
+            em.event_unsubscribe(s)
+        res["events.subscribers.%d" % n] = result(1 / t, "events/s", "higher")
+
+    # copied by the native callback, then dispatched by drain()
+    em.event_attach(event, lambda e: None)
+    number = ctx.number // 10
+    q = em.event_queue(number)
+    t = best(lambda n: (emit(em, event.value, n), q.drain()), number)
+    em.event_queue(0)
+    em.event_detach(event)
+    res["events.queued"] = result(1 / t, "events/s", "higher")
+
+    # dropped by the native callback, but for the first one
+    em.event_attach(event, lambda e: None)
+    em.event_coalesce(event, interval=3600)
+    t = best(lambda n: emit(em, event.value, n), ctx.number)
+    em.event_coalesce(event)
+    em.event_detach(event)
+    res["events.coalesced"] = result(1 / t, "events/s", "higher")
+
+    # 10 subscribers reading the event type and value, from the Event
+    # structure, then from the record decoded once for all of them
+    subs = [
+        em.event_subscribe(event, lambda e: (e.type, e.u.new_time)) for _ in range(10)
+    ]
+    t = best(lambda n: emit(em, event.value, n), ctx.number // 10)
+    res["events.read"] = result(1 / t, "events/s", "higher")
+    em.event_records()
+    t = best(lambda n: emit(em, event.value, n), ctx.number // 10)
+    em.event_records(False)
+    for s in subs:
+        em.event_unsubscribe(s)
+    res["events.records"] = result(1 / t, "events/s", "higher")
+
+    # written to an in-memory event file
+    recorder = vlc.EventRecorder(em, io.BytesIO(), [event])
+    t = best(lambda n: emit(em, event.value, n), ctx.number // 10)
+    recorder.close()
+    res["events.recorded"] = result(1 / t, "events/s", "higher")
+
+    # timed into a latency histogram
+    em.event_attach(event, lambda e: None)
+    em.event_latency(vlc.CallbackLatency(budget=0.04))
+    t = best(lambda n: emit(em, event.value, n), ctx.number)
+    em.event_latency(None)
+    em.event_detach(event)
+    res["events.latency"] = result(1 / t, "events/s", "higher")
+
+    # through the table of a hub shared by 300 players
+    players = [ctx.instance.media_player_new() for _ in range(300)]
+    hub = vlc.EventHub()
+    hub.event_subscribe(event, lambda e: None)
+    for p in players:
+        hub.add(p)
+    pem = players[-1].event_manager()
+    t = best(lambda n: emit(pem, event.value, n), ctx.number)
+    hub.close()
+    for p in players:
+        p.release()
+    res["events.hub"] = result(1 / t, "events/s", "higher")
+    return res
+
+
+@benchmark
+def bench_video(ctx):
+    if not FAKEVLC:
+        return {}
+    run_video = fakevlc(
+        "fakevlc_run_video", ctypes.c_int, vlc.MediaPlayer, ctypes.c_int
+    )
+    stop_video = fakevlc("fakevlc_stop_video", None, vlc.MediaPlayer)
+    buf = ctypes.create_string_buffer(320 * 240 * 4)
+    address = ctypes.addressof(buf)
+
+    @vlc.CallbackDecorators.VideoLockCb
+    def lock(opaque, planes):
+        planes[0] = address
+
+    @vlc.CallbackDecorators.VideoUnlockCb
+    def unlock(opaque, picture, planes):
+        pass
+
+    @vlc.CallbackDecorators.VideoDisplayCb
+    def display(opaque, picture):
+        pass
+
+    player = ctx.instance.media_player_new()
+    media = ctx.instance.media_new("fake://")
+    player.set_media(media)
+    player.video_set_callbacks(lock, unlock, display, None)
+    player.video_set_format("RV32", 320, 240, 320 * 4)
+    t = best(lambda n: run_video(player, n), ctx.number // 10)
+    stop_video(player)
+    res = {"video.frames": result(1 / t, "frames/s", "higher")}
+
+    # into the pool of a sink, released at once
+    sink = vlc.VideoFrameSink(player, "RV32", callback=vlc.VideoFrame.release)
+    t = best(lambda n: run_video(player, n), ctx.number // 10)
+    stop_video(player)
+    sink.close()
+    res["video.sink"] = result(1 / t, "frames/s", "higher")
+
+    # into the ring of a sink keeping the latest frame, never consumed
+    sink = vlc.VideoFrameSink(player, "RV32", policy="latest")
+    t = best(lambda n: run_video(player, n), ctx.number // 10)
+    stop_video(player)
+    sink.close()
+    res["video.sink.latest"] = result(1 / t, "frames/s", "higher")
+
+    # into the shared memory ring of a SharedFrameSink
+    sink = vlc.SharedFrameSink(player, 320, 240, "RV32")
+    t = best(lambda n: run_video(player, n), ctx.number // 10)
+    stop_video(player)
+    sink.close()
+    res["video.shared"] = result(1 / t, "frames/s", "higher")
+    player.release()
+    media.release()
+    return res
+
+
+@benchmark
+def bench_read(ctx):
+    if not FAKEVLC:
+        return {}
+    run_read = fakevlc(
+        "fakevlc_run_read", ctypes.c_int64, vlc.Media, ctypes.c_size_t, ctypes.c_int64
+    )
+    chunk = 4096
+
+    @vlc.CallbackDecorators.MediaReadCb
+    def read(opaque, buf, size):
+        return size
+
+    media = ctx.instance.media_new_callbacks(None, read, None, None, None)
+    t = best(lambda n: run_read(media, chunk, n * chunk), ctx.number // 10)
+    media.release()
+    return {"read.calls": result(1 / t, "reads/s", "higher")}
+
+
+def reference(ctx):
+    """Return the time of a builtin function call, in nanoseconds, to
+    scale the baseline by the speed of the machine, which may change
+    between runs (e.g. with its load or frequency).
+    """
+    return best(timed(abs, -1), ctx.number, ctx.repeat) * 1e9
+
+
+def compare(results, baseline, tolerance, speed=1.0):
+    """Print the comparison of *results* with *baseline*, scaled by the
+    relative *speed* of the machine, and return the names of the results
+    worse by more than *tolerance*.
+    """
+    regressions = []
+    print("%-40s %20s %20s %8s" % ("benchmark", "baseline", "result", "change"))
+    for name, r in sorted(results.items()):
+        b = baseline.get(name)
+        if b is None or b["unit"] != r["unit"]:
+            print("%-40s %20s %11.4g %-8s" % (name, "-", r["value"], r["unit"]))
+            continue
+        value = b["value"] / speed if r["better"] == "lower" else b["value"] * speed
+        change = r["value"] / value - 1
+        t = tolerance * TOLERANCE_SCALE.get(r["unit"], 1)
+        worse = change > t if r["better"] == "lower" else -change > t
+        if worse:
+            regressions.append(name)
+        print(
+            "%-40s %11.4g %-8s %11.4g %-8s %+7.1f%%%s"
+            % (
+                name,
+                value,
+                b["unit"],
+                r["value"],
+                r["unit"],
+                change * 100,
+                " !" if worse else "",
+            )
+        )
+    return regressions
+
+
+def run(ctx):
+    """Run the benchmarks once.
+
+    :return: the results, and the median time of :func:`reference`
+        measured before each benchmark.
+    """
+    ctx.instance = vlc.Instance("--no-audio", "--no-video")
+    ctx.player = ctx.instance.media_player_new()
+    results = {}
+    references = []
+    for bench in benchmarks:
+        if ctx.keyword and ctx.keyword not in bench.__name__:
+            continue
+        references.append(reference(ctx))  # as the benchmarks run
+        results.update(bench(ctx))
+    ctx.player.release()
+    ctx.instance.release()
+    return results, statistics.median(references)
+
+
+def run_process(ctx):
+    """Run the benchmarks once in a new process, since the timings also
+    change from a process to another (e.g. with its memory layout).
+
+    :return: see :func:`run`.
+    """
+    fd, path = tempfile.mkstemp(prefix="bench_suite", suffix=".json")
+    os.close(fd)
+    args = [sys.executable, os.path.abspath(__file__), "-s", "1", "-o", path]
+    args += ["-n", str(ctx.number), "-r", str(ctx.repeat)]
+    if ctx.keyword:
+        args += ["-k", ctx.keyword]
+    try:
+        subprocess.run(args, check=True, stdout=subprocess.DEVNULL)
+        with open(path) as f:
+            data = json.load(f)
+    finally:
+        os.remove(path)
+    return data["results"], data["meta"]["reference"]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("-o", "--output", help="write the results to this JSON file")
+    parser.add_argument("-b", "--baseline", help="compare with this JSON result file")
+    parser.add_argument(
+        "-t",
+        "--tolerance",
+        type=float,
+        default=0.3,
+        help="relative difference to the baseline reported as a regression (0.3)",
+    )
+    parser.add_argument(
+        "-n", "--number", type=int, default=100000, help="iterations per measure"
+    )
+    parser.add_argument("-r", "--repeat", type=int, default=5, help="measures")
+    parser.add_argument(
+        "-s",
+        "--runs",
+        type=int,
+        default=5,
+        help="runs of the suite, in as many processes, whose median is the result (5)",
+    )
+    parser.add_argument("-k", "--keyword", help="only run the matching benchmarks")
+    ctx = parser.parse_args(argv)
+
+    if ctx.runs > 1:
+        runs = [run_process(ctx) for _ in range(ctx.runs)]
+    else:
+        runs = [run(ctx)]
+    results = {}
+    for name, r in runs[0][0].items():
+        values = [x[0][name]["value"] for x in runs]
+        results[name] = dict(r, value=statistics.median(values))
+    ref = statistics.median(x[1] for x in runs)
+
+    data = {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "version": vlc.__version__,
+            "libvlc": vlc.bytes_to_str(vlc.libvlc_get_version()),
+            "date": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "runs": ctx.runs,
+            "reference": ref,
+        },
+        "results": results,
+    }
+    if ctx.output:
+        with open(ctx.output, "w") as f:
+            json.dump(data, f, indent=2, sort_keys=True)
+            f.write("\n")
+
+    baseline = {}
+    speed = 1.0
+    if ctx.baseline:
+        with open(ctx.baseline) as f:
+            data = json.load(f)
+        baseline = data["results"]
+        if "reference" in data["meta"]:
+            speed = data["meta"]["reference"] / ref
+            print("Machine speed relative to the baseline: %.2f" % speed)
+    regressions = compare(results, baseline, ctx.tolerance, speed)
+    if regressions:
+        print("Regressions: %s" % ", ".join(regressions))
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
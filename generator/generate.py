@@ -55,7 +55,9 @@ __version__ = "2.3"
 
 _debug = False
 
+import ast
 import enum
+import io
 import logging
 import operator
 import os
@@ -191,6 +193,106 @@ def snake_to_camel_case(name: str) -> str:
     )
 
 
+def _defined_name(node: ast.stmt) -> str:
+    """Return the name of the module level class, function or variable
+    defined (or completed, e.g. by ``Class.attr = value``) by *node*.
+    """
+    if isinstance(node, (ast.ClassDef, ast.FunctionDef)):
+        return node.name
+    if isinstance(node, ast.Assign) and len(node.targets) == 1:
+        t = node.targets[0]
+        while isinstance(t, ast.Attribute):
+            t = t.value
+        if isinstance(t, ast.Name):
+            return t.id
+    return ""
+
+
+def make_lazy(source: str, names: dict[str, str]) -> str:
+    """Define some module level names of the Python *source* on demand.
+
+    The definitions of the classes and functions in *names* (and the
+    statements completing them, such as enum values) are moved into a
+    ``_load_<family>()`` function per family, which defines them as
+    module globals and is registered in the ``_Clazy`` dict used by the
+    module ``__getattr__``, see ``header.py``. All other references to
+    these names are made through the ``_Cmodule`` module object, so
+    that they are defined on first use.
+
+    :param source: The generated Python module.
+    :param names: A dict mapping the names to define lazily to the name
+        of their family.
+
+    :return: The modified module source.
+    """
+    tree = ast.parse(source)
+    lines = [t.encode("utf-8") for t in source.splitlines(keepends=True)]
+
+    edits = {}  # line index: [(start, end) offsets of names]
+    moved = {}  # family: [(start, end) line indices of statements]
+    defined = {}  # family: {names}
+    for node in tree.body:
+        family = names.get(_defined_name(node))
+        if family:
+            defined.setdefault(family, set()).add(_defined_name(node))
+            start = node.lineno
+            for d in getattr(node, "decorator_list", ()):
+                start = min(start, d.lineno)
+            moved.setdefault(family, []).append((start - 1, node.end_lineno))
+        # refer to names of the other families through _Cmodule
+        for n in ast.walk(node):
+            if (
+                isinstance(n, ast.Name)
+                and isinstance(n.ctx, ast.Load)
+                and names.get(n.id, family) != family
+            ):
+                edits.setdefault(n.lineno - 1, []).append(
+                    (n.col_offset, n.end_col_offset)
+                )
+    for i, spans in edits.items():
+        t = lines[i]  # ast offsets are utf-8 byte offsets
+        for start, end in sorted(spans, reverse=True):
+            t = t[:start] + b"_Cmodule." + t[start:end] + t[end:]
+        lines[i] = t
+    lines = [t.decode("utf-8") for t in lines]
+
+    loaders = []
+    skip = set()
+    for family, spans in sorted(moved.items()):
+        loaders.append(f"def _load_{family}():")
+        loaders.append(
+            f'{_INDENT_}"""(INTERNAL) Define the {family} classes and functions."""'
+        )
+        g = []
+        for n in sorted(defined[family]):
+            if g and len(", ".join(g + [n])) > 72:
+                loaders.append(f"{_INDENT_}global {', '.join(g)}")
+                g = []
+            g.append(n)
+        loaders.append(f"{_INDENT_}global {', '.join(g)}")
+        for start, end in spans:
+            loaders.append("")
+            for t in lines[start:end]:
+                loaders.append((_INDENT_ + t if t.strip() else "").rstrip(_NL_))
+            skip.update(range(start, end))
+        loaders.append(_NL_)
+        loaders.append(
+            f"_Clazy.update(dict.fromkeys({tuple(sorted(defined[family]))!r}, _load_{family}))"
+        )
+        loaders.append(_NL_)
+
+    res = []
+    for i, t in enumerate(lines):
+        if loaders and t.startswith("# End of generated functions #"):
+            res.append(_NL_.join(loaders) + _NL_)
+            loaders = []
+        if i not in skip:
+            res.append(t)
+    if loaders:  # no marker
+        res.append(_NL_ + _NL_.join(loaders) + _NL_)
+    return "".join(res)
+
+
 def errorf(fmt, *args):
     r"""Print error to stderr.
 
@@ -2188,11 +2290,32 @@ class PythonGenerator(_Generator):
         "RendererDiscoverer",
     )
 
-    def __init__(self, parser: Parser):
+    # Rarely used families of classes and functions, identified by the
+    # prefixes of their C names, which are only defined on first access
+    # when generating lazy bindings, see make_lazy()
+    lazy_families = {
+        "dialog": ("libvlc_dialog_",),
+        "discoverer": ("libvlc_media_discoverer_",),
+        "equalizer": ("libvlc_audio_equalizer_", "libvlc_equalizer_"),
+        "log_iterator": (
+            "libvlc_log_iterator_",
+            "libvlc_log_get_iterator",
+            "libvlc_log_message_",
+        ),
+        "media_library": ("libvlc_media_library_",),
+        "renderer": ("libvlc_renderer_", "libvlc_rd_"),
+    }
+
+    def __init__(self, parser: Parser, lazy: bool = False, manifest: bool = False):
         """
         :param parser: a :class:`Parser` instance.
+        :param lazy: define the :attr:`lazy_families` on first access.
+        :param manifest: describe the functions in a ``_Cmanifest``
+            tuple, bound on first call, instead of defining them.
         """
         _Generator.__init__(self, parser)
+        self.lazy = lazy
+        self.manifest = manifest
 
         # Load override definitions
         self.overrides = self.parse_override(os.path.join(TEMPLATEDIR, "override.py"))
@@ -2234,7 +2357,10 @@ class PythonGenerator(_Generator):
             self.output(f"{indent}{_INDENT_}'''")
 
     def generate_funcs(self):
-        """Generate a ctypes decorator for all functions."""
+        """Generate a ctypes decorator for all functions, or their
+        manifest if :attr:`manifest` is set.
+        """
+        manifest = []
         for f in self.parser.funcs:
             name = f.name
 
@@ -2265,8 +2391,9 @@ class PythonGenerator(_Generator):
             # arg names, excluding output args
             args = ", ".join(f.args())
 
-            # tuples of arg flags
-            flags = ", ".join(str(p.flags(f.out)) for p in f.pars)
+            # tuples of arg flags and names, the latter to allow
+            # keyword arguments once the ctypes function is rebound
+            flags = ", ".join(str(p.flags(f.out)[:1] + (p.name,)) for p in f.pars)
             if flags:
                 flags += ","
 
@@ -2301,6 +2428,12 @@ class PythonGenerator(_Generator):
                 errcheck = "None"
                 types.insert(0, rtype)
 
+            if self.manifest:
+                entry = [name, tuple(p.flags(f.out)[:1] + (p.name,) for p in f.pars)]
+                entry.append(None if errcheck == "None" else errcheck)
+                manifest.append(tuple(entry + types))
+                continue
+
             types = ", ".join(types)
 
             self.output(f"def {name}({args}):")
@@ -2312,6 +2445,13 @@ class PythonGenerator(_Generator):
 """
             )
 
+        if self.manifest:
+            self.output("# name, parameter flags, errcheck, result and argument types")
+            self.output("_Cstubs((")
+            for entry in manifest:
+                self.output(f"{_INDENT_}{entry!r},")
+            self.output("))")
+
     def generate_enums(self):
         """Generate classes for all enum types."""
         for e in self.parser.enums:
@@ -2617,6 +2757,8 @@ Defined symbols:
                     self.output(f"{_INDENT_}'''{docs}{_NL_}{_INDENT_}'''")
 
                 c = self.overrides.codes.get(cls, "")
+                if "__slots__" not in c:
+                    self.output(f"{_INDENT_}__slots__ = (){_NL_}")
                 if "def __new__" not in c:
                     self.output("""
     def __new__(cls, ptr=_internal_guard):
@@ -2652,6 +2794,27 @@ Defined symbols:
             ).strip()
             if meth.endswith("event_manager"):
                 self.output(f"{_INDENT_}@memoize_parameterless")
+            elif meth == "release" and args == "self":
+                # drop the wrapper from the _Cinstances map first
+                self.output(f"{_INDENT_}def {meth}({args}):")
+                self.generate_docstring(docs, indent_lvl=1)
+                self.output(f"{_INDENT_ * 2}_Crelease(self)")
+                self.output(f"{_INDENT_ * 2}return {name}({wrapped_args}){_NL_}")
+                # a context manager, only for the objects to release
+                self.output(f"{_INDENT_}__enter__ = _Center")
+                self.output(f"{_INDENT_}__exit__ = _Cexit{_NL_}")
+                continue
+            elif meth == "retain" and args == "self":
+                # counted, released by as many release() calls
+                self.output(f"{_INDENT_}def {meth}({args}):")
+                self.generate_docstring(docs, indent_lvl=1)
+                self.output(f"{_INDENT_ * 2}_Cacquire(self)")
+                self.output(f"{_INDENT_ * 2}return {name}({wrapped_args}){_NL_}")
+                continue
+            elif wrapped_args == ", ".join(["self"] + f.args(1)):
+                # arguments passed on as is, call the ctypes function
+                # directly once it has been bound
+                self.output(f"{_INDENT_}@_Cmethod('{name}')")
             self.output(f"{_INDENT_}def {meth}({args}):")
             self.generate_docstring(docs, indent_lvl=1)
             self.output(f"{_INDENT_ * 2}return {name}({wrapped_args}){_NL_}")
@@ -2717,15 +2880,44 @@ Defined symbols:
 
         return Overrides(codes=codes, methods=methods, docstrs=docstrs)
 
+    def lazy_names(self):
+        """Return a dict mapping the names of the classes and functions
+        of the :attr:`lazy_families` to their family.
+        """
+
+        def family(name):
+            for f, prefixes in self.lazy_families.items():
+                if name.startswith(prefixes):
+                    return f
+            return None
+
+        names = {}
+        for t, c in self.type2class.items():
+            if c in self.defined_classes and family(t):
+                names[c] = family(t)
+        for items in (self.parser.enums, self.parser.structs, self.parser.callbacks):
+            for item in items:
+                if family(item.name):
+                    names[self.class4(item.name)] = family(item.name)
+        for f in self.parser.funcs:
+            if family(f.name):
+                names[f.name] = family(f.name)
+        return names
+
     def save(self, path=None, format=True):
         """Write Python bindings to a file or ``stdout``.
 
         and optionally format it with ruff.
         """
         self.outopen(path or "-")
+        if self.lazy:
+            out, self.file = self.file, io.StringIO()
         self.insert_code(os.path.join(TEMPLATEDIR, "header.py"), generate_items=True)
         self.unwrapped()
         self.insert_code(os.path.join(TEMPLATEDIR, "footer.py"))
+        if self.lazy:
+            out.write(make_lazy(self.file.getvalue(), self.lazy_names()))
+            self.file = out
         self.outclose()
 
         if path and path != "-" and path != "stdout" and format:
@@ -2988,6 +3180,24 @@ Parse VLC include files and generate bindings code for Python or Java."""
         help="Generate Java bindings (default is Python)",
     )
 
+    opt.add_option(
+        "-l",
+        "--lazy",
+        dest="lazy",
+        action="store_true",
+        default=False,
+        help="Define rarely used classes and functions on first access",
+    )
+
+    opt.add_option(
+        "-m",
+        "--manifest",
+        dest="manifest",
+        action="store_true",
+        default=False,
+        help="Describe the functions in a compact manifest instead of defining them",
+    )
+
     opt.add_option(
         "-o",
         "--output",
@@ -3071,7 +3281,7 @@ Parse VLC include files and generate bindings code for Python or Java."""
     if opts.java:
         g = JavaGenerator(p)
     else:
-        g = PythonGenerator(p)
+        g = PythonGenerator(p, lazy=opts.lazy, manifest=opts.manifest)
 
     if opts.check:
         p.check()
@@ -7,8 +7,13 @@ def callbackmethod(callback):
 
 
 # libvlc_free is not present in some versions of libvlc. If it is not
-# in the library, then emulate it by calling libc.free
-if not hasattr(dll, "libvlc_free"):
+# in the library, then emulate it by calling libc.free, once the
+# library is loaded.
+def _libvlc_free_fallback(lib):
+    """(INTERNAL) Define libvlc_free if missing from the library *lib*."""
+    global libvlc_free
+    if hasattr(lib, "libvlc_free"):
+        return
     # need to find the free function in the C runtime. This is
     # platform specific.
     # For Linux and MacOSX
@@ -28,6 +33,9 @@ if not hasattr(dll, "libvlc_free"):
     libvlc_free.argtypes = [ctypes.c_void_p]
 
 
+dll.on_load(_libvlc_free_fallback)
+
+
 # Version functions
 def _dot2int(v):
     """(INTERNAL) Convert 'i.i.i[.i]' str to int."""
@@ -112,6 +120,2141 @@ def print_version():
         print("Error: %s" % sys.exc_info()[1])
 
 
+class EventRecord(tuple):
+    """Base class of the events decoded for :meth:`EventManager.event_records`:
+    tuples of the event *type*, the *obj* pointer of its source and the
+    fields of its :class:`Event.U` member, also available by name, e.g.
+    *new_time* for the ``MediaPlayerTimeChanged`` events (the fields
+    named *type* are prefixed with ``u_``). Strings are copied as bytes.
+    """
+
+    __slots__ = ()
+    _fields = ("type", "obj")
+
+    def __repr__(self):
+        return "%s(%s)" % (
+            type(self).__name__,
+            ", ".join("%s=%r" % t for t in zip(self._fields, self)),
+        )
+
+    def _asdict(self):
+        """Return a dict of the fields."""
+        return dict(zip(self._fields, self))
+
+    @property
+    def u(self):
+        """The record itself, for callbacks written for :class:`Event`."""
+        return self
+
+
+# The EventRecord class, fields and struct format of the events, and
+# the functions decoding them, per event type value, see _event_layout()
+# and _event_decoder()
+_event_layouts = {}
+_event_decoders = {}
+
+
+def _event_member(name):
+    """(INTERNAL) Return the :class:`Event.U` member structure of the
+    *name* events, or None.
+    """
+    if name.startswith("MediaListView"):
+        name = "MediaList" + name[len("MediaListView") :]
+    elif name.startswith("MediaPlayerES"):
+        name = "MediaPlayerEsChanged"
+    elif name.startswith("Vlm"):
+        name = "VlmMediaEvent"
+    return getattr(Event.U, name, None)
+
+
+def _event_string(p):
+    """(INTERNAL) Copy the string at the address *p* of an event field."""
+    return ctypes.string_at(p) if p else None
+
+
+def _event_format(t):
+    """(INTERNAL) Return the :mod:`struct` format of the ctypes type *t*
+    of an event field, and the function converting its unpacked value,
+    or None: the pointers are unpacked as addresses, the structures,
+    unions and arrays as bytes, converted to copies of them.
+    """
+    if t is ctypes.c_char_p:
+        return "z", _event_string
+    if issubclass(t, ctypes._SimpleCData):
+        return t._type_, t if issubclass(t, _Enum) else None
+    if issubclass(t, (ctypes._Pointer, ctypes._CFuncPtr)):
+        return "P", None
+    return "%ds" % ctypes.sizeof(t), t.from_buffer_copy
+
+
+def _event_layout(k):
+    """(INTERNAL) Return the :class:`EventRecord` class of the events of
+    type value *k*, the (name, offset, ctypes type) of its fields after
+    the type, and the :mod:`struct` format of these fields in an
+    :class:`Event`.
+
+    The fields beyond the :class:`Event` structure are skipped (e.g.
+    the VLM instance name).
+    """
+    layout = _event_layouts.get(k)
+    if layout is not None:
+        return layout
+    name = EventType._enum_names_.get(k, "Event%d" % k)
+    fields = [("obj", Event.obj.offset, ctypes.c_void_p)]
+    member = _event_member(name)
+    if member is not None:
+        for f, t in member._fields_:
+            offset = Event.u.offset + getattr(member, f).offset
+            if offset + ctypes.sizeof(t) <= ctypes.sizeof(Event):
+                fields.append(("u_" + f if f == "type" else f, offset, t))
+    fmt, end = "@", 0
+    for _, offset, t in fields:
+        fmt += "%dx%s" % (offset - end, _event_format(t)[0].replace("z", "P"))
+        end = offset + ctypes.sizeof(t)
+    # the field accessors of a namedtuple, but not its __new__, so
+    # that the records are created by the (faster) tuple constructor
+    names = ("type",) + tuple(f for f, _, _ in fields)
+    nt = collections.namedtuple(name, names)
+    cls = type(
+        name + "Record",
+        (EventRecord,),
+        dict({f: vars(nt)[f] for f in names}, __slots__=(), _fields=names),
+    )
+    layout = _event_layouts[k] = cls, fields, fmt
+    return layout
+
+
+def _event_decoder(k):
+    """(INTERNAL) Return the function decoding an :class:`Event` of type
+    value *k* into an :class:`EventRecord`.
+
+    Its fields are unpacked at once with a :class:`struct.Struct` built
+    from the offsets of the ctypes fields, see :func:`_event_layout`.
+    """
+    cls, fields, fmt = _event_layout(k)
+    unpack = struct.Struct(fmt).unpack_from
+    head = (EventType(k),)
+
+    # convert the values of the enum, string and structure fields
+    convert = []
+    for i, (_, _, t) in enumerate(fields, 1):
+        c = _event_format(t)[1]
+        if c is not None:
+            convert.append((i, c))
+    if convert:
+
+        def decode(event):
+            values = list(head + unpack(event))
+            for i, c in convert:
+                values[i] = c(values[i])
+            return cls(values)
+
+    else:
+
+        def decode(event):
+            return cls(head + unpack(event))
+
+    _event_decoders[k] = decode
+    return decode
+
+
+class EventQueue(object):
+    """Bounded queue of the events of an :class:`EventManager`, see
+    :meth:`EventManager.event_queue`.
+
+    The events are copied by the libvlc threads into preallocated
+    :class:`Event` structures, so that they never wait for the
+    callbacks. The events sent when the queue is full are dropped and
+    counted in *dropped*.
+
+    Note that the pointers of the copied events (e.g. the new media of
+    a ``MediaPlayerMediaChanged`` event) may no longer be valid when
+    the callbacks are called.
+
+    :param dispatch: the function calling the callbacks of an event,
+        given the event and its type value.
+    :param size: the maximum number of queued events.
+    """
+
+    def __init__(self, dispatch, size=1024):
+        self._dispatch = dispatch
+        self._events = (Event * size)()
+        self._size = size
+        self._head = self._tail = 0  # numbers of events read and written
+        self._latest = {}  # event type: number of its last event written
+        self._cond = threading.Condition(threading.Lock())
+        self._thread = None
+        self.closed = False
+        self.dropped = 0
+
+    def __len__(self):
+        return self._tail - self._head
+
+    def put(self, event, latest=None):
+        """Copy the *event*, without waiting.
+
+        :param latest: the event type, to replace its queued event not
+            dispatched yet, if any, rather than queuing a new one.
+
+        :return: whether a queued event was replaced.
+        """
+        with self._cond:
+            if latest is not None:
+                i = self._latest.get(latest, -1)
+                if i >= self._head:
+                    self._events[i % self._size] = event
+                    return True
+            if self._tail - self._head < self._size:
+                if latest is not None:
+                    self._latest[latest] = self._tail
+                self._events[self._tail % self._size] = event
+                self._tail += 1
+                self._cond.notify()
+            else:
+                self.dropped += 1
+        return False
+
+    def get(self, timeout=None):
+        """Return a copy of the next event, waiting for it at most
+        *timeout* seconds (forever if None), or None if there is no
+        event (or the queue is closed and empty).
+        """
+        with self._cond:
+            while self._tail == self._head:
+                if self.closed or not self._cond.wait(timeout):
+                    return None
+            e = Event.from_buffer_copy(self._events[self._head % self._size])
+            self._head += 1
+        return e
+
+    def poll(self, timeout=0):
+        """Call the callbacks of the next event, waiting for it at most
+        *timeout* seconds (forever if None).
+
+        :return: whether there was an event.
+        """
+        e = self.get(timeout)
+        if e is None:
+            return False
+        self._dispatch(e, e.type.value)
+        return True
+
+    def drain(self):
+        """Call the callbacks of all the queued events.
+
+        :return: the number of events.
+        """
+        n = 0
+        while self.poll():
+            n += 1
+        return n
+
+    def start(self):
+        """Start a daemon thread calling the callbacks of the events,
+        until the queue is closed.
+        """
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._run, name="vlc-events", daemon=True
+            )
+            self._thread.start()
+
+    def _run(self):
+        while self.poll(None):
+            pass
+
+    def close(self, timeout=None):
+        """Stop the thread, once it has called the callbacks of the
+        queued events, waiting for it at most *timeout* seconds.
+        """
+        with self._cond:
+            self.closed = True
+            self._cond.notify_all()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout)
+
+
+class _EventTimer(object):
+    """(INTERNAL) A call scheduled by :class:`_EventScheduler`."""
+
+    __slots__ = ("func", "args")
+
+    def __init__(self, func, args):
+        self.func = func
+        self.args = args
+
+    def cancel(self):
+        self.func = None
+
+
+class _EventScheduler(object):
+    """(INTERNAL) Call functions at given times from a single thread,
+    started on first use, rather than from a :class:`threading.Timer`
+    thread per call, for the :class:`EventCoalescing` policies.
+    """
+
+    def __init__(self):
+        self._heap = []  # (clock, number, _EventTimer)
+        self._number = 0  # of the calls, ordering those at the same clock
+        self._cond = threading.Condition()
+        self._thread = None
+
+    def call_at(self, clock, func, *args):
+        """Call *func* with *args* at the :func:`time.monotonic` *clock*.
+
+        :return: the :class:`_EventTimer`, to cancel the call.
+        """
+        timer = _EventTimer(func, args)
+        with self._cond:
+            self._number += 1
+            heapq.heappush(self._heap, (clock, self._number, timer))
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="vlc-event-timers", daemon=True
+                )
+                self._thread.start()
+            elif self._heap[0][2] is timer:  # sooner than the others
+                self._cond.notify()
+        return timer
+
+    def _run(self):
+        heap = self._heap
+        while True:
+            with self._cond:
+                while True:
+                    delay = heap[0][0] - time.monotonic() if heap else None
+                    if delay is not None and delay <= 0:
+                        break
+                    self._cond.wait(delay)
+                timer = heapq.heappop(heap)[2]
+            func = timer.func
+            if func is not None:  # not canceled
+                try:
+                    func(*timer.args)
+                except Exception:
+                    logger.exception("Event timer %r", func)
+
+
+_event_scheduler = _EventScheduler()
+
+
+class EventCoalescing(object):
+    """Coalescing policy of an event type, counting the events
+    *coalesced* (not dispatched) and *delivered*, see
+    :meth:`EventManager.event_coalesce`.
+    """
+
+    __slots__ = (
+        "interval",
+        "rate",
+        "burst",
+        "latest",
+        "coalesced",
+        "delivered",
+        "_next",
+        "_tokens",
+        "_last",
+        "_trailing",
+        "_timer",
+        "_lock",
+    )
+
+    def __init__(self, interval=0, rate=0, burst=1, latest=False):
+        self.interval = interval
+        self.rate = rate
+        self.burst = burst
+        self.latest = latest
+        self.coalesced = self.delivered = 0
+        self._next = self._last = 0.0  # clock of the next event and last refill
+        self._tokens = burst
+        self._trailing = self._timer = None  # see defer()
+        self._lock = threading.Lock()
+
+    def accept(self, now):
+        """Return whether an event sent at the *now* clock (in seconds)
+        is to be dispatched, and count it.
+        """
+        if self.latest:
+            with self._lock:
+                return self._accept(now)
+        return self._accept(now)
+
+    def defer(self, event, k, send):
+        """Keep a copy of the coalesced *event* of type value *k*,
+        replacing the one kept before, and call *send* with it, *k* and
+        the policy at the end of the interval (or once the rate allows
+        it), from the timer thread shared by all the policies, unless
+        another event is accepted before, so that the latest value is
+        dispatched.
+        """
+        with self._lock:
+            self._trailing = Event.from_buffer_copy(event), k
+            if self._timer is None:
+                self._start(send)
+
+    def cancel(self):
+        """Drop the event kept by :meth:`defer`, if any."""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+            self._trailing = self._timer = None
+
+    def _accept(self, now):
+        if now < self._next:
+            self.coalesced += 1
+            return False
+        if self.rate:
+            # token bucket, refilled at rate tokens per second
+            t = min(self.burst, self._tokens + (now - self._last) * self.rate)
+            self._last = now
+            if t < 1:
+                self._tokens = t
+                self.coalesced += 1
+                return False
+            self._tokens = t - 1
+        self._next = now + self.interval
+        self.delivered += 1
+        if self._timer is not None:  # older than this event
+            self._timer.cancel()
+            self._trailing = self._timer = None
+        return True
+
+    def _start(self, send):
+        delay = self._next - time.monotonic()
+        if self.rate:
+            delay = max(delay, (1 - self._tokens) / self.rate)
+        self._timer = _event_scheduler.call_at(
+            time.monotonic() + max(delay, 0), self._expire, send
+        )
+
+    def _expire(self, send):
+        """(INTERNAL) Send the event kept by :meth:`defer`, if still there."""
+        with self._lock:
+            trailing, self._trailing, self._timer = self._trailing, None, None
+            if trailing is None:  # canceled
+                return
+            self.coalesced -= 1  # dispatched after all, or counted again
+            if not self._accept(time.monotonic()):  # early
+                self._trailing = trailing
+                self._start(send)
+                return
+        send(trailing[0], trailing[1], self)
+
+
+class EventHub(object):
+    """Dispatch the events of many libvlc objects, e.g. the hundreds of
+    players of an :class:`Instance`, through a single native callback
+    and a table of subscriptions by event manager and event type,
+    rather than through a callback and table per :class:`EventManager`::
+
+        hub = vlc.EventHub()
+        hub.event_subscribe(EventType.MediaPlayerEndReached, on_end)
+        for player in players:
+            hub.add(player)
+
+    The subscriptions of :meth:`event_subscribe` apply to all the objects
+    added, before or after, those of :meth:`event_subscribe_to` to one.
+    The callbacks are called as those of :meth:`EventManager.event_attach`,
+    see :meth:`owner` to get the object of an event. The objects, or
+    event managers, are removed on the release of the last reference to
+    their object, or with :meth:`remove`.
+    """
+
+    def __init__(self):
+        _called_from_ctypes = ctypes.CFUNCTYPE(
+            None, ctypes.POINTER(Event), ctypes.c_void_p
+        )
+
+        call = EventManager._call
+
+        @_called_from_ctypes
+        def _callback_handler(event, slot):
+            """(INTERNAL) Call the subscriptions of the *slot*."""
+            call(table.get(slot, ()), event.contents)
+
+        self._callback_handler = _callback_handler
+        self._table = table = {}  # slot: tuple of EventSubscription
+        self._slots = {}  # (event manager pointer, event type value): slot
+        self._objects = {}  # event manager pointer: (object, EventManager)
+        self._owners = {}  # object pointer: object
+        self._all = {}  # event type value: tuple of EventSubscription
+        self._own = {}  # (event manager pointer, event type value): idem
+        self._slot = 0  # the last one
+        self._lock = threading.RLock()
+
+    def __contains__(self, obj):
+        return self._owners.get(obj._as_parameter_.value) is obj
+
+    def __len__(self):
+        return len(self._objects)
+
+    def add(self, obj):
+        """Dispatch the events of *obj*, a libvlc object or an
+        :class:`EventManager`, to the subscriptions of :meth:`event_subscribe`.
+        """
+        em = obj if isinstance(obj, EventManager) else obj.event_manager()
+        p = em._as_parameter_.value
+        with self._lock:
+            if p in self._objects:
+                return
+            self._objects[p] = obj, em
+            self._owners[obj._as_parameter_.value] = obj
+            _Chubs.add(self)
+            for k in self._all:
+                self._update(p, k)
+
+    def remove(self, obj):
+        """Stop dispatching the events of *obj*, dropping its own
+        subscriptions.
+
+        :return: whether *obj* had been added.
+        """
+        with self._lock:
+            if self._owners.get(obj._as_parameter_.value) is not obj:
+                return False
+            del self._owners[obj._as_parameter_.value]
+            for p, (o, em) in list(self._objects.items()):
+                if o is obj:
+                    break
+            for key in [key for key in self._slots if key[0] == p]:
+                slot = self._slots.pop(key)
+                libvlc_event_detach(em, key[1], self._callback_handler, slot)
+                del self._table[slot]
+            for key in [key for key in self._own if key[0] == p]:
+                del self._own[key]
+            del self._objects[p]
+            if not self._objects:
+                _Chubs.discard(self)
+        return True
+
+    def close(self):
+        """Remove all the objects."""
+        for obj, _ in list(self._objects.values()):
+            self.remove(obj)
+
+    def owner(self, event):
+        """Return the object added which sent the *event*, if any."""
+        return self._owners.get(event.obj)
+
+    def event_subscribe(self, eventtype, callback, *args, **kwds):
+        """Subscribe to an event type of all the objects, see
+        :meth:`EventManager.event_subscribe`.
+
+        :return: the :class:`EventSubscription`, to pass to :meth:`event_unsubscribe`.
+        """
+        s = EventManager._subscription(eventtype, callback, args, kwds)
+        k = eventtype.value
+        with self._lock:
+            self._all[k] = self._all.get(k, ()) + (s,)
+            for p in self._objects:
+                self._update(p, k)
+        return s
+
+    def event_subscribe_to(self, obj, eventtype, callback, *args, **kwds):
+        """Subscribe to an event type of one object, added if needed.
+
+        :return: the :class:`EventSubscription`, to pass to :meth:`event_unsubscribe`.
+        """
+        s = EventManager._subscription(eventtype, callback, args, kwds)
+        k = eventtype.value
+        with self._lock:
+            self.add(obj)
+            for p, (o, _) in self._objects.items():
+                if o is obj:
+                    self._own[p, k] = self._own.get((p, k), ()) + (s,)
+                    self._update(p, k)
+                    break
+        return s
+
+    def event_unsubscribe(self, subscription):
+        """Unsubscribe a callback, see :meth:`EventManager.event_unsubscribe`.
+
+        :return: whether the subscription was still active.
+        """
+        k = subscription.eventtype.value
+        with self._lock:
+            subs = self._all.get(k, ())
+            if any(s is subscription for s in subs):
+                subs = tuple(s for s in subs if s is not subscription)
+                if subs:
+                    self._all[k] = subs
+                else:
+                    del self._all[k]
+                for p in self._objects:
+                    self._update(p, k)
+                return True
+            for key, subs in self._own.items():
+                if key[1] == k and any(s is subscription for s in subs):
+                    subs = tuple(s for s in subs if s is not subscription)
+                    if subs:
+                        self._own[key] = subs
+                    else:
+                        del self._own[key]
+                    self._update(*key)
+                    return True
+        return False
+
+    def _update(self, p, k):
+        """(INTERNAL) Update the subscriptions of the event manager *p*
+        to the event type *k*, attaching or detaching the native callback.
+        """
+        subs = self._all.get(k, ()) + self._own.get((p, k), ())
+        slot = self._slots.get((p, k))
+        em = self._objects[p][1]
+        if slot is None:
+            if not subs:
+                return
+            self._slot += 1
+            slot = self._slots[p, k] = self._slot
+            self._table[slot] = subs
+            r = libvlc_event_attach(em, k, self._callback_handler, slot)
+            if r:
+                del self._slots[p, k], self._table[slot]
+                raise VLCException("libvlc_event_attach failed: %d" % r)
+        elif subs:
+            self._table[slot] = subs
+        else:
+            libvlc_event_detach(em, k, self._callback_handler, slot)
+            del self._slots[p, k], self._table[slot]
+
+
+class LatencyHistogram(object):
+    """HDR-style histogram of latencies, in nanoseconds, counted in
+    buckets of a relative width of at most 1/64 (about 2 significant
+    digits), see :class:`CallbackLatency`.
+
+    :ivar name: the callback kind.
+    :ivar count: the number of latencies.
+    :ivar total: their sum.
+    :ivar max: the largest one.
+    :ivar over_budget: the number of the ones over the budget.
+    """
+
+    __slots__ = ("name", "count", "total", "max", "over_budget", "_counts")
+
+    def __init__(self, name):
+        self.name = name
+        self.reset()
+
+    def __repr__(self):
+        return "<%s %s: count=%d, mean=%d, p50=%d, p99=%d, max=%d, over_budget=%d>" % (
+            self.__class__.__name__,
+            self.name,
+            self.count,
+            self.mean,
+            self.percentile(50),
+            self.percentile(99),
+            self.max,
+            self.over_budget,
+        )
+
+    @property
+    def mean(self):
+        return self.total // self.count if self.count else 0
+
+    def record(self, ns):
+        """Count a latency of *ns* nanoseconds."""
+        e = ns.bit_length() - 7
+        i = (
+            ns if e <= 0 else (e << 6) + (ns >> e)
+        )  # 128 linear buckets, then 64 per power of 2
+        counts = self._counts
+        if i >= len(counts):
+            counts.extend([0] * (i + 1 - len(counts)))
+        counts[i] += 1
+        self.count += 1
+        self.total += ns
+        if ns > self.max:
+            self.max = ns
+
+    def percentile(self, p):
+        """Return the latency, in nanoseconds, under which *p* percent of
+        the latencies are, with the precision of the buckets.
+        """
+        if not self.count:
+            return 0
+        n = max(1, -(-self.count * p // 100))  # ceil
+        for i, c in enumerate(self._counts):
+            n -= c
+            if n <= 0:
+                break
+        if i < 128:
+            return i
+        e = (i >> 6) - 1
+        return min(self.max, ((i - (e << 6) + 1) << e) - 1)
+
+    def copy(self):
+        h = LatencyHistogram(self.name)
+        h.count, h.total, h.max, h.over_budget = (
+            self.count,
+            self.total,
+            self.max,
+            self.over_budget,
+        )
+        h._counts = list(self._counts)
+        return h
+
+    def reset(self):
+        self.count = self.total = self.max = self.over_budget = 0
+        self._counts = []
+
+
+class CallbackLatency(object):
+    """Opt-in instrumentation of the time spent in Python by the libvlc
+    threads, in a :class:`LatencyHistogram` per kind of callback: the
+    events of an :class:`EventManager` (see
+    :meth:`EventManager.event_latency`), from the entry of the native
+    callback until the Python callbacks return, as ``event.<EventType
+    name>``, and any callback wrapped with :meth:`wrap`, e.g.::
+
+        latency = vlc.CallbackLatency(budget=1 / 25.0)
+
+        @vlc.CallbackDecorators.VideoLockCb
+        @latency.wrap("video.lock")
+        def lock(opaque, planes):
+            ...
+
+        player.event_manager().event_latency(latency)
+        ...
+        for h in latency.snapshot().values():
+            print(h)
+
+    :param budget: the time, in seconds, over which a call is counted
+        as *over_budget*, e.g. a frame period, or None.
+    :param exceeded: a function called with the kind and time (in
+        seconds) of the calls over the budget, from the libvlc thread.
+    """
+
+    def __init__(self, budget=None, exceeded=None):
+        self.exceeded = exceeded
+        self.budget = budget
+        self._histograms = {}  # kind: LatencyHistogram
+        self._events = {}  # event type value: LatencyHistogram
+        self._lock = threading.Lock()
+
+    @property
+    def budget(self):
+        return self._budget
+
+    @budget.setter
+    def budget(self, budget):
+        self._budget = budget
+        self._budget_ns = None if budget is None else int(budget * 1e9)
+
+    def histogram(self, kind):
+        """Return the live :class:`LatencyHistogram` of a callback kind."""
+        h = self._histograms.get(kind)
+        if h is None:
+            with self._lock:
+                h = self._histograms.setdefault(kind, LatencyHistogram(kind))
+        return h
+
+    def record(self, kind, ns):
+        """Count a call of a callback *kind* of *ns* nanoseconds."""
+        self._record(self.histogram(kind), ns)
+
+    def snapshot(self, reset=False):
+        """Return a copy of the histograms, by callback kind.
+
+        :param reset: whether to reset the histograms.
+        """
+        with self._lock:
+            hs = list(self._histograms.values())
+        s = {}
+        for h in hs:
+            s[h.name] = h.copy()
+            if reset:
+                h.reset()
+        return s
+
+    def wrap(self, kind, func=None):
+        """Return *func* timed as the callback *kind*, or a decorator
+        doing so if *func* is omitted, to apply before the ctypes ones
+        of :class:`CallbackDecorators`.
+        """
+        if func is None:
+            return functools.partial(self.wrap, kind)
+        h = self.histogram(kind)
+        record = self._record
+        perf_counter_ns = time.perf_counter_ns
+
+        @functools.wraps(func)
+        def timed(*args):
+            t = perf_counter_ns()
+            try:
+                return func(*args)
+            finally:
+                record(h, perf_counter_ns() - t)
+
+        return timed
+
+    def _event(self, k, ns):
+        """(INTERNAL) Count an event of type value *k* of *ns* nanoseconds."""
+        h = self._events.get(k)
+        if h is None:
+            name = EventType._enum_names_.get(k, "Event%d" % k)
+            h = self._events[k] = self.histogram("event." + name)
+        self._record(h, ns)
+
+    def _record(self, h, ns):
+        """(INTERNAL) Count *ns* in *h*, checking the budget."""
+        # not locked: a count may be lost when threads race on a histogram
+        h.record(ns)
+        b = self._budget_ns
+        if b is not None and ns > b:
+            h.over_budget += 1
+            if self.exceeded is not None:
+                try:
+                    self.exceeded(h.name, ns * 1e-9)
+                except Exception:
+                    logger.exception("Latency callback %r", self.exceeded)
+
+
+# The event files of EventRecorder: a header, then for each event its
+# libvlc_clock() in microseconds, type value and payload size, followed
+# by the payload encoded by _event_codec()
+_EVENT_FILE_MAGIC = b"VLCEVT\x00\x01"
+_EVENT_FILE_RECORD = struct.Struct("<qIH")
+_EVENT_FILE_NONE = 0xFFFFFFFF  # size of the None strings
+_event_codecs = {}
+
+# The categories of the event types (their value >> 8) per class
+_event_categories = {
+    "Media": 0,
+    "MediaPlayer": 1,
+    "MediaList": 2,
+    "MediaListPlayer": 4,
+    "MediaDiscoverer": 5,
+    "RendererDiscoverer": 5,
+    "Instance": 6,
+}
+
+
+def _event_codec(k):
+    """(INTERNAL) Return the functions encoding an :class:`EventRecord` of
+    type value *k* into the payload of an event file, and decoding it.
+
+    The numbers are packed with the little-endian standard sizes,
+    followed by the strings, each prefixed with its size.
+    """
+    codec = _event_codecs.get(k)
+    if codec is not None:
+        return codec
+    cls, fields, _ = _event_layout(k)
+    head = (EventType(k),)
+    codes = {"P": "Q", "z": "I", "l": "q", "L": "Q"}
+    formats = [_event_format(t) for _, _, t in fields]
+    numbers = struct.Struct("<" + "".join(codes.get(f, f) for f, _ in formats))
+    strings = [i for i, (_, _, t) in enumerate(fields) if t is ctypes.c_char_p]
+    enums = [(i, t) for i, (_, _, t) in enumerate(fields) if issubclass(t, _Enum)]
+    # the structures, unions and arrays, as bytes
+    copies = [(i, c) for i, (f, c) in enumerate(formats) if f.endswith("s")]
+
+    def encode(record):
+        values = list(record[1:])
+        tail = []
+        for i, _ in enums:
+            values[i] = values[i].value
+        for i, _ in copies:
+            values[i] = bytes(values[i])
+        for i in strings:
+            b = values[i]
+            if b is None:
+                values[i] = _EVENT_FILE_NONE
+            else:
+                values[i] = len(b)
+                tail.append(b)
+        return numbers.pack(*values) + b"".join(tail)
+
+    def decode(data):
+        values = list(numbers.unpack_from(data))
+        end = numbers.size
+        for i in strings:
+            n = values[i]
+            if n == _EVENT_FILE_NONE:
+                values[i] = None
+            else:
+                values[i] = data[end : end + n]
+                end += n
+        for i, t in enums:
+            values[i] = t(values[i])
+        for i, c in copies:
+            values[i] = c(values[i])
+        return cls(head + tuple(values))
+
+    codec = _event_codecs[k] = encode, decode
+    return codec
+
+
+class EventRecorder(object):
+    """Record the events of a libvlc object in an append-only binary
+    file, to replay them with :class:`EventReplayer`, e.g. to reproduce
+    an issue without libvlc::
+
+        with vlc.EventRecorder(player, "events.bin"):
+            player.play()
+            ...
+
+    Each event is written with its :func:`libvlc_clock` time and the
+    fields of its :class:`EventRecord`, the strings being copied but
+    not the objects of the pointers.
+
+    :param obj: the libvlc object, e.g. a :class:`MediaPlayer`, or an
+        :class:`EventManager`.
+    :param file: the file name, or a binary file object, appended to.
+    :param eventtypes: the :class:`EventType` list to record, by default
+        all the event types of the class of *obj*.
+    """
+
+    def __init__(self, obj, file, eventtypes=None):
+        em = obj if isinstance(obj, EventManager) else obj.event_manager()
+        if eventtypes is None:
+            category = _event_categories.get(type(obj).__name__)
+            if category is None:
+                raise VLCException("event types required: %r" % (obj,))
+            eventtypes = [
+                EventType(k) for k in EventType._enum_names_ if k >> 8 == category
+            ]
+        self._close = isinstance(file, (str, bytes, os.PathLike))
+        if self._close:
+            file = open(file, "ab")
+        if file.tell() == 0:
+            file.write(_EVENT_FILE_MAGIC)
+        self._file = file
+        self._em = em
+        self.recorded = 0
+        self._subscriptions = [em.event_subscribe(e, self._record) for e in eventtypes]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Stop recording, and flush (or close) the file."""
+        for s in self._subscriptions:
+            self._em.event_unsubscribe(s)
+        self._subscriptions = []
+        if self._close:
+            self._file.close()
+        else:
+            self._file.flush()
+
+    def _record(self, event):
+        k = event.type.value
+        if not isinstance(event, EventRecord):
+            event = (_event_decoders.get(k) or _event_decoder(k))(event)
+        data = (_event_codecs.get(k) or _event_codec(k))[0](event)
+        # a single write, not mixed with the ones of other threads
+        self._file.write(_EVENT_FILE_RECORD.pack(libvlc_clock(), k, len(data)) + data)
+        self.recorded += 1
+
+
+class EventReplayer(object):
+    """Replay the events of a file written by :class:`EventRecorder` to
+    the callbacks subscribed to it, as to an :class:`EventManager`, or
+    to those of an :class:`EventManager`, in order and at their
+    original pace or faster, without libvlc::
+
+        replayer = vlc.EventReplayer("events.bin")
+        replayer.event_attach(EventType.MediaPlayerTimeChanged, on_time)
+        replayer.replay(speed=100)
+
+    The callbacks are called from the thread calling :meth:`replay`,
+    with :class:`Event` structures (whose pointers to objects are no
+    longer valid), or :class:`EventRecord` tuples, see
+    :meth:`event_records`.
+
+    :param file: the file name, or a binary file object.
+    """
+
+    def __init__(self, file):
+        self._file = file
+        self._callback_handler = self._dispatch  # see EventManager._subscribe
+        self._lock = threading.Lock()  # of the subscriptions
+        self._callbacks = {}  # event type value: tuple of EventSubscription
+        self._attached = {}  # event type value: EventSubscription
+        self._records = False
+
+    def events(self):
+        """Iterate over the (:func:`libvlc_clock` time, :class:`EventRecord`)
+        of the events of the file.
+        """
+        f = self._file
+        close = isinstance(f, (str, bytes, os.PathLike))
+        if close:
+            f = open(f, "rb")
+        try:
+            if f.read(len(_EVENT_FILE_MAGIC)) != _EVENT_FILE_MAGIC:
+                raise VLCException("not an event file: %r" % (self._file,))
+            size = _EVENT_FILE_RECORD.size
+            unpack = _EVENT_FILE_RECORD.unpack
+            while True:
+                head = f.read(size)
+                if len(head) < size:
+                    break  # end of file, or truncated record
+                clock, k, n = unpack(head)
+                data = f.read(n)
+                if len(data) < n:
+                    break
+                yield clock, (_event_codecs.get(k) or _event_codec(k))[1](data)
+        finally:
+            if close:
+                f.close()
+
+    # the subscriptions of an EventManager, without native callback
+    event_attach = EventManager.event_attach
+    event_detach = EventManager.event_detach
+    event_subscribe = EventManager.event_subscribe
+    event_unsubscribe = EventManager.event_unsubscribe
+    _subscription = staticmethod(EventManager._subscription)
+    _subscribe = EventManager._subscribe
+
+    def event_records(self, enabled=True):
+        """Call the callbacks with :class:`EventRecord` tuples, rather than
+        with :class:`Event` structures, see :meth:`EventManager.event_records`.
+        """
+        self._records = bool(enabled)
+
+    def replay(self, speed=1.0, manager=None):
+        """Call the callbacks of the events of the file.
+
+        :param speed: the replay speed, e.g. 100 for 100 times faster
+            than the original events, or 0 not to wait between them.
+        :param manager: an :class:`EventManager`, to call its callbacks
+            instead of the ones subscribed to this replayer.
+
+        :return: the number of events.
+        """
+        if manager is not None:
+            if getattr(manager, "_callback_handler", None) is None:
+                manager._init()
+            dispatch, records = manager._dispatch, False
+        else:
+            dispatch, records = self._dispatch, self._records
+        n = 0
+        start = None
+        for clock, record in self.events():
+            if speed:
+                if start is None:
+                    start = clock, time.monotonic()
+                delay = start[1] + (clock - start[0]) / 1e6 / speed - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+            k = record.type.value
+            if records:
+                dispatch(record, k)
+            else:
+                event, strings = self._event(record)
+                dispatch(event, k)
+            n += 1
+        return n
+
+    def _dispatch(self, event, k):
+        """(INTERNAL) Call the subscriptions of the *event*, of type *k*."""
+        EventManager._call(self._callbacks.get(k, ()), event)
+
+    def _native_attach(self, k):
+        return 0  # no libvlc
+
+    def _native_detach(self, k):
+        pass
+
+    @staticmethod
+    def _event(record):
+        """(INTERNAL) Return an :class:`Event` of the *record*, and the
+        strings it points to, to keep alive until it is dispatched.
+        """
+        _, fields, fmt = _event_layout(record.type.value)
+        values, strings = [], []
+        for v, (_, _, t) in zip(record[1:], fields):
+            if t is ctypes.c_char_p:
+                p = ctypes.c_char_p(v)
+                strings.append(p)
+                v = ctypes.cast(p, ctypes.c_void_p).value or 0
+            elif isinstance(v, _Enum):
+                v = v.value
+            values.append(v)
+        event = Event()
+        struct.pack_into(fmt, event, 0, *values)
+        event.type = record.type  # after the padding bytes of fmt
+        return event, strings
+
+
+class PlaybackClock(object):
+    """Playback time of a :class:`MediaPlayer`, interpolated from its
+    events, so that it can be read often (e.g. to update a progress
+    bar) without calling libvlc.
+
+    The time reported by the ``MediaPlayerTimeChanged`` events is
+    extrapolated with the *clock* (a function returning seconds, by
+    default :func:`time.monotonic`, i.e. the clock of :func:`libvlc_clock`
+    on most platforms) and the playback rate while playing.
+
+    libvlc does not send events when the playback rate changes: use
+    :meth:`set_rate` instead of :meth:`MediaPlayer.set_rate`, or call
+    :meth:`sync` from the application thread after changing it.
+
+    :param player: the :class:`MediaPlayer`.
+    :param clock: the clock function.
+    """
+
+    _events = {
+        EventType.MediaPlayerTimeChanged: "_time_changed",
+        EventType.MediaPlayerLengthChanged: "_length_changed",
+        EventType.MediaPlayerPlaying: "_playing",
+        EventType.MediaPlayerPaused: "_stopped",
+        EventType.MediaPlayerStopped: "_stopped",
+        EventType.MediaPlayerEndReached: "_end_reached",
+        EventType.MediaPlayerEncounteredError: "_stopped",
+    }
+
+    def __init__(self, player, clock=time.monotonic):
+        self.player = player
+        self.clock = clock
+        # (time in ms, clock, rate, playing), replaced as a whole by
+        # the event handlers, which run in a libvlc thread
+        self._state = (-1, 0.0, 1.0, False)
+        self.length = -1
+        self.sync()
+
+        self._event_manager = em = player.event_manager()
+        self._subscriptions = [
+            em.event_subscribe(e, getattr(self, name))
+            for e, name in self._events.items()
+        ]
+        _Cfollowers.setdefault(player, weakref.WeakSet()).add(self)
+
+    def close(self):
+        """Stop following the player events, which its release does too."""
+        for s in self._subscriptions:
+            self._event_manager.event_unsubscribe(s)
+        self._subscriptions = []
+
+    def sync(self):
+        """Reset the clock from the player state.
+
+        This calls libvlc, so must not be called from an event handler.
+        """
+        self.length = self.player.get_length()
+        self._state = (
+            self.player.get_time(),
+            self.clock(),
+            self.player.get_rate(),
+            bool(self.player.is_playing()),
+        )
+
+    def set_rate(self, rate):
+        """Set the player playback rate, see :meth:`MediaPlayer.set_rate`."""
+        r = self.player.set_rate(rate)
+        if r == 0:
+            self._state = (self.time(), self.clock(), rate, self._state[3])
+        return r
+
+    def time(self):
+        """Return the current playback time in ms (a float), or -1 if
+        there is no media.
+        """
+        t, c, rate, playing = self._state
+        if playing and t >= 0:
+            t += (self.clock() - c) * 1000.0 * rate
+            if 0 < self.length < t:
+                t = self.length
+        return t
+
+    def position(self):
+        """Return the current playback position as a float between 0.0
+        and 1.0, or -1 if the length is unknown.
+        """
+        if self.length > 0:
+            return max(0.0, self.time() / self.length)
+        return -1
+
+    def is_playing(self):
+        return self._state[3]
+
+    def _time_changed(self, event):
+        t, c, rate, playing = self._state
+        self._state = (event.u.new_time, self.clock(), rate, playing)
+
+    def _length_changed(self, event):
+        self.length = event.u.new_length
+
+    def _playing(self, event):
+        self._state = (max(self._state[0], 0), self.clock(), self._state[2], True)
+
+    def _stopped(self, event):
+        self._state = (self.time(), self.clock(), self._state[2], False)
+
+    def _end_reached(self, event):
+        self._state = (self.length, self.clock(), self._state[2], False)
+
+
+class aio(object):
+    """asyncio layer: coroutines waiting, in the running event loop, for
+    the events of the libvlc objects (with an :meth:`event_manager`
+    method) and for the completion of their blocking or asynchronous
+    calls.
+
+    The events are copied by the native callbacks, and passed to the
+    loop with :meth:`asyncio.loop.call_soon_threadsafe`, e.g.::
+
+        player.play()
+        await vlc.aio.wait_for(player, EventType.MediaPlayerPlaying, timeout=5)
+        async for event in vlc.aio.events(player, EventType.MediaPlayerTimeChanged):
+            ...
+    """
+
+    @staticmethod
+    def _subscribe(obj, eventtypes, callback):
+        """(INTERNAL) Subscribe *callback* to the *eventtypes* (an
+        :class:`EventType` or a tuple of them) of *obj*, called in the
+        loop with a copy of the events.
+
+        :return: a function unsubscribing it.
+        """
+        import asyncio
+
+        loop = asyncio.get_running_loop()
+        em = obj.event_manager()
+        if isinstance(eventtypes, EventType):
+            eventtypes = (eventtypes,)
+
+        def copy(event):
+            loop.call_soon_threadsafe(callback, Event.from_buffer_copy(event))
+
+        subs = [em.event_subscribe(e, copy) for e in eventtypes]
+        return lambda: [em.event_unsubscribe(s) for s in subs]
+
+    @staticmethod
+    async def wait_for(obj, eventtypes, timeout=None):
+        """Wait for the next event of *obj*.
+
+        :param eventtypes: an :class:`EventType`, or a tuple of them.
+        :param timeout: in seconds, or None.
+
+        :return: a copy of the :class:`Event`.
+        :raise asyncio.TimeoutError: on timeout.
+        """
+        return await aio._call(obj, eventtypes, None, timeout)
+
+    @staticmethod
+    async def events(obj, *eventtypes):
+        """Asynchronous iterator over the copies of the events of *obj*
+        of the *eventtypes*, subscribed until it is closed: use e.g.
+        :func:`contextlib.aclosing` to stop it with a ``break``.
+        """
+        import asyncio
+
+        queue = asyncio.Queue()
+        unsubscribe = aio._subscribe(obj, eventtypes, queue.put_nowait)
+        try:
+            while True:
+                yield await queue.get()
+        finally:
+            unsubscribe()
+
+    @staticmethod
+    async def _call(obj, eventtypes, func, timeout, *args):
+        """(INTERNAL) Call *func* with *args* in the default executor,
+        unless None, and wait for the next event of *obj* of the
+        *eventtypes* sent from then on.
+
+        :raise VLCException: if *func* returns -1.
+        """
+        import asyncio
+
+        future = asyncio.get_running_loop().create_future()
+
+        def done(event):
+            if not future.done():
+                future.set_result(event)
+
+        unsubscribe = aio._subscribe(obj, eventtypes, done)
+        try:
+            if func is not None:
+                r = await asyncio.get_running_loop().run_in_executor(None, func, *args)
+                if r == -1:
+                    raise VLCException("%s failed" % func.__name__)
+            return await asyncio.wait_for(future, timeout)
+        finally:
+            unsubscribe()
+
+    @staticmethod
+    async def stop(player):
+        """Stop the :class:`MediaPlayer` or :class:`MediaListPlayer`
+        *player*, which blocks until its threads are stopped, in the
+        default executor.
+        """
+        import asyncio
+
+        await asyncio.get_running_loop().run_in_executor(None, player.stop)
+
+    @staticmethod
+    async def parse(media, flags=MediaParseFlag.local, timeout=None):
+        """Parse the :class:`Media` with :meth:`Media.parse_with_options`,
+        and wait for the end of parsing.
+
+        :param flags: the :class:`MediaParseFlag`.
+        :param timeout: in seconds, or None.
+
+        :return: the :class:`MediaParsedStatus`.
+        """
+        ms = -1 if timeout is None else int(timeout * 1000)
+        event = await aio._call(
+            media,
+            EventType.MediaParsedChanged,
+            media.parse_with_options,
+            None if timeout is None else timeout + 1,  # libvlc times out first
+            flags,
+            ms,
+        )
+        return MediaParsedStatus(event.u.new_status)
+
+    @staticmethod
+    async def play_item_at_index(list_player, index, timeout=None):
+        """Play the item *index* of the :class:`MediaListPlayer`, and wait
+        until it is set as the current item.
+
+        :param timeout: in seconds, or None.
+
+        :return: a copy of the ``MediaListPlayerNextItemSet`` :class:`Event`.
+        """
+        return await aio._call(
+            list_player,
+            EventType.MediaListPlayerNextItemSet,
+            list_player.play_item_at_index,
+            timeout,
+            index,
+        )
+
+
+# The planes of the chromas of video_planes(): their bytes per pixel,
+# and the divisors of the width and height of the frame
+_video_chromas = {
+    b"RV32": ((4, 1, 1),),
+    b"RGBA": ((4, 1, 1),),
+    b"BGRA": ((4, 1, 1),),
+    b"RV24": ((3, 1, 1),),
+    b"RV16": ((2, 1, 1),),
+    b"RV15": ((2, 1, 1),),
+    b"YUY2": ((2, 1, 1),),
+    b"YUYV": ((2, 1, 1),),
+    b"UYVY": ((2, 1, 1),),
+    b"GREY": ((1, 1, 1),),
+    b"I420": ((1, 1, 1), (1, 2, 2), (1, 2, 2)),  # Y, U, V
+    b"J420": ((1, 1, 1), (1, 2, 2), (1, 2, 2)),
+    b"YV12": ((1, 1, 1), (1, 2, 2), (1, 2, 2)),  # Y, V, U
+    b"I422": ((1, 1, 1), (1, 2, 1), (1, 2, 1)),
+    b"I444": ((1, 1, 1), (1, 1, 1), (1, 1, 1)),
+    b"NV12": ((1, 1, 1), (2, 2, 2)),  # Y, interleaved UV
+}
+_VIDEO_ALIGN = 32  # of the planes, pitches and lines, as libvlc requires
+
+# The policies of VideoFrameSink, when the consumer is late
+_video_policies = ("block", "drop-newest", "drop-oldest", "latest")
+
+# The VideoFrameSink of the players, with their video callbacks, kept
+# alive until closed, or the player released (as the memoized values,
+# see _Crelease), since the sinks refer to their player
+_video_sinks = weakref.WeakKeyDictionary()  # MediaPlayer: VideoFrameSink
+memoize_parameterless._caches.append(_video_sinks)
+
+
+def _video_align(n):
+    """(INTERNAL) Round *n* up to a multiple of :data:`_VIDEO_ALIGN`."""
+    return -(-n // _VIDEO_ALIGN) * _VIDEO_ALIGN
+
+
+def video_planes(chroma, width, height):
+    """Return the pitches and lines of the planes of a video format, as
+    set by a :data:`CallbackDecorators.VideoFormatCb` callback, aligned
+    as libvlc requires, e.g. for a buffer of their planes one after the
+    other, each starting at a multiple of 32 bytes.
+
+    :param chroma: a chroma, packed ("RV32", "RV24", "RV16", "YUY2"...)
+        or planar ("I420", "NV12"...), as a str or bytes.
+    :param width: the width, in pixels.
+    :param height: the height, in pixels.
+
+    :return: the tuple of the pitches, in bytes, and the tuple of the
+        numbers of lines, of each plane.
+    """
+    layout = _video_chromas.get(str_to_bytes(chroma))
+    if layout is None:
+        raise VLCException("unsupported chroma: %r" % (chroma,))
+    n = _video_align(height)
+    pitches = tuple(_video_align(-(-width // w) * bpp) for bpp, w, _ in layout)
+    return pitches, tuple(n // h for _, _, h in layout)
+
+
+class VideoFrame(object):
+    """A video frame of a :class:`VideoFrameSink`, in a buffer of its
+    pool, which libvlc decoded into, until :meth:`release` is called.
+
+    The frames are reused: their attributes and pixels are only valid
+    until they are released.
+
+    :ivar planes: a read-only memoryview of the pixels of each plane,
+        e.g. Y, U and V, of *pitches* bytes per line, and *lines* lines,
+        see :func:`video_planes`.
+    :ivar chroma: the chroma, e.g. ``b"RV32"``.
+    :ivar width: the width, in pixels.
+    :ivar height: the height, in pixels.
+    :ivar pts: the :func:`libvlc_clock` time the frame was to be
+        displayed at, in microseconds.
+    :ivar time: the playback time then, in milliseconds, if read by the
+        sink (see its *times*), or 0.
+    :ivar number: the number of the frame, counting the dropped ones.
+    """
+
+    __slots__ = (
+        "planes",
+        "pitches",
+        "lines",
+        "chroma",
+        "width",
+        "height",
+        "pts",
+        "time",
+        "number",
+        "_sink",
+        "_index",
+        "_addresses",
+    )
+
+    def __init__(self, sink, index, buffer, chroma, width, height, pitches, lines):
+        self.chroma = chroma
+        self.width = width
+        self.height = height
+        self.pitches = pitches
+        self.lines = lines
+        self.pts = self.time = self.number = 0
+        self._sink = sink
+        self._index = index
+        address = ctypes.addressof(buffer)
+        offset = -address % _VIDEO_ALIGN
+        view = memoryview(buffer).cast("B")
+        planes, addresses = [], []
+        for pitch, n in zip(pitches, lines):
+            planes.append(view[offset : offset + pitch * n].toreadonly())
+            addresses.append(address + offset)
+            offset += _video_align(pitch * n)
+        self.planes = tuple(planes)
+        self._addresses = tuple(addresses)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.release()
+
+    def __repr__(self):
+        return "<%s %d: %s %dx%d, pts=%d>" % (
+            self.__class__.__name__,
+            self.number,
+            bytes_to_str(self.chroma),
+            self.width,
+            self.height,
+            self.pts,
+        )
+
+    def array(self, plane=0):
+        """Return a read-only NumPy view of the pixels of a *plane*, of
+        shape (height, width, bytes per pixel) of the plane, e.g. the
+        half width and height of the U plane of I420, without copying them.
+        """
+        import numpy
+
+        bpp, w, h = _video_chromas[self.chroma][plane]
+        w, h = -(-self.width // w), -(-self.height // h)
+        a = numpy.frombuffer(self.planes[plane], dtype=numpy.uint8)
+        a = a.reshape(self.lines[plane], self.pitches[plane])
+        return a[:h, : w * bpp].reshape(h, w, bpp)
+
+    def release(self):
+        """Give the buffer of the frame back to the pool of its sink."""
+        self._sink._release(self)
+
+
+class VideoFrameSink(object):
+    """Capture the video frames of a :class:`MediaPlayer`, through its
+    video callbacks, without copying them: libvlc decodes into a pool of
+    aligned buffers, given as :class:`VideoFrame` views once displayed::
+
+        sink = vlc.VideoFrameSink(player, "RV24", width=640)
+        player.play()
+        for frame in sink:
+            with frame:
+                process(frame.array(), frame.pts)
+
+    The frames are either got with :meth:`get` (or by iterating over the
+    sink, until the end of the media), from a ring of at most *queue*
+    frames, or passed to a *callback*, called from the libvlc video
+    thread. Either way, they must be released, to decode the next ones
+    in their buffer. When the consumer is late, i.e. the ring is full or
+    no buffer is free, the *policy* is:
+
+    * "block": the decoder waits for a free buffer, slowing the playback,
+    * "drop-newest": the new frames are dropped,
+    * "drop-oldest": the oldest frame of the ring is dropped, reusing its
+      buffer if none is free, so that the decoder never waits,
+    * "latest": the same with a ring of one frame, e.g. for a preview.
+
+    The frames are counted: *frames* displayed, *dropped* (by the policy
+    or without free buffer), *delivered* to the consumer, and *late*,
+    when got more than *deadline* after being displayed.
+
+    The format is set when the video starts, see
+    :meth:`MediaPlayer.video_set_format_callbacks`.
+
+    :param player: the :class:`MediaPlayer`, not playing yet.
+    :param chroma: the chroma, e.g. "RV32", "RV24", or "I420" to skip
+        the conversion to RGB, see :func:`video_planes`.
+    :param width: the width, or 0 for the width of the video, or scaled
+        as *height*.
+    :param height: the height, or 0 for the height of the video, or
+        scaled as *width*.
+    :param buffers: the number of buffers of the pool.
+    :param callback: a function called with each frame, or None.
+    :param policy: the policy, see above.
+    :param queue: the size of the ring, 0 for *buffers*.
+    :param deadline: the time, in seconds, after which a frame got is
+        counted as late, or None.
+    :param times: whether to read the playback time of each frame (a
+        libvlc call, slowing the video thread), see :class:`VideoFrame`.
+    """
+
+    def __init__(
+        self,
+        player,
+        chroma="RV32",
+        width=0,
+        height=0,
+        buffers=4,
+        callback=None,
+        policy="drop-newest",
+        queue=0,
+        deadline=None,
+        times=False,
+    ):
+        chroma = str_to_bytes(chroma)
+        if chroma not in _video_chromas:
+            raise VLCException("unsupported chroma: %r" % (chroma,))
+        if policy not in _video_policies:
+            raise VLCException("unsupported policy: %r" % (policy,))
+        self.player = player
+        self.chroma = chroma
+        self.width = width
+        self.height = height
+        self.buffers = buffers
+        self.callback = callback
+        self.policy = policy
+        if policy == "latest":
+            queue = 1
+        elif policy == "block" or not queue:
+            queue = buffers
+        self.queue = queue
+        self.deadline = deadline
+        self.times = times
+        self.frames = self.dropped = self.delivered = self.late = 0
+        self._pool = ()  # the VideoFrame of each buffer
+        self._free = collections.deque()  # their indices
+        self._ready = collections.deque()  # the frames to get
+        self._scratch = None  # the buffer of the dropped frames
+        self._cond = threading.Condition()
+        self._ended = self._closed = False
+
+        # the chroma as a pointer, to set it
+        _VideoFormatCb = ctypes.CFUNCTYPE(
+            ctypes.c_uint,
+            ctypes.POINTER(ctypes.c_void_p),
+            ctypes.c_void_p,
+            ctypes.POINTER(ctypes.c_uint),
+            ctypes.POINTER(ctypes.c_uint),
+            ctypes.POINTER(ctypes.c_uint),
+            ctypes.POINTER(ctypes.c_uint),
+        )
+        self._format_cb = _VideoFormatCb(self._format)
+        self._lock_cb = CallbackDecorators.VideoLockCb(self._lock)
+        self._display_cb = CallbackDecorators.VideoDisplayCb(self._display)
+        player.video_set_callbacks(self._lock_cb, None, self._display_cb, None)
+        player.video_set_format_callbacks(self._format_cb, None)
+        _video_sinks[player] = self
+        _Cfollowers.setdefault(player, weakref.WeakSet()).add(self)
+
+        self._event_manager = em = player.event_manager()
+        self._subscriptions = [
+            em.event_subscribe(e, self._end)
+            for e in (
+                EventType.MediaPlayerEndReached,
+                EventType.MediaPlayerStopped,
+                EventType.MediaPlayerEncounteredError,
+            )
+        ]
+
+    def __iter__(self):
+        frame = self.get()
+        while frame is not None:
+            yield frame
+            frame = self.get()
+
+    def get(self, timeout=None):
+        """Return the next frame, waiting for it up to *timeout* seconds
+        if not None, or None if there is none at the end of the media.
+        """
+        with self._cond:
+            if not self._ready and not self._ended:
+                self._cond.wait_for(lambda: self._ready or self._ended, timeout)
+            if not self._ready:
+                return None
+            frame = self._ready.popleft()
+            self.delivered += 1
+        if self.deadline is not None:
+            if libvlc_clock() - frame.pts > self.deadline * 1e6:
+                self.late += 1
+        return frame
+
+    def close(self):
+        """Stop waiting for frames and buffers, dropping the next frames,
+        before stopping and releasing the player (whose release closes
+        the sink too).
+        """
+        for s in self._subscriptions:
+            self._event_manager.event_unsubscribe(s)
+        self._subscriptions = []
+        with self._cond:
+            self._closed = True
+        self._end(None)
+        if _video_sinks.get(self.player) is self:
+            del _video_sinks[self.player]
+
+    def _release(self, frame):
+        """(INTERNAL) Free the buffer of *frame*, unless reallocated or free."""
+        i = frame._index
+        with self._cond:
+            if i < len(self._pool) and self._pool[i] is frame and i not in self._free:
+                self._free.append(i)
+                if self.policy == "block":
+                    self._cond.notify_all()
+
+    def _end(self, event):
+        """(INTERNAL) Wake the threads waiting for frames."""
+        with self._cond:
+            self._ended = True
+            self._cond.notify_all()
+
+    def _format(self, opaque, chroma, width, height, pitches, lines):
+        """(INTERNAL) Set the format and allocate the buffers."""
+        try:
+            w, h = self.width, self.height
+            if not w and not h:
+                w, h = width[0], height[0]
+            elif not h:
+                h = (w * height[0] // width[0] + 1) & ~1 if width[0] else 0
+            elif not w:
+                w = (h * width[0] // height[0] + 1) & ~1 if height[0] else 0
+            if not w or not h:
+                return 0
+            ps, ns = video_planes(self.chroma, w, h)
+            ctypes.memmove(chroma, self.chroma, 4)
+            width[0], height[0] = w, h
+            for i, (p, n) in enumerate(zip(ps, ns)):
+                pitches[i], lines[i] = p, n
+
+            # one buffer per frame, for all its planes
+            size = sum(_video_align(p * n) for p, n in zip(ps, ns)) + _VIDEO_ALIGN
+            pool = tuple(
+                VideoFrame(
+                    self, i, (ctypes.c_ubyte * size)(), self.chroma, w, h, ps, ns
+                )
+                for i in range(self.buffers + 1)
+            )
+            with self._cond:
+                self._pool, self._scratch = pool[:-1], pool[-1]
+                self._free = collections.deque(range(self.buffers))
+                self._ready.clear()
+                self._ended = False
+            return self.buffers
+        except Exception:
+            logger.exception("Video format callback")
+            return 0
+
+    def _lock(self, opaque, planes):
+        """(INTERNAL) Return a free buffer, or the scratch one."""
+        try:
+            i = self._free.popleft()  # thread-safe
+        except IndexError:
+            i = None
+            if self.policy == "block":
+                with self._cond:
+                    self._cond.wait_for(lambda: self._free or self._closed)
+                    if self._free:
+                        i = self._free.popleft()
+            elif self.policy != "drop-newest":
+                with self._cond:
+                    if self._ready:  # reuse the buffer of the oldest frame
+                        i = self._ready.popleft()._index
+                        self.dropped += 1
+            if i is None:
+                for j, a in enumerate(self._scratch._addresses):
+                    planes[j] = a
+                return None
+        addresses = self._pool[i]._addresses
+        planes[0] = addresses[0]
+        if len(addresses) > 1:  # planar
+            for j in range(1, len(addresses)):
+                planes[j] = addresses[j]
+        return i + 1
+
+    def _display(self, opaque, picture):
+        """(INTERNAL) Pass the frame of the *picture* to the consumer."""
+        number = self.frames
+        self.frames += 1
+        if picture is None:
+            self.dropped += 1
+            return
+        frame = self._pool[picture - 1]
+        frame.pts = libvlc_clock()
+        if self.times:
+            frame.time = libvlc_media_player_get_time(self.player)
+        frame.number = number
+        if self.callback is not None:
+            self.delivered += 1
+            try:
+                self.callback(frame)
+            except Exception:
+                logger.exception("Video frame callback %r", self.callback)
+            return
+        with self._cond:
+            ready = self._ready
+            if len(ready) >= self.queue:
+                self.dropped += 1
+                if self.policy == "drop-newest":
+                    self._free.append(frame._index)
+                    return
+                self._free.append(ready.popleft()._index)
+            ready.append(frame)
+            self._cond.notify()
+
+
+def iter_frames(
+    mrl, size=None, chroma="RV24", every_n=1, buffers=4, instance=None, rate=None
+):
+    """Iterate over the video frames of a media, decoded without window
+    nor audio output, until its end::
+
+        for frame in vlc.iter_frames("video.mp4", size=(640, 360), every_n=25):
+            analyze(frame.array(), frame.time)
+
+    Each :class:`VideoFrame` is released when the next one is requested,
+    the decoder waiting for the consumer when its buffers are all used.
+    By default, the media is decoded as fast as libvlc plays it, i.e. up
+    to 32 times faster than real time, rather than at real time speed.
+
+    :param mrl: the path or URL of the media, see :meth:`Instance.media_new`.
+    :param size: the (width, height) of the frames, either 0 to keep the
+        aspect ratio, or None for the size of the video.
+    :param chroma: the chroma, see :class:`VideoFrameSink`.
+    :param every_n: yield one frame every *every_n* frames.
+    :param buffers: the number of buffers.
+    :param instance: the :class:`Instance`, or None for a new one.
+    :param rate: the playback rate, e.g. 1 for real time, or None for
+        the fastest one, the late frames being kept.
+    """
+    own = instance is None
+    if own:
+        instance = Instance(
+            "--no-audio", "--no-drop-late-frames", "--no-skip-frames", "--quiet"
+        )
+    media = instance.media_new(mrl, ":no-audio")  # also with the instance given
+    player = instance.media_player_new()
+    player.set_media(media)
+    width, height = size or (0, 0)
+    sink = VideoFrameSink(
+        player, chroma, width, height, buffers, policy="block", times=True
+    )
+    frame = None
+    try:
+        if rate is None:
+            rate = 32.0  # the highest rate of libvlc 3
+        if rate != 1.0:
+            player.set_rate(rate)
+        if player.play() < 0:
+            raise VLCException("cannot play %r" % (mrl,))
+        for frame in sink:
+            if frame.number % every_n:
+                frame.release()
+                continue
+            yield frame
+            frame.release()
+        frame = None
+    finally:
+        if frame is not None:  # the iteration was stopped
+            frame.release()
+        sink.close()  # not to block the decoder, and to drop it
+        player.stop()
+        player.release()
+        media.release()
+        if own:
+            instance.release()
+
+
+# The shared memory of SharedFrameSink: a header, the state (number of
+# frames displayed, and whether the video ended), then the slots of the
+# frames, each with a header (sequence, then pts and time) and the planes
+_SHM_MAGIC = b"VLCSHM\x00\x01"
+_SHM_HEADER = struct.Struct(
+    "<8sIIII4sI3I3I"
+)  # magic, slots, slot size, width, height, chroma, planes, pitches, lines
+_SHM_DISPLAYED = struct.Struct("<Q")  # at _SHM_STATE
+_SHM_ENDED = struct.Struct("<I")  # at _SHM_STATE + 8
+_SHM_SEQUENCE = struct.Struct("<Q")  # at the slot
+_SHM_TIMES = struct.Struct("<qq")  # pts, time, at the slot + 8
+_SHM_STATE = 64
+_SHM_SLOTS = 128  # the offset of the first slot
+_SHM_SLOT_HEADER = 64  # the offset of the planes in a slot
+
+
+def _shared_memory(name):
+    """(INTERNAL) Attach the shared memory *name*, without the resource
+    tracker of this process unlinking it at exit.
+    """
+    from multiprocessing import shared_memory
+
+    try:
+        return shared_memory.SharedMemory(name, track=False)  # Python 3.13+
+    except TypeError:
+        pass
+    shm = shared_memory.SharedMemory(name)
+    if not any(getattr(s, "name", None) == name for s in _video_sinks.values()):
+        try:
+            from multiprocessing import resource_tracker
+
+            resource_tracker.unregister(shm._name, "shared_memory")
+        except Exception:  # e.g. on Windows
+            pass
+    return shm
+
+
+class SharedFrameSink(object):
+    """Export the video frames of a :class:`MediaPlayer` to other
+    processes, through a ring of *slots* frames in shared memory which
+    libvlc decodes into, read with :class:`SharedFrameReader`::
+
+        sink = vlc.SharedFrameSink(player, 640, 360, "I420")
+        workers = [Process(target=work, args=(sink.name,)) for _ in range(4)]
+        player.play()
+
+        def work(name):
+            with vlc.SharedFrameReader(name) as reader:
+                for frame in reader:
+                    infer(frame.array(0))
+
+    The slots are reused in turn, never waiting for the readers, which
+    take no lock: each slot has a sequence number, odd while libvlc
+    decodes into it, so that a reader can tell whether a frame has been
+    overwritten, see :meth:`SharedFrame.valid`.  Once closed, the sink
+    resets the video callbacks of the player, and drops any next frame.
+
+    :param player: the :class:`MediaPlayer`, not playing yet.
+    :param width: the width, in pixels.
+    :param height: the height, in pixels.
+    :param chroma: the chroma, see :func:`video_planes`.
+    :param slots: the number of slots of the ring.
+    :param name: the name of the shared memory, or None for a new name.
+    :param times: whether to read the playback time of each frame, see
+        :class:`VideoFrameSink`.
+    """
+
+    def __init__(
+        self, player, width, height, chroma="RV32", slots=8, name=None, times=False
+    ):
+        from multiprocessing import shared_memory
+
+        chroma = str_to_bytes(chroma)
+        pitches, lines = video_planes(chroma, width, height)
+        sizes = [_video_align(p * n) for p, n in zip(pitches, lines)]
+        self.slot_size = _SHM_SLOT_HEADER + sum(sizes)
+        self._shm = shared_memory.SharedMemory(
+            name, create=True, size=_SHM_SLOTS + slots * self.slot_size
+        )
+        self.name = self._shm.name
+        self.player = player
+        self.width, self.height, self.chroma = width, height, chroma
+        self.pitches, self.lines = pitches, lines
+        self.slots = slots
+        self.times = times
+        self.frames = 0  # displayed
+
+        self._buf = buf = self._shm.buf
+        pad = (0,) * (3 - len(pitches))
+        _SHM_HEADER.pack_into(
+            buf,
+            0,
+            _SHM_MAGIC,
+            slots,
+            self.slot_size,
+            width,
+            height,
+            chroma,
+            len(pitches),
+            *(pitches + pad + lines + pad),
+        )
+        _SHM_DISPLAYED.pack_into(buf, _SHM_STATE, 0)
+        _SHM_ENDED.pack_into(buf, _SHM_STATE + 8, 0)
+        # the address of the shared memory, exported until closed
+        self._base = (ctypes.c_ubyte * len(buf)).from_buffer(buf)
+        base = ctypes.addressof(self._base)
+        self._addresses = []  # of the planes of each slot
+        for i in range(slots):
+            a = base + _SHM_SLOTS + i * self.slot_size + _SHM_SLOT_HEADER
+            addresses = []
+            for size in sizes:
+                addresses.append(a)
+                a += size
+            self._addresses.append(tuple(addresses))
+        self._numbers = [0] * slots  # of the frames being decoded
+        self._locked = 0  # the number of the next frame
+
+        # the chroma as a pointer, to set it
+        _VideoFormatCb = ctypes.CFUNCTYPE(
+            ctypes.c_uint,
+            ctypes.POINTER(ctypes.c_void_p),
+            ctypes.c_void_p,
+            ctypes.POINTER(ctypes.c_uint),
+            ctypes.POINTER(ctypes.c_uint),
+            ctypes.POINTER(ctypes.c_uint),
+            ctypes.POINTER(ctypes.c_uint),
+        )
+        self._format_cb = _VideoFormatCb(self._format)
+        self._lock_cb = CallbackDecorators.VideoLockCb(self._lock)
+        self._display_cb = CallbackDecorators.VideoDisplayCb(self._display)
+        player.video_set_callbacks(self._lock_cb, None, self._display_cb, None)
+        player.video_set_format_callbacks(self._format_cb, None)
+        _video_sinks[player] = self
+        _Cfollowers.setdefault(player, weakref.WeakSet()).add(self)
+
+        self._event_manager = em = player.event_manager()
+        self._subscriptions = [
+            em.event_subscribe(e, self._end)
+            for e in (
+                EventType.MediaPlayerEndReached,
+                EventType.MediaPlayerStopped,
+                EventType.MediaPlayerEncounteredError,
+            )
+        ]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Mark the end of the frames, and free the shared memory, once
+        the player is stopped (its release does it too).
+        """
+        if self._shm is None:
+            return
+        for s in self._subscriptions:
+            self._event_manager.event_unsubscribe(s)
+        self._subscriptions = []
+        self._end(None)
+        self.player.video_set_callbacks(None, None, None, None)
+        self.player.video_set_format_callbacks(None, None)
+        if _video_sinks.get(self.player) is self:
+            del _video_sinks[self.player]
+        # for a video output still running, instead of the slots
+        self._scratch = ctypes.create_string_buffer(self.slot_size)
+        scratch = ctypes.addressof(self._scratch)
+        self._addresses = [(scratch,) * len(self.pitches)] * self.slots
+        self._buf = None
+        del self._base
+        self._shm.close()
+        self._shm.unlink()
+        self._shm = None
+
+    def _end(self, event):
+        """(INTERNAL) Tell the readers the video ended."""
+        _SHM_ENDED.pack_into(self._buf, _SHM_STATE + 8, 1)
+
+    def _format(self, opaque, chroma, width, height, pitches, lines):
+        """(INTERNAL) Set the format of the shared memory."""
+        ctypes.memmove(chroma, self.chroma, 4)
+        width[0], height[0] = self.width, self.height
+        for i, (p, n) in enumerate(zip(self.pitches, self.lines)):
+            pitches[i], lines[i] = p, n
+        if self._buf is None:  # closed
+            return 0
+        _SHM_ENDED.pack_into(self._buf, _SHM_STATE + 8, 0)
+        return self.slots
+
+    def _lock(self, opaque, planes):
+        """(INTERNAL) Return the next slot, marked as being written, or
+        the scratch buffer once closed.
+        """
+        buf = self._buf
+        if buf is None:
+            for j, a in enumerate(self._addresses[0]):
+                planes[j] = a
+            return None
+        n = self._locked
+        self._locked = n + 1
+        i = n % self.slots
+        self._numbers[i] = n
+        _SHM_SEQUENCE.pack_into(buf, _SHM_SLOTS + i * self.slot_size, 2 * n + 1)
+        for j, a in enumerate(self._addresses[i]):
+            planes[j] = a
+        return i + 1
+
+    def _display(self, opaque, picture):
+        """(INTERNAL) Publish the frame of the slot *picture*: its times
+        first, then its sequence, for the readers to check it after.
+        """
+        buf = self._buf
+        if picture is None or buf is None:  # closed
+            return
+        i = picture - 1
+        n = self._numbers[i]
+        offset = _SHM_SLOTS + i * self.slot_size
+        _SHM_TIMES.pack_into(
+            buf,
+            offset + 8,
+            libvlc_clock(),
+            libvlc_media_player_get_time(self.player) if self.times else 0,
+        )
+        _SHM_SEQUENCE.pack_into(buf, offset, 2 * n + 2)
+        _SHM_DISPLAYED.pack_into(buf, _SHM_STATE, n + 1)
+        self.frames += 1
+
+
+class SharedFrame(VideoFrame):
+    """A video frame of a :class:`SharedFrameReader`, whose planes are
+    views of the shared memory: they may be overwritten by the next
+    frames while in use, see :meth:`valid`.
+    """
+
+    __slots__ = ("_reader", "_offset")
+
+    def __init__(self, reader, slot, number, pts, time):
+        self.chroma = reader.chroma
+        self.width = reader.width
+        self.height = reader.height
+        self.pitches = reader.pitches
+        self.lines = reader.lines
+        self.planes = reader._planes[slot]
+        self.number = number
+        self.pts = pts
+        self.time = time
+        self._reader = reader
+        self._offset = _SHM_SLOTS + slot * reader.slot_size
+
+    def release(self):
+        """Nothing to do, the frame is overwritten in turn."""
+
+    def valid(self):
+        """Return whether the frame has not been overwritten yet, e.g.
+        after processing or copying it.
+        """
+        buf = self._reader._buf
+        return _SHM_SEQUENCE.unpack_from(buf, self._offset)[0] == 2 * self.number + 2
+
+
+class SharedFrameReader(object):
+    """Read the frames of a :class:`SharedFrameSink`, e.g. in another
+    process, without lock: each reader gets the frames in order, from
+    the oldest one still in the ring, skipping the ones overwritten
+    (counted in *missed*), until the end of the video.
+
+    :param name: the name of the shared memory of the sink.
+    """
+
+    def __init__(self, name):
+        self._shm = _shared_memory(name)
+        self._buf = buf = self._shm.buf
+        h = _SHM_HEADER.unpack_from(buf, 0)
+        if h[0] != _SHM_MAGIC:
+            self._buf = None
+            self._shm.close()
+            raise VLCException("not a frame ring: %r" % (name,))
+        self.slots, self.slot_size, self.width, self.height, self.chroma = h[1:6]
+        n = h[6]
+        self.pitches, self.lines = h[7 : 7 + n], h[10 : 10 + n]
+        self.next = 0  # the number of the next frame
+        self.missed = 0
+        self._planes = []  # the views of the planes of each slot
+        for i in range(self.slots):
+            a = _SHM_SLOTS + i * self.slot_size + _SHM_SLOT_HEADER
+            planes = []
+            for p, n in zip(self.pitches, self.lines):
+                planes.append(buf[a : a + p * n].toreadonly())
+                a += _video_align(p * n)
+            self._planes.append(tuple(planes))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __iter__(self):
+        frame = self.get()
+        while frame is not None:
+            yield frame
+            frame = self.get()
+
+    def get(self, timeout=None, poll=0.001):
+        """Return the next :class:`SharedFrame`, polling for it every
+        *poll* seconds up to *timeout* seconds if not None, or None at
+        the end of the video.
+        """
+        buf = self._buf
+        end = None if timeout is None else time.monotonic() + timeout
+        while True:
+            displayed = _SHM_DISPLAYED.unpack_from(buf, _SHM_STATE)[0]
+            if self.next < displayed:
+                if self.next < displayed - self.slots:  # overwritten
+                    self.missed += displayed - self.slots - self.next
+                    self.next = displayed - self.slots
+                n = self.next
+                self.next = n + 1
+                i = n % self.slots
+                offset = _SHM_SLOTS + i * self.slot_size
+                seq = 2 * n + 2
+                if _SHM_SEQUENCE.unpack_from(buf, offset)[0] == seq:
+                    pts, t = _SHM_TIMES.unpack_from(buf, offset + 8)
+                    if _SHM_SEQUENCE.unpack_from(buf, offset)[0] == seq:  # unchanged
+                        return SharedFrame(self, i, n, pts, t)
+                self.missed += 1  # dropped or being overwritten
+                continue
+            if _SHM_ENDED.unpack_from(buf, _SHM_STATE + 8)[0]:
+                return None
+            if end is not None and time.monotonic() >= end:
+                return None
+            time.sleep(poll)
+
+    def latest(self):
+        """Skip to the latest frame displayed, the next one got."""
+        displayed = _SHM_DISPLAYED.unpack_from(self._buf, _SHM_STATE)[0]
+        if self.next < displayed - 1:
+            self.missed += displayed - 1 - self.next
+            self.next = displayed - 1
+
+    def close(self):
+        """Detach the shared memory, once the frames are no longer used."""
+        if self._shm is None:
+            return
+        for planes in self._planes:
+            for p in planes:
+                p.release()
+        self._planes = []
+        self._buf = None
+        self._shm.close()
+        self._shm = None
+
+
 if __name__ == "__main__":
     logging.basicConfig(level=logging.DEBUG)
     try:
@@ -40,14 +40,23 @@ will be implicitly created. The latter can be obtained using the
 :meth:`MediaPlayer.get_instance` and :class:`MediaListPlayer`.
 """
 
+import atexit
+import collections
 import ctypes
 import functools
+import heapq
 
 # Used by EventManager in override.py
 import inspect as _inspect
+import json
 import logging
 import os
+import struct
 import sys
+import threading
+import time
+import types
+import weakref
 from ctypes.util import find_library
 
 logger = logging.getLogger(__name__)
@@ -86,22 +95,15 @@ def len_args(func):
 _internal_guard = object()
 
 
-def find_lib():
-    dll = None
+def _find_lib():
+    """(INTERNAL) Look for the libvlc library, without loading it.
+
+    :return: a dict with the ``libs`` to try loading in turn, the
+        ``preload`` libraries to load before, the directory to ``chdir``
+        into while loading (or None) and the ``plugin_path`` (or None).
+    """
     plugin_path = os.environ.get("PYTHON_VLC_MODULE_PATH", None)
-    if "PYTHON_VLC_LIB_PATH" in os.environ:
-        try:
-            dll = ctypes.CDLL(os.environ["PYTHON_VLC_LIB_PATH"])
-        except OSError:
-            logger.error(
-                "Cannot load lib specified by PYTHON_VLC_LIB_PATH env. variable"
-            )
-            sys.exit(1)
-    if plugin_path and not os.path.isdir(plugin_path):
-        logger.error("Invalid PYTHON_VLC_MODULE_PATH specified. Please fix.")
-        sys.exit(1)
-    if dll is not None:
-        return dll, plugin_path
+    lib = dict(libs=[], preload=[], chdir=None)
 
     if sys.platform.startswith("win"):
         libname = "libvlc.dll"
@@ -139,21 +141,13 @@ def find_lib():
                     if os.path.exists(p):
                         plugin_path = os.path.dirname(p)
                         break
-            if plugin_path is not None:  # try loading
-                # PyInstaller Windows fix
-                if "PyInstallerCDLL" in ctypes.CDLL.__name__:
-                    ctypes.windll.kernel32.SetDllDirectoryW(None)
-                p = os.getcwd()
-                os.chdir(plugin_path)
-                # if chdir failed, this will raise an exception
-                dll = ctypes.CDLL(".\\" + libname)
-                # restore cwd after dll has been loaded
-                os.chdir(p)
-            else:  # may fail
-                dll = ctypes.CDLL(".\\" + libname)
+            # load from the plugin_path directory if found, else
+            # from the current directory (may fail)
+            lib["chdir"] = plugin_path
+            lib["libs"].append(".\\" + libname)
         else:
             plugin_path = os.path.dirname(p)
-            dll = ctypes.CDLL(p)
+            lib["libs"].append(p)
 
     elif sys.platform.startswith("darwin"):
         # FIXME: should find a means to configure path
@@ -162,8 +156,8 @@ def find_lib():
         p = d + "lib/libvlc.dylib"
         if os.path.exists(p) and os.path.exists(c):
             # pre-load libvlccore VLC 2.2.8+
-            ctypes.CDLL(c)
-            dll = ctypes.CDLL(p)
+            lib["preload"].append(c)
+            lib["libs"].append(p)
             for p in ("modules", "plugins"):
                 p = d + p
                 if os.path.isdir(p):
@@ -171,23 +165,198 @@ def find_lib():
                     break
         else:  # hope, some [DY]LD_LIBRARY_PATH is set...
             # pre-load libvlccore VLC 2.2.8+
-            ctypes.CDLL("libvlccore.dylib")
-            dll = ctypes.CDLL("libvlc.dylib")
+            lib["preload"].append("libvlccore.dylib")
+            lib["libs"].append("libvlc.dylib")
 
     else:
         # All other OSes (linux, freebsd...)
         p = find_library("vlc")
+        if p:
+            lib["libs"].append(p)
+        lib["libs"].append("libvlc.so.5")
+
+    lib["plugin_path"] = plugin_path
+    return lib
+
+
+def _lib_cache_file():
+    """(INTERNAL) Return the name of the libvlc discovery cache file.
+
+    It is stored in the ``python-vlc`` directory of the user cache
+    directory, unless the ``PYTHON_VLC_CACHE_DIR`` environment variable
+    gives another directory. Set the latter to an empty string to
+    disable the cache.
+    """
+    d = os.environ.get("PYTHON_VLC_CACHE_DIR", None)
+    if d is None:
+        if sys.platform.startswith("win"):
+            d = os.environ.get("LOCALAPPDATA", "")
+        elif sys.platform.startswith("darwin"):
+            d = os.path.expanduser("~/Library/Caches")
+        else:
+            d = os.environ.get("XDG_CACHE_HOME", "") or os.path.expanduser("~/.cache")
+        if d:
+            d = os.path.join(d, "python-vlc")
+    return os.path.join(d, "libvlc.json") if d else None
+
+
+def _lib_mtime(lib):
+    """(INTERNAL) Return the modification time of the first library
+    to try loading, or of the dynamic linker cache for a bare name.
+    """
+    p = lib["libs"][0] if lib["libs"] else ""
+    if lib["chdir"]:
+        p = os.path.join(lib["chdir"], p)
+    elif not os.path.dirname(p):
+        p = "/etc/ld.so.cache"
+    try:
+        return os.stat(p).st_mtime
+    except OSError:
+        return None
+
+
+def _lib_cache_key():
+    """(INTERNAL) Return the key of the current configuration in the
+    libvlc discovery cache.
+    """
+    return "|".join(
+        (
+            os.environ.get("PYTHON_VLC_LIB_PATH", ""),
+            os.environ.get("PYTHON_VLC_MODULE_PATH", ""),
+            sys.platform,
+        )
+    )
+
+
+def find_lib():
+    """Find the libvlc library and the VLC plugin directory.
+
+    The result of the search is cached (see ``_lib_cache_file``) as
+    long as the library is not modified, and the library is only loaded
+    on first use.
+
+    :return: a tuple (dll, plugin_path).
+    """
+    plugin_path = os.environ.get("PYTHON_VLC_MODULE_PATH", None)
+    if plugin_path and not os.path.isdir(plugin_path):
+        logger.error("Invalid PYTHON_VLC_MODULE_PATH specified. Please fix.")
+        sys.exit(1)
+    if "PYTHON_VLC_LIB_PATH" in os.environ:
+        lib = dict(
+            libs=[os.environ["PYTHON_VLC_LIB_PATH"]],
+            preload=[],
+            chdir=None,
+            plugin_path=plugin_path,
+        )
+        return _Cdll(lib), plugin_path
+
+    cache, key, lib = _lib_cache_file(), _lib_cache_key(), None
+    entries = {}
+    if cache:
         try:
-            dll = ctypes.CDLL(p)
-        except OSError:  # may fail
-            dll = None
-        if dll is None:
+            with open(cache) as f:
+                entries = json.load(f)
+            lib = entries.get(key)
+            if lib is not None and lib.get("mtime") != _lib_mtime(lib):
+                lib = None  # changed since
+        except (OSError, ValueError, AttributeError):
+            entries = {}
+    if lib is None:
+        lib = _find_lib()
+        lib["mtime"] = _lib_mtime(lib)
+        if cache:
             try:
-                dll = ctypes.CDLL("libvlc.so.5")
-            except:
-                raise NotImplementedError("Cannot find libvlc lib")
+                os.makedirs(os.path.dirname(cache), exist_ok=True)
+                entries[key] = lib
+                t = "%s.%d" % (cache, os.getpid())
+                with open(t, "w") as f:
+                    json.dump(entries, f)
+                os.replace(t, cache)
+            except (OSError, TypeError):
+                pass  # read-only, no cache
+    else:
+        lib["cached"] = True
+    return _Cdll(lib), lib["plugin_path"]
+
+
+class _Cdll(object):
+    """(INTERNAL) The libvlc library, loaded on first use.
+
+    Attributes are those of the ``ctypes.CDLL`` instance, loaded as
+    described by *lib*, see ``_find_lib``.
+    """
+
+    def __init__(self, lib):
+        self._lib = lib
+        self._dll = None
+        self._hooks = []
+        self._lock = threading.Lock()
 
-    return (dll, plugin_path)
+    def __getattr__(self, name):
+        # only called for the attributes not set on this object,
+        # i.e. those of the library
+        return getattr(self._dll or self._load(), name)
+
+    def __repr__(self):
+        if self._dll is None:
+            return "<%s %r, not loaded>" % (self.__class__.__name__, self._lib["libs"])
+        return repr(self._dll)
+
+    def on_load(self, hook):
+        """(INTERNAL) Call *hook* with the ``ctypes.CDLL`` once loaded."""
+        if self._dll is None:
+            self._hooks.append(hook)
+        else:
+            hook(self._dll)
+
+    def _load(self):
+        with self._lock:
+            if self._dll is None:
+                try:
+                    dll = self._cdll(self._lib)
+                except OSError:
+                    if "PYTHON_VLC_LIB_PATH" in os.environ:
+                        logger.error(
+                            "Cannot load lib specified by PYTHON_VLC_LIB_PATH env. variable"
+                        )
+                        raise
+                    if not self._lib.get("cached"):
+                        raise
+                    # the cached search may be obsolete
+                    self._lib = _find_lib()
+                    dll = self._cdll(self._lib)
+                # ctypes functions are created from (name, dll)
+                # tuples, which need the library handle
+                self._handle = dll._handle
+                self._name = dll._name
+                self._dll = dll
+                for hook in self._hooks:
+                    hook(dll)
+                self._hooks = []
+        return self._dll
+
+    @staticmethod
+    def _cdll(lib):
+        for p in lib["preload"]:
+            ctypes.CDLL(p)
+        if lib["chdir"]:
+            # PyInstaller Windows fix
+            if "PyInstallerCDLL" in ctypes.CDLL.__name__:
+                ctypes.windll.kernel32.SetDllDirectoryW(None)
+            p = os.getcwd()
+            os.chdir(lib["chdir"])
+            # if chdir failed, this will raise an exception
+            try:
+                return ctypes.CDLL(lib["libs"][0])
+            finally:
+                # restore cwd after dll has been loaded
+                os.chdir(p)
+        for p in lib["libs"][:-1]:
+            try:
+                return ctypes.CDLL(p)
+            except OSError:  # may fail
+                pass
+        return ctypes.CDLL(lib["libs"][-1])
 
 
 # plugin_path used on win32 and MacOS in override.py
@@ -213,12 +382,18 @@ class memoize_parameterless(object):
 
     If called later with the same arguments, the cached value is returned (not reevaluated).
 
+    The values are cached as long as the object is alive and the last
+    reference to it has not been released, see :func:`_Crelease`.
+
     Adapted from https://wiki.python.org/moin/PythonDecoratorLibrary.
     """
 
+    _caches = []  # the caches of all the decorated methods
+
     def __init__(self, func):
         self.func = func
-        self._cache = {}
+        self._cache = weakref.WeakKeyDictionary()
+        self._caches.append(self._cache)
 
     def __call__(self, obj):
         try:
@@ -261,27 +436,254 @@ def try_fspath(path):
 
 
 _Cfunctions = {}  # from LibVLC __version__
+_Cprototypes = {}  # (restype, *argtypes): CFUNCTYPE
 _Globals = globals()  # sys.modules[__name__].__dict__
 
+# Replace the generated Python function by the ctypes function
+# object in this module once it has been bound, so that later calls
+# go straight to libvlc. Define the PYTHON_VLC_KEEP_WRAPPERS
+# environment variable (or set this to False) to keep the Python
+# functions in place, as was done before unless running python -O.
+rebind_functions = not os.environ.get("PYTHON_VLC_KEEP_WRAPPERS")
+
 
 def _Cfunction(name, flags, errcheck, *types):
     """(INTERNAL) New ctypes function binding."""
     if hasattr(dll, name) and name in _Globals:
-        p = ctypes.CFUNCTYPE(*types)
+        p = _Cprototypes.get(types)
+        if p is None:  # share prototypes between functions
+            p = _Cprototypes[types] = ctypes.CFUNCTYPE(*types)
         f = p((name, dll), flags)
         if errcheck is not None:
             f.errcheck = errcheck
-        # replace the Python function
-        # in this module, but only when
-        # running as python -O or -OO
-        if __debug__:
-            _Cfunctions[name] = f
-        else:
+        _Cfunctions[name] = f
+        if rebind_functions or not __debug__:
+            # keep the name, docstring and signature of the
+            # Python function it replaces in this module
+            w = _Globals[name]
+            functools.update_wrapper(f, w)
             _Globals[name] = f
         return f
     raise NameError("no function %r" % (name,))
 
 
+# Rarely used classes and functions are only defined on first access
+# if the module was generated with generate.py --lazy, see make_lazy()
+_Clazy = {}  # name: loader function
+_Clazy_lock = threading.RLock()
+_Cmodule = sys.modules[__name__]
+
+
+def __getattr__(name):
+    """(INTERNAL) Define lazily loaded classes and functions."""
+    load = _Clazy.get(name)
+    if load is None:
+        raise AttributeError("module %r has no attribute %r" % (__name__, name))
+    with _Clazy_lock:
+        if name not in _Globals:
+            load()
+    return _Globals[name]
+
+
+def __dir__():
+    return sorted(set(_Globals).union(_Clazy))
+
+
+# Modules generated with generate.py --manifest describe the libvlc
+# functions in the _Cmanifest tuple instead of defining them one by
+# one: each entry holds the function name, the parameter flags, the
+# errcheck function and the result and argument types, the latter two
+# as expressions evaluated once the function is first called.
+_Cmanifest = ()
+_Cexpressions = {}  # expression: value
+
+
+class _Cnames(dict):
+    """(INTERNAL) Namespace evaluating the manifest expressions, which
+    also finds the lazily defined classes, see :func:`__getattr__`.
+    """
+
+    def __missing__(self, name):
+        try:
+            return getattr(_Cmodule, name)
+        except AttributeError:
+            raise KeyError(name)
+
+
+def _Ceval(expression):
+    """(INTERNAL) Value of a manifest expression."""
+    if expression is None:
+        return None
+    try:
+        return _Cexpressions[expression]
+    except KeyError:
+        v = _Cexpressions[expression] = eval(expression, _Globals, _Cnames())
+        return v
+
+
+class _Cstub(object):
+    """(INTERNAL) Module function binding a manifest entry on first call,
+    see :func:`_Cfunction`.
+    """
+
+    __slots__ = ("entry", "__name__", "__qualname__")
+
+    def __init__(self, entry):
+        self.entry = entry
+        self.__name__ = self.__qualname__ = entry[0]
+
+    @property
+    def __signature__(self):
+        return _inspect.Signature(
+            [
+                _inspect.Parameter(n, _inspect.Parameter.POSITIONAL_OR_KEYWORD)
+                for flag, n in self.entry[1]
+                if flag != 2
+            ]
+        )
+
+    def __repr__(self):
+        return "<libvlc function %s>" % (self.entry[0],)
+
+    @property
+    def doc(self):
+        """The docstring of the function, which the manifest omits."""
+        return "%s(%s): libvlc function, see the libvlc documentation." % (
+            self.entry[0],
+            ", ".join(n for flag, n in self.entry[1] if flag != 2),
+        )
+
+    __doc__ = doc  # for help(), instead of the docstring of this class
+
+    def __call__(self, *args, **kwds):
+        name, flags, errcheck, *types = self.entry
+        f = _Cfunctions.get(name, None) or _Cfunction(
+            name, flags, _Ceval(errcheck), *map(_Ceval, types)
+        )
+        return f(*args, **kwds)
+
+
+def _Cstubs(manifest):
+    """(INTERNAL) Define the module functions of a manifest."""
+    global _Cmanifest
+    _Cmanifest += manifest
+    for entry in manifest:
+        _Globals[entry[0]] = _Cstub(entry)
+
+
+class _Cmethod(object):
+    """(INTERNAL) Decorator for the generated methods which simply pass
+    their arguments on to a libvlc function.
+
+    Once that function has been bound (see :func:`_Cfunction`), the
+    decorated method is replaced in its class by a :class:`_Cbound`
+    descriptor, so that calling the method calls the ctypes function
+    object directly, with :meth:`_Ctype.from_param` converting *self*.
+    Until then, the Python method is used.
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self.func = None
+        self.owner = None
+
+    def __call__(self, func):
+        self.func = func
+        functools.update_wrapper(self, func)
+        return self
+
+    def __set_name__(self, owner, name):
+        self.owner = owner
+
+    def __get__(self, obj, objtype=None):
+        f = _Cfunctions.get(self.name)
+        if f is None or not (rebind_functions or not __debug__):
+            return self.func.__get__(obj, objtype)
+        b = _Cbound(f, self.func)
+        if self.owner is not None:
+            setattr(self.owner, self.func.__name__, b)
+        return b.__get__(obj, objtype)
+
+
+class _Cbound(property):
+    """(INTERNAL) Method descriptor returning a ctypes function object
+    bound to the instance, see :class:`_Cmethod`.
+    """
+
+    def __init__(self, cfunc, func):
+        property.__init__(self, functools.partial(types.MethodType, cfunc))
+        self.cfunc = cfunc
+        self.__doc__ = func.__doc__
+        self.__name__ = func.__name__
+        self.__qualname__ = func.__qualname__
+        self.__wrapped__ = func
+
+    def __call__(self, *args, **kwds):
+        """Call the method on the class, with the instance as first argument."""
+        return self.cfunc(*args, **kwds)
+
+
+# The wrappers of the libvlc objects, so that the same libvlc object
+# always gets the same wrapper, as long as the latter is referenced
+# and has not been released
+_Cinstances = weakref.WeakValueDictionary()  # (class, pointer): wrapper
+
+# The finalizers of the wrappers to release when garbage collected,
+# see :meth:`_Ctype.auto_release`
+_Cfinalizers = weakref.WeakKeyDictionary()  # wrapper: weakref.finalize
+
+# The EventHub instances with objects, kept alive as long as their
+# native callback is attached, and told about the objects released
+_Chubs = set()
+
+# The helpers following the events or the video of an object, e.g.
+# its PlaybackClock, closed on its release, see _Crelease
+_Cfollowers = weakref.WeakKeyDictionary()  # wrapper: weakref.WeakSet
+
+# The EventManager instances with callbacks attached, kept alive with
+# their native callback until detached, even if the wrapper of their
+# object is not referenced anymore, since libvlc may still call it
+_Cmanagers = set()
+
+# The number of libvlc references obtained through the bindings and
+# not released yet, per libvlc object: the wrapper and its memoized
+# values are only dropped on the release of the last one
+_Crefs = {}  # (class, pointer): number
+
+# The number of libvlc references obtained and not released yet per
+# class, counted if the PYTHON_VLC_DEBUG_HANDLES environment variable
+# is defined, see :func:`live_handles`
+_Chandles = (
+    collections.Counter() if os.environ.get("PYTHON_VLC_DEBUG_HANDLES") else None
+)
+
+
+def live_handles():
+    """Return the number of libvlc objects obtained and not released
+    yet per class name, as a dict, if the ``PYTHON_VLC_DEBUG_HANDLES``
+    environment variable is defined. The remaining ones are reported as
+    leaks at exit.
+
+    The objects are counted each time they are returned by libvlc, since
+    libvlc then holds a reference for the caller: e.g. each call of
+    :meth:`MediaPlayer.get_media` needs its own :meth:`Media.release`.
+    The wrappers created from a pointer, e.g. ``Media(ptr)``, hold none.
+    """
+    if _Chandles is None:
+        return {}
+    return {name: n for name, n in _Chandles.items() if n}
+
+
+def _Creport_handles():
+    """(INTERNAL) Log the libvlc objects not released, at exit."""
+    for name, n in sorted(live_handles().items()):
+        logger.warning("%d %s not released", n, name)
+
+
+if _Chandles is not None:
+    atexit.register(_Creport_handles)
+
+
 def _Cobject(cls, ctype):
     """(INTERNAL) New instance from ctypes."""
     o = object.__new__(cls)
@@ -290,14 +692,79 @@ def _Cobject(cls, ctype):
 
 
 def _Constructor(cls, ptr=_internal_guard):
-    """(INTERNAL) New wrapper from ctypes."""
+    """(INTERNAL) Wrapper from ctypes, see :data:`_Cinstances`."""
     if ptr == _internal_guard:
         raise VLCException(
             "(INTERNAL) ctypes class. You should get references for this class through methods of the LibVLC API."
         )
     if ptr is None or ptr == 0:
         return None
-    return _Cobject(cls, ctypes.c_void_p(ptr))
+    o = _Cinstances.get((cls, ptr))
+    if o is None:
+        o = _Cinstances.setdefault((cls, ptr), _Cobject(cls, ctypes.c_void_p(ptr)))
+    return o
+
+
+def _Cacquire(obj):
+    """(INTERNAL) Count a libvlc reference to *obj* obtained through
+    the bindings, see :data:`_Crefs`.
+    """
+    key = (type(obj), obj._as_parameter_.value)
+    _Crefs[key] = _Crefs.get(key, 0) + 1
+    if _Chandles is not None:
+        _Chandles[type(obj).__name__] += 1
+    return obj
+
+
+def _Cforget(obj):
+    """(INTERNAL) Remove the wrapper *obj* from :data:`_Cinstances`."""
+    key = (type(obj), obj._as_parameter_.value)
+    if _Cinstances.get(key) is obj:
+        del _Cinstances[key]
+
+
+def _Crelease(obj):
+    """(INTERNAL) Count the release of a libvlc reference to *obj*, and
+    on the release of the last one obtained through the bindings,
+    forget the wrapper and its memoized values (which may refer back
+    to it, e.g. through the callbacks of its event manager).
+
+    libvlc may still hold other references, e.g. to the media of a
+    player, so the callbacks of its event manager stay attached, kept
+    alive by :data:`_Cmanagers` until detached.
+    """
+    key = (type(obj), obj._as_parameter_.value)
+    n = _Crefs.pop(key, 0)
+    if n and _Chandles is not None:
+        _Chandles[type(obj).__name__] -= 1
+    if n > 1:
+        _Crefs[key] = n - 1
+        return
+    for hub in list(_Chubs):
+        hub.remove(obj)
+    for helper in list(_Cfollowers.pop(obj, ())):
+        helper.close()  # while its event manager is still there
+    _Cforget(obj)
+    for cache in memoize_parameterless._caches:
+        value = cache.pop(obj, None)
+        if isinstance(value, _Ctype):
+            # e.g. its event manager, freed with it: another object
+            # may get the same pointer, but not this wrapper
+            _Cforget(value)
+            for hub in list(_Chubs):  # maybe added instead of obj
+                hub.remove(value)
+    f = _Cfinalizers.pop(obj, None)
+    if f is not None:
+        f.detach()
+
+
+def _Cfinalize(cls, ptr):
+    """(INTERNAL) Release the *ptr* libvlc object, whose *cls* wrapper
+    has been garbage collected, as many times as obtained.
+    """
+    o = _Cobject(cls, ctypes.c_void_p(ptr))
+    for _ in range(max(_Crefs.get((cls, ptr), 0), 1)):
+        cls.release(o)
 
 
 class _Cstruct(ctypes.Structure):
@@ -316,6 +783,8 @@ class _Cstruct(ctypes.Structure):
 class _Ctype(object):
     """(INTERNAL) Base class for ctypes."""
 
+    __slots__ = ("_as_parameter_", "_instance", "__weakref__")
+
     @staticmethod
     def from_param(this):  # not self
         """(INTERNAL) ctypes parameter conversion method."""
@@ -323,6 +792,32 @@ class _Ctype(object):
             return None
         return this._as_parameter_
 
+    def auto_release(self):
+        """Release the libvlc object when this wrapper is garbage
+        collected (or at exit), unless :meth:`release` is called before.
+
+        Note that all the references to the wrapper must then be dropped:
+        the player of :meth:`Instance.media_player_new` e.g. refers to its
+        :class:`Instance`, which is thus released after it.
+
+        :return: the wrapper itself, e.g. ``p = i.media_player_new().auto_release()``.
+        """
+        if self not in _Cfinalizers:
+            _Cfinalizers[self] = weakref.finalize(
+                self, _Cfinalize, type(self), self._as_parameter_.value
+            )
+        return self
+
+
+def _Center(self):
+    """Return the libvlc object, released at the end of a ``with`` block."""
+    return self
+
+
+def _Cexit(self, *exc_info):
+    """Release the libvlc object at the end of a ``with`` block."""
+    self.release()
+
 
 class ListPOINTER(object):
     """Just like a POINTER but accept a list of etype elements as an argument."""
@@ -355,10 +850,20 @@ def string_result(result, func, arguments):
 def class_result(classname):
     """Errcheck function. Returns a function that creates the specified class."""
 
+    if not hasattr(classname, "release"):
+
+        def wrap_errcheck(result, func, arguments):
+            if result is None:
+                return None
+            return classname(result)
+
+        return wrap_errcheck
+
     def wrap_errcheck(result, func, arguments):
         if result is None:
             return None
-        return classname(result)
+        # a reference for the caller, see _Crelease
+        return _Cacquire(classname(result))
 
     return wrap_errcheck
 
@@ -378,6 +883,30 @@ class MediaThumbnailRequest:
             return _Constructor(cls, args[0])
 
 
+class MediaPlayerStatus(
+    collections.namedtuple(
+        "MediaPlayerStatus",
+        "time position state rate volume length fps is_playing stats",
+    )
+):
+    """Playback status of a :class:`MediaPlayer`, see :meth:`MediaPlayer.status`.
+
+    *stats* is a :class:`MediaStats` if requested and available, None otherwise.
+    """
+
+    __slots__ = ()
+
+
+class EventSubscription(
+    collections.namedtuple("EventSubscription", "eventtype callback args kwds")
+):
+    """Subscription to the events of an :class:`EventManager`, see
+    :meth:`EventManager.event_subscribe`.
+    """
+
+    __slots__ = ()
+
+
 # FILE* ctypes wrapper, copied from
 # https://svn.python.org/projects/ctypes/trunk/ctypeslib/ctypeslib/contrib/pythonhdr.py
 class FILE(ctypes.Structure):
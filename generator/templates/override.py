@@ -295,6 +295,38 @@ class MediaPlayer:
         self.set_media(m)
         return m
 
+    def status(self, stats=False):
+        """Get the playback status at once, e.g. to poll it periodically.
+
+        This calls the libvlc functions directly rather than the
+        corresponding methods (:meth:`get_time`, :meth:`get_position`,
+        :meth:`get_state`, :meth:`get_rate`, :meth:`audio_get_volume`,
+        :meth:`get_length`, :meth:`get_fps` and :meth:`is_playing`).
+
+        :param stats: also get the :class:`MediaStats` of the current media.
+
+        :return: a :class:`MediaPlayerStatus`.
+        """
+        s = None
+        if stats:
+            m = libvlc_media_player_get_media(self)
+            if m is not None:
+                s = MediaStats()
+                if not libvlc_media_get_stats(m, ctypes.byref(s)):
+                    s = None
+                m.release()
+        return MediaPlayerStatus(
+            libvlc_media_player_get_time(self),
+            libvlc_media_player_get_position(self),
+            libvlc_media_player_get_state(self),
+            libvlc_media_player_get_rate(self),
+            libvlc_audio_get_volume(self),
+            libvlc_media_player_get_length(self),
+            libvlc_media_player_get_fps(self),
+            bool(libvlc_media_player_is_playing(self)),
+            s,
+        )
+
     def video_get_spu_description(self):
         """Get the description of available video subtitles."""
         return track_description_list(libvlc_video_get_spu_description(self))
@@ -482,13 +514,31 @@ class EventManager:
     remain alive (i.e. are not garbage collected) until
     **after** the notification has been unregistered.
 
+    Any number of callbacks can be subscribed to each event type with
+    :meth:`event_subscribe`, and are called in the order of their
+    subscription. They share a single native callback, attached once
+    per event type, which can also queue the events for another thread,
+    see :meth:`event_queue`, coalesce them, see :meth:`event_coalesce`,
+    decode them, see :meth:`event_records`, and measure their latency,
+    see :meth:`event_latency`.
+
     .. note::
-        Only a single notification can be registered
-        for each event type in an :class:`EventManager` instance.
+        :meth:`event_attach` replaces the callback it attached before
+        for the same event type, while :meth:`event_subscribe` adds one.
     """
 
-    _callback_handler = None
-    _callbacks = {}
+    __slots__ = (
+        "_callback_handler",
+        "_callbacks",
+        "_attached",
+        "_dispatch",
+        "_queue",
+        "_policies",
+        "_records",
+        "_latency",
+        "_direct",
+        "_lock",
+    )
 
     def __new__(cls, ptr=_internal_guard):
         if ptr == _internal_guard:
@@ -500,6 +550,9 @@ class EventManager:
     def event_attach(self, eventtype, callback, *args, **kwds):
         """Register an event notification.
 
+        A callback previously registered for *eventtype* with this method
+        is replaced, the ones of :meth:`event_subscribe` are kept.
+
         :param eventtype: the desired event type to be notified about.
         :param callback: the function to call when the event occurs.
         :param args: optional positional arguments for the callback.
@@ -514,8 +567,159 @@ class EventManager:
 
         .. warning::
             LibVLC is not reentrant, i.e. you cannot call libvlc functions from an event handler.
-            They must be called from the main application thread.
+            They must be called from the main application thread, unless the events
+            are queued, see :meth:`event_queue`.
+        """
+        s = self._subscription(eventtype, callback, args, kwds)
+        r = self._subscribe(s, getattr(self, "_attached", {}).get(eventtype.value))
+        if not r:
+            self._attached[eventtype.value] = s
+        return r
+
+    def event_detach(self, eventtype):
+        """Unregister an event notification.
+
+        :param eventtype: the event type notification to be removed.
+        """
+        if not isinstance(eventtype, EventType):
+            raise VLCException("%s required: %r" % ("EventType", eventtype))
+
+        s = getattr(self, "_attached", {}).pop(eventtype.value, None)
+        if s is not None:
+            self.event_unsubscribe(s)
+
+    def event_subscribe(self, eventtype, callback, *args, **kwds):
+        """Subscribe to an event type, in addition to the other callbacks.
+
+        :param eventtype: the desired event type to be notified about.
+        :param callback: the function to call when the event occurs, with
+            the :class:`Event` instance, *args* and *kwds*, see :meth:`event_attach`.
+        :param args: optional positional arguments for the callback.
+        :param kwds: optional keyword arguments for the callback.
+
+        :return: the :class:`EventSubscription`, to pass to :meth:`event_unsubscribe`.
+        """
+        s = self._subscription(eventtype, callback, args, kwds)
+        r = self._subscribe(s)
+        if r:
+            raise VLCException("libvlc_event_attach failed: %d" % r)
+        return s
+
+    def event_queue(self, size=1024, thread=False):
+        """Queue the events, instead of calling the callbacks from the
+        libvlc thread sending them: the callbacks are then called from a
+        dispatcher thread, or the application thread with
+        :meth:`EventQueue.poll` or :meth:`EventQueue.drain`, and can call
+        libvlc.
+
+        :param size: the maximum number of queued events, the next ones
+            being dropped, or 0 to call the callbacks from the libvlc
+            threads again.
+        :param thread: whether to start a dispatcher thread.
+
+        :return: the :class:`EventQueue`, or None if *size* is 0.
+        """
+        if getattr(self, "_callback_handler", None) is None:
+            self._init()
+        q = EventQueue(self._dispatch, size) if size else None
+        old, self._queue = self._queue, q
+        if old is not None:
+            old.close()  # its thread dispatches the events left
+        if q is not None and thread:
+            q.start()
+        self._update()
+        return q
+
+    def event_coalesce(self, eventtype, interval=0, rate=0, burst=1, latest=False):
+        """Coalesce the events of a type, e.g. the frequent
+        ``MediaPlayerTimeChanged`` or ``MediaPlayerPositionChanged``, in
+        the native callback, before any Python callback is called.
+
+        :param eventtype: the event type.
+        :param interval: the minimum interval between two events, in seconds.
+        :param rate: the maximum number of events per second, on average
+            over bursts of at most *burst* events.
+        :param burst: see *rate*.
+        :param latest: whether the latest value is always dispatched:
+            the last event coalesced by *interval* or *rate* is then
+            dispatched at the end of the interval (from a timer thread
+            shared by all the managers, unless the events are queued),
+            and a queued event (see :meth:`event_queue`) not dispatched
+            yet is replaced by the next one of its type. Without a queue, *interval* and *rate*,
+            all the events are dispatched anyway.
+
+        :return: the :class:`EventCoalescing` policy, counting the events,
+            or None if the events of this type are no longer coalesced.
+        """
+        if not isinstance(eventtype, EventType):
+            raise VLCException("%s required: %r" % ("EventType", eventtype))
+        if getattr(self, "_callback_handler", None) is None:
+            self._init()
+        p = None
+        old = self._policies.get(eventtype.value)
+        if interval or rate or latest:
+            p = self._policies[eventtype.value] = EventCoalescing(
+                interval, rate, burst, latest
+            )
+        else:
+            self._policies.pop(eventtype.value, None)
+        if old is not None:
+            old.cancel()
+        self._update()
+        return p
+
+    def event_records(self, enabled=True):
+        """Call the callbacks with :class:`EventRecord` named tuples,
+        decoding the fields of the event types once, rather than with
+        :class:`Event` structures, whose fields are read through ctypes
+        on each access.
+
+        :param enabled: False to call them with :class:`Event` structures again.
+        """
+        if getattr(self, "_callback_handler", None) is None:
+            self._init()
+        self._records = bool(enabled)
+        self._update()
+
+    def event_latency(self, latency=None):
+        """Measure the time spent by the libvlc threads in the native
+        callback, per event type, including the Python callbacks unless
+        the events are queued.
+
+        :param latency: the :class:`CallbackLatency` counting it, or None
+            to stop measuring it.
         """
+        if getattr(self, "_callback_handler", None) is None:
+            self._init()
+        self._latency = latency
+        self._update()
+
+    def event_unsubscribe(self, subscription):
+        """Unsubscribe a callback, after which it is no longer called.
+
+        :param subscription: the :class:`EventSubscription` returned by :meth:`event_subscribe`.
+
+        :return: whether the subscription was still active.
+        """
+        if getattr(self, "_callback_handler", None) is None:
+            return False
+        k = subscription.eventtype.value
+        with self._lock:
+            subs = self._callbacks.get(k, ())
+            if not any(s is subscription for s in subs):
+                return False
+            subs = tuple(s for s in subs if s is not subscription)
+            if subs:
+                self._callbacks[k] = subs
+            else:  # the last one
+                del self._callbacks[k]
+        if not subs:  # see _subscribe()
+            self._native_detach(k)
+        return True
+
+    @staticmethod
+    def _subscription(eventtype, callback, args, kwds):
+        """(INTERNAL) Check the arguments and return a :class:`EventSubscription`."""
         if not isinstance(eventtype, EventType):
             raise VLCException("%s required: %r" % ("EventType", eventtype))
         if not hasattr(callback, "__call__"):  # callable()
@@ -523,50 +727,161 @@ class EventManager:
         # check that the callback expects arguments
         if len_args(callback) < 1:  # list(...)
             raise VLCException("%s required: %r" % ("argument", callback))
+        return EventSubscription(eventtype, callback, args, kwds)
 
-        if self._callback_handler is None:
-            _called_from_ctypes = ctypes.CFUNCTYPE(
-                None, ctypes.POINTER(Event), ctypes.c_void_p
-            )
-
-            @_called_from_ctypes
-            def _callback_handler(event, k):
-                """(INTERNAL) handle callback call from ctypes.
-
-                .. note::
-                    We cannot simply make this an :class:`EventManager`
-                    method since ctypes does not prepend self as the
-                    first parameter, hence this closure.
-                """
-                try:  # retrieve Python callback and arguments
-                    call, args, kwds = self._callbacks[k]
-                except KeyError:  # detached?
-                    pass
-                else:
-                    # deref event.contents to simplify callback code
-                    call(event.contents, *args, **kwds)
+    def _subscribe(self, subscription, replaced=None):
+        """(INTERNAL) Add or replace a subscription, attaching the
+        native callback for the first one of its event type.
 
-            self._callback_handler = _callback_handler
-            self._callbacks = {}
+        The native callback is attached and detached without the lock
+        of the manager: libvlc calls the callbacks with its own lock
+        held, and they may (un)subscribe too.  libvlc counts each
+        attachment of the same callback, so these calls may overlap.
 
-        k = eventtype.value
+        :return: 0 on success, the libvlc error otherwise.
+        """
+        if getattr(self, "_callback_handler", None) is None:
+            self._init()
+
+        k = subscription.eventtype.value
+        with self._lock:
+            subs = self._callbacks.get(k, ())
+            first = not subs
+            if any(s is replaced for s in subs):
+                subs = tuple(subscription if s is replaced else s for s in subs)
+            else:
+                subs += (subscription,)
+            self._callbacks[k] = subs
+        if first:
+            r = self._native_attach(k)
+            if r:  # undo it
+                with self._lock:
+                    subs = self._callbacks.get(k, ())
+                    subs = tuple(s for s in subs if s is not subscription)
+                    if subs:
+                        self._callbacks[k] = subs
+                    else:
+                        self._callbacks.pop(k, None)
+                return r
+        return 0
+
+    @staticmethod
+    def _call(subscriptions, event):
+        """(INTERNAL) Call the *subscriptions* of the *event*, in order."""
+        for _, call, args, kwds in subscriptions:
+            try:
+                if args or kwds:
+                    call(event, *args, **kwds)
+                else:  # much faster than with empty ones
+                    call(event)
+            except Exception:  # not preventing the others
+                logger.exception("Event callback %r", call)
+
+    def _native_attach(self, k):
+        """(INTERNAL) Attach the native callback to the event type value *k*.
+
+        :return: 0 on success, the libvlc error otherwise.
+        """
         r = libvlc_event_attach(self, k, self._callback_handler, k)
         if not r:
-            self._callbacks[k] = (callback, args, kwds)
+            _Cmanagers.add(self)
         return r
 
-    def event_detach(self, eventtype):
-        """Unregister an event notification.
-
-        :param eventtype: the event type notification to be removed.
+    def _native_detach(self, k):
+        """(INTERNAL) Detach the native callback from the event type value *k*."""
+        libvlc_event_detach(self, k, self._callback_handler, k)
+        with self._lock:  # unless subscribed again meanwhile
+            if not self._callbacks:
+                _Cmanagers.discard(self)
+
+    def _init(self):
+        """(INTERNAL) Create the native callback, shared by all the subscriptions."""
+        _called_from_ctypes = ctypes.CFUNCTYPE(
+            None, ctypes.POINTER(Event), ctypes.c_void_p
+        )
+        perf_counter_ns = time.perf_counter_ns
+        call = self._call
+
+        def dispatch(event, k):
+            """(INTERNAL) Call the subscriptions of the *event*, of type *k*."""
+            if self._records:
+                event = (_event_decoders.get(k) or _event_decoder(k))(event)
+            # the subscriptions are replaced, not modified, so
+            # that they can be called while others (un)subscribe
+            call(callbacks.get(k, ()), event)
+
+        def deliver(event, k):
+            """(INTERNAL) Coalesce, queue or dispatch the *event*."""
+            policy = policies.get(k)
+            if policy is not None and not policy.accept(time.monotonic()):
+                if policy.latest:  # sent at the end of the interval
+                    policy.defer(event.contents, k, send)
+                return  # coalesced
+            send(event.contents, k, policy)
+
+        def send(event, k, policy):
+            """(INTERNAL) Queue or dispatch the *event*."""
+            queue = self._queue
+            if queue is None:
+                dispatch(event, k)
+            elif policy is not None and policy.latest:
+                if queue.put(event, k):  # replaced the queued one
+                    policy.coalesced += 1
+                    policy.delivered -= 1
+            else:
+                queue.put(event)
+
+        @_called_from_ctypes
+        def _callback_handler(event, k):
+            """(INTERNAL) handle callback call from ctypes.
+
+            .. note::
+                We cannot simply make this an :class:`EventManager`
+                method since ctypes does not prepend self as the
+                first parameter, hence this closure.
+            """
+            if not self._direct:  # see _update()
+                latency = self._latency
+                if latency is None:
+                    deliver(event, k)
+                else:
+                    t = perf_counter_ns()
+                    deliver(event, k)
+                    latency._event(k, perf_counter_ns() - t)
+                return
+            # inlined dispatch() and _call(), deref event.contents to
+            # simplify callback code
+            event = event.contents
+            for _, call, args, kwds in callbacks.get(k, ()):
+                try:
+                    if args or kwds:
+                        call(event, *args, **kwds)
+                    else:
+                        call(event)
+                except Exception:
+                    logger.exception("Event callback %r", call)
+
+        self._callback_handler = _callback_handler
+        self._dispatch = dispatch
+        self._lock = threading.Lock()  # of the subscriptions
+        self._callbacks = callbacks = {}
+        self._attached = {}
+        self._queue = None
+        self._policies = policies = {}
+        self._records = False
+        self._latency = None
+        self._direct = True
+
+    def _update(self):
+        """(INTERNAL) Update the fast path of the native callback, when
+        the events are neither coalesced, queued, decoded nor measured.
         """
-        if not isinstance(eventtype, EventType):
-            raise VLCException("%s required: %r" % ("EventType", eventtype))
-
-        k = eventtype.value
-        if k in self._callbacks:
-            del self._callbacks[k]  # remove, regardless of libvlc return value
-            libvlc_event_detach(self, k, self._callback_handler, k)
+        self._direct = not (
+            self._policies
+            or self._queue is not None
+            or self._records
+            or self._latency is not None
+        )
 
 
 class AudioEqualizer:
@@ -0,0 +1,1612 @@
+/*****************************************************************************
+ * fakevlc.c: a fake libvlc for the python-vlc tests and benchmarks
+ *****************************************************************************
+ * Copyright (C) 2024 the VideoLAN team
+ *
+ * This program is free software; you can redistribute it and/or modify
+ * it under the terms of the GNU Lesser General Public License as
+ * published by the Free Software Foundation; either version 2.1 of the
+ * License, or (at your option) any later version.
+ *
+ * This program is distributed in the hope that it will be useful, but
+ * WITHOUT ANY WARRANTY; without even the implied warranty of
+ * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+ * Lesser General Public License for more details.
+ *****************************************************************************/
+
+/*
+ * This library implements the part of the libvlc 3.0 API that the
+ * bindings wrap in classes (instance, media, media player, media list,
+ * media list player, equalizer and event managers), without decoding
+ * anything. Playback is simulated by a thread per media player which
+ * emits the usual events, and drives the video, audio and media read
+ * callbacks with synthetic frames, PCM samples and reads.
+ *
+ * All other libvlc symbols are exported by stubs.c (see genstubs.py)
+ * and return 0/NULL.
+ *
+ * It is configured through environment variables, read by libvlc_new():
+ *
+ *   FAKEVLC_CALL_LATENCY_NS  busy wait in every getter/setter (0)
+ *   FAKEVLC_DURATION_MS      media duration (10000)
+ *   FAKEVLC_FPS              frame rate, also the event rate (25)
+ *   FAKEVLC_WIDTH/HEIGHT     video size (320x240)
+ *   FAKEVLC_CHROMA           proposed chroma (RV32)
+ *   FAKEVLC_AUDIO_RATE       audio sample rate (48000), stereo S16N
+ *   FAKEVLC_READ_SIZE        size of the media read callback requests (65536)
+ *   FAKEVLC_REALTIME         1 to pace playback in real time, 0 to run
+ *                            as fast as possible (1)
+ *   FAKEVLC_FILL             1 to write every byte of the video frames (0)
+ *
+ * The fakevlc_* functions let tests and benchmarks drive the
+ * callbacks synchronously from the calling thread.
+ */
+
+#include <math.h>
+#include <pthread.h>
+#include <stdarg.h>
+#include <stdint.h>
+#include <stdio.h>
+#include <stdlib.h>
+#include <string.h>
+#include <time.h>
+#include <unistd.h>
+
+#define EXPORT __attribute__((visibility("default")))
+
+/* Event types, from libvlc_events.h */
+enum {
+    MediaMetaChanged = 0,
+    MediaSubItemAdded,
+    MediaDurationChanged,
+    MediaParsedChanged,
+    MediaFreed,
+    MediaStateChanged,
+    MediaSubItemTreeAdded,
+    MediaPlayerMediaChanged = 0x100,
+    MediaPlayerNothingSpecial,
+    MediaPlayerOpening,
+    MediaPlayerBuffering,
+    MediaPlayerPlaying,
+    MediaPlayerPaused,
+    MediaPlayerStopped,
+    MediaPlayerForward,
+    MediaPlayerBackward,
+    MediaPlayerEndReached,
+    MediaPlayerEncounteredError,
+    MediaPlayerTimeChanged,
+    MediaPlayerPositionChanged,
+    MediaPlayerSeekableChanged,
+    MediaPlayerPausableChanged,
+    MediaPlayerTitleChanged,
+    MediaPlayerSnapshotTaken,
+    MediaPlayerLengthChanged,
+    MediaPlayerVout,
+    MediaPlayerScrambledChanged,
+    MediaPlayerESAdded,
+    MediaPlayerESDeleted,
+    MediaPlayerESSelected,
+    MediaPlayerCorked,
+    MediaPlayerUncorked,
+    MediaPlayerMuted,
+    MediaPlayerUnmuted,
+    MediaPlayerAudioVolume,
+    MediaPlayerAudioDevice,
+    MediaPlayerChapterChanged,
+    MediaListItemAdded = 0x200,
+    MediaListWillAddItem,
+    MediaListItemDeleted,
+    MediaListWillDeleteItem,
+    MediaListEndReached,
+    MediaListPlayerPlayed = 0x400,
+    MediaListPlayerNextItemSet,
+    MediaListPlayerStopped,
+};
+
+/* libvlc_state_t */
+enum {
+    NothingSpecial = 0,
+    Opening,
+    Buffering,
+    Playing,
+    Paused,
+    Stopped,
+    Ended,
+    Error
+};
+
+typedef struct libvlc_event_t {
+    int type;
+    void *p_obj;
+    union {
+        int64_t i64;
+        float f;
+        int i;
+        void *p;
+        struct {
+            void *item;
+            int index;
+        } list;
+        struct {
+            const char *a;
+            const char *b;
+        } strings;
+    } u;
+} libvlc_event_t;
+
+typedef void (*libvlc_callback_t)(const libvlc_event_t *, void *);
+
+typedef struct listener {
+    int type;
+    libvlc_callback_t cb;
+    void *data;
+    struct listener *next;
+} listener;
+
+typedef struct libvlc_event_manager_t {
+    void *owner;
+    pthread_mutex_t lock;
+    listener *listeners;
+} libvlc_event_manager_t;
+
+typedef struct libvlc_instance_t {
+    int refs;
+    void (*exit_cb)(void *);
+    void *exit_data;
+} libvlc_instance_t;
+
+typedef int (*media_open_cb)(void *, void **, uint64_t *);
+typedef ssize_t (*media_read_cb)(void *, unsigned char *, size_t);
+typedef int (*media_seek_cb)(void *, uint64_t);
+typedef void (*media_close_cb)(void *);
+
+typedef struct libvlc_media_stats_t {
+    int i_read_bytes;
+    float f_input_bitrate;
+    int i_demux_read_bytes;
+    float f_demux_bitrate;
+    int i_demux_corrupted;
+    int i_demux_discontinuity;
+    int i_decoded_video;
+    int i_decoded_audio;
+    int i_displayed_pictures;
+    int i_lost_pictures;
+    int i_played_abuffers;
+    int i_lost_abuffers;
+    int i_sent_packets;
+    int i_sent_bytes;
+    float f_send_bitrate;
+} libvlc_media_stats_t;
+
+typedef struct libvlc_media_t {
+    int refs;
+    char *mrl;
+    void *user_data;
+    int parsed_status;
+    int state;
+    libvlc_event_manager_t em;
+    media_open_cb open;
+    media_read_cb read;
+    media_seek_cb seek;
+    media_close_cb close;
+    void *opaque;
+    libvlc_media_stats_t stats;
+} libvlc_media_t;
+
+typedef void *(*video_lock_cb)(void *, void **);
+typedef void (*video_unlock_cb)(void *, void *, void *const *);
+typedef void (*video_display_cb)(void *, void *);
+typedef unsigned (*video_format_cb)(void **, char *, unsigned *, unsigned *,
+                                    unsigned *, unsigned *);
+typedef void (*video_cleanup_cb)(void *);
+typedef void (*audio_play_cb)(void *, const void *, unsigned, int64_t);
+typedef void (*audio_pause_cb)(void *, int64_t);
+typedef void (*audio_drain_cb)(void *);
+
+typedef struct libvlc_media_player_t {
+    int refs;
+    pthread_mutex_t lock;
+    pthread_t thread;
+    int running; /* playback thread started */
+    int stopping;
+    int paused;
+    int state;
+    int64_t time;
+    float position;
+    float rate;
+    int volume;
+    int mute;
+    libvlc_media_t *media;
+    libvlc_event_manager_t em;
+    /* video */
+    video_lock_cb lock_cb;
+    video_unlock_cb unlock_cb;
+    video_display_cb display_cb;
+    void *video_opaque;
+    video_format_cb format_cb;
+    video_cleanup_cb cleanup_cb;
+    char chroma[5];
+    unsigned width, height, pitches[3], lines[3];
+    int vout_ready;
+    void *vout_opaque;
+    int64_t frames;
+    /* audio */
+    audio_play_cb play_cb;
+    audio_pause_cb pause_cb;
+    audio_drain_cb drain_cb;
+    void *audio_opaque;
+    unsigned audio_rate, audio_channels;
+} libvlc_media_player_t;
+
+typedef struct libvlc_media_list_t {
+    int refs;
+    pthread_mutex_t lock;
+    libvlc_media_t **items;
+    int count, size;
+    libvlc_event_manager_t em;
+} libvlc_media_list_t;
+
+typedef struct libvlc_media_list_player_t {
+    int refs;
+    libvlc_media_player_t *mp;
+    libvlc_media_list_t *ml;
+    int index;
+    libvlc_event_manager_t em;
+} libvlc_media_list_player_t;
+
+typedef struct libvlc_equalizer_t {
+    float preamp;
+    float amps[10];
+} libvlc_equalizer_t;
+
+/* Configuration */
+static long call_latency_ns = 0;
+static int64_t duration_ms = 10000;
+static float fps = 25.;
+static unsigned video_width = 320, video_height = 240;
+static char video_chroma[5] = "RV32";
+static unsigned audio_rate = 48000;
+static size_t read_size = 65536;
+static int realtime = 1;
+static int fill_frames = 0;
+
+/* Live object counters */
+enum { K_INSTANCE, K_MEDIA, K_PLAYER, K_LIST, K_LIST_PLAYER, K_EQUALIZER, K_COUNT };
+static const char *const kind_names[K_COUNT] = {
+    "instance", "media", "media_player", "media_list", "media_list_player",
+    "equalizer"};
+static int live[K_COUNT];
+static pthread_mutex_t live_lock = PTHREAD_MUTEX_INITIALIZER;
+
+static void count(int kind, int delta)
+{
+    pthread_mutex_lock(&live_lock);
+    live[kind] += delta;
+    pthread_mutex_unlock(&live_lock);
+}
+
+static long env_long(const char *name, long dflt)
+{
+    const char *s = getenv(name);
+    return (s && *s) ? strtol(s, NULL, 10) : dflt;
+}
+
+static int64_t now_us(void)
+{
+    struct timespec ts;
+    clock_gettime(CLOCK_MONOTONIC, &ts);
+    return (int64_t)ts.tv_sec * 1000000 + ts.tv_nsec / 1000;
+}
+
+/* Simulated cost of a libvlc call */
+static void latency(void)
+{
+    if (call_latency_ns > 0) {
+        struct timespec ts, t;
+        clock_gettime(CLOCK_MONOTONIC, &ts);
+        do
+            clock_gettime(CLOCK_MONOTONIC, &t);
+        while ((t.tv_sec - ts.tv_sec) * 1000000000L + (t.tv_nsec - ts.tv_nsec) <
+               call_latency_ns);
+    }
+}
+
+static char *xstrdup(const char *s)
+{
+    return s ? strdup(s) : NULL;
+}
+
+/*
+ * Events
+ */
+static void em_init(libvlc_event_manager_t *em, void *owner)
+{
+    em->owner = owner;
+    em->listeners = NULL;
+    pthread_mutex_init(&em->lock, NULL);
+}
+
+static void em_clean(libvlc_event_manager_t *em)
+{
+    listener *l = em->listeners;
+    while (l) {
+        listener *n = l->next;
+        free(l);
+        l = n;
+    }
+    em->listeners = NULL;
+    pthread_mutex_destroy(&em->lock);
+}
+
+/* Listeners are called without holding the lock, so that they can
+ * attach or detach others. Like libvlc, a listener detached while
+ * events are being sent may still get the current event. */
+static int em_send(libvlc_event_manager_t *em, libvlc_event_t *ev)
+{
+    listener *found[64];
+    int n = 0;
+    ev->p_obj = em->owner;
+    pthread_mutex_lock(&em->lock);
+    for (listener *l = em->listeners; l && n < 64; l = l->next)
+        if (l->type == ev->type)
+            found[n++] = l;
+    listener copy[64];
+    for (int i = 0; i < n; i++)
+        copy[i] = *found[i];
+    pthread_mutex_unlock(&em->lock);
+    for (int i = 0; i < n; i++)
+        copy[i].cb(ev, copy[i].data);
+    return n;
+}
+
+static void send_simple(libvlc_event_manager_t *em, int type)
+{
+    libvlc_event_t ev;
+    memset(&ev, 0, sizeof(ev));
+    ev.type = type;
+    em_send(em, &ev);
+}
+
+EXPORT int libvlc_event_attach(libvlc_event_manager_t *em, int type,
+                               libvlc_callback_t cb, void *data)
+{
+    listener *l = malloc(sizeof(*l));
+    if (!l)
+        return -1;
+    l->type = type;
+    l->cb = cb;
+    l->data = data;
+    l->next = NULL;
+    pthread_mutex_lock(&em->lock);
+    listener **p = &em->listeners;
+    while (*p)
+        p = &(*p)->next;
+    *p = l;
+    pthread_mutex_unlock(&em->lock);
+    return 0;
+}
+
+EXPORT void libvlc_event_detach(libvlc_event_manager_t *em, int type,
+                                libvlc_callback_t cb, void *data)
+{
+    pthread_mutex_lock(&em->lock);
+    for (listener **p = &em->listeners; *p; p = &(*p)->next) {
+        listener *l = *p;
+        if (l->type == type && l->cb == cb && l->data == data) {
+            *p = l->next;
+            free(l);
+            break;
+        }
+    }
+    pthread_mutex_unlock(&em->lock);
+}
+
+EXPORT const char *libvlc_event_type_name(int type)
+{
+    (void)type;
+    return "Unknown Event";
+}
+
+/*
+ * Core
+ */
+EXPORT libvlc_instance_t *libvlc_new(int argc, const char *const *argv)
+{
+    (void)argc;
+    (void)argv;
+    call_latency_ns = env_long("FAKEVLC_CALL_LATENCY_NS", 0);
+    duration_ms = env_long("FAKEVLC_DURATION_MS", 10000);
+    fps = (float)env_long("FAKEVLC_FPS", 25);
+    video_width = (unsigned)env_long("FAKEVLC_WIDTH", 320);
+    video_height = (unsigned)env_long("FAKEVLC_HEIGHT", 240);
+    audio_rate = (unsigned)env_long("FAKEVLC_AUDIO_RATE", 48000);
+    read_size = (size_t)env_long("FAKEVLC_READ_SIZE", 65536);
+    realtime = (int)env_long("FAKEVLC_REALTIME", 1);
+    fill_frames = (int)env_long("FAKEVLC_FILL", 0);
+    const char *c = getenv("FAKEVLC_CHROMA");
+    if (c && strlen(c) == 4)
+        memcpy(video_chroma, c, 5);
+
+    libvlc_instance_t *i = calloc(1, sizeof(*i));
+    i->refs = 1;
+    count(K_INSTANCE, 1);
+    return i;
+}
+
+EXPORT void libvlc_retain(libvlc_instance_t *i)
+{
+    i->refs++;
+}
+
+EXPORT void libvlc_release(libvlc_instance_t *i)
+{
+    if (--i->refs == 0) {
+        if (i->exit_cb)
+            i->exit_cb(i->exit_data);
+        free(i);
+        count(K_INSTANCE, -1);
+    }
+}
+
+EXPORT void libvlc_set_exit_handler(libvlc_instance_t *i, void (*cb)(void *),
+                                    void *data)
+{
+    i->exit_cb = cb;
+    i->exit_data = data;
+}
+
+EXPORT const char *libvlc_get_version(void)
+{
+    return "3.0.21 Vetinari (fakevlc)";
+}
+
+EXPORT const char *libvlc_get_compiler(void)
+{
+    return "fakevlc";
+}
+
+EXPORT const char *libvlc_get_changeset(void)
+{
+    return "fakevlc";
+}
+
+EXPORT int64_t libvlc_clock(void)
+{
+    return now_us();
+}
+
+EXPORT void libvlc_free(void *p)
+{
+    free(p);
+}
+
+EXPORT const char *libvlc_errmsg(void)
+{
+    return NULL;
+}
+
+EXPORT void libvlc_clearerr(void)
+{
+}
+
+/*
+ * Media
+ */
+static libvlc_media_t *media_new(const char *mrl)
+{
+    libvlc_media_t *m = calloc(1, sizeof(*m));
+    m->refs = 1;
+    m->mrl = xstrdup(mrl);
+    em_init(&m->em, m);
+    count(K_MEDIA, 1);
+    return m;
+}
+
+EXPORT libvlc_media_t *libvlc_media_new_location(libvlc_instance_t *i,
+                                                 const char *mrl)
+{
+    (void)i;
+    return mrl ? media_new(mrl) : NULL;
+}
+
+EXPORT libvlc_media_t *libvlc_media_new_path(libvlc_instance_t *i,
+                                             const char *path)
+{
+    (void)i;
+    if (!path)
+        return NULL;
+    /* percent-encode the path as vlc_path2uri() does */
+    char *mrl = malloc(3 * strlen(path) + 8), *d = mrl + 7;
+    memcpy(mrl, "file://", 7);
+    for (const unsigned char *c = (const unsigned char *)path; *c; c++) {
+        if ((*c >= 'a' && *c <= 'z') || (*c >= 'A' && *c <= 'Z') ||
+            (*c >= '0' && *c <= '9') || strchr("/-._~", *c))
+            *d++ = (char)*c;
+        else
+            d += sprintf(d, "%%%02X", *c);
+    }
+    *d = '\0';
+    libvlc_media_t *m = media_new(mrl);
+    free(mrl);
+    return m;
+}
+
+EXPORT libvlc_media_t *libvlc_media_new_as_node(libvlc_instance_t *i,
+                                                const char *name)
+{
+    (void)i;
+    return media_new(name);
+}
+
+EXPORT libvlc_media_t *libvlc_media_new_callbacks(libvlc_instance_t *i,
+                                                  media_open_cb open,
+                                                  media_read_cb read,
+                                                  media_seek_cb seek,
+                                                  media_close_cb close,
+                                                  void *opaque)
+{
+    (void)i;
+    libvlc_media_t *m = media_new("imem://");
+    m->open = open;
+    m->read = read;
+    m->seek = seek;
+    m->close = close;
+    m->opaque = opaque;
+    return m;
+}
+
+EXPORT void libvlc_media_retain(libvlc_media_t *m)
+{
+    __sync_add_and_fetch(&m->refs, 1);
+}
+
+EXPORT void libvlc_media_release(libvlc_media_t *m)
+{
+    if (!m)
+        return;
+    if (__sync_sub_and_fetch(&m->refs, 1) == 0) {
+        send_simple(&m->em, MediaFreed);
+        em_clean(&m->em);
+        free(m->mrl);
+        free(m);
+        count(K_MEDIA, -1);
+    }
+}
+
+EXPORT void libvlc_media_add_option(libvlc_media_t *m, const char *opt)
+{
+    (void)m;
+    (void)opt;
+}
+
+EXPORT void libvlc_media_add_option_flag(libvlc_media_t *m, const char *opt,
+                                         unsigned flags)
+{
+    (void)m;
+    (void)opt;
+    (void)flags;
+}
+
+EXPORT char *libvlc_media_get_mrl(libvlc_media_t *m)
+{
+    latency();
+    return xstrdup(m->mrl);
+}
+
+EXPORT libvlc_media_t *libvlc_media_duplicate(libvlc_media_t *m)
+{
+    return media_new(m->mrl);
+}
+
+EXPORT char *libvlc_media_get_meta(libvlc_media_t *m, int meta)
+{
+    latency();
+    (void)meta;
+    return m->mrl ? xstrdup(m->mrl) : NULL;
+}
+
+EXPORT int libvlc_media_get_state(libvlc_media_t *m)
+{
+    latency();
+    return m->state;
+}
+
+EXPORT int libvlc_media_get_stats(libvlc_media_t *m, libvlc_media_stats_t *s)
+{
+    latency();
+    *s = m->stats;
+    return 1;
+}
+
+EXPORT libvlc_event_manager_t *libvlc_media_event_manager(libvlc_media_t *m)
+{
+    return &m->em;
+}
+
+EXPORT int64_t libvlc_media_get_duration(libvlc_media_t *m)
+{
+    latency();
+    (void)m;
+    return duration_ms;
+}
+
+EXPORT int libvlc_media_parse_with_options(libvlc_media_t *m, int flags,
+                                           int timeout)
+{
+    (void)flags;
+    (void)timeout;
+    libvlc_event_t ev;
+    m->parsed_status = 4; /* done */
+    memset(&ev, 0, sizeof(ev));
+    ev.type = MediaDurationChanged;
+    ev.u.i64 = duration_ms;
+    em_send(&m->em, &ev);
+    memset(&ev, 0, sizeof(ev));
+    ev.type = MediaParsedChanged;
+    ev.u.i = m->parsed_status;
+    em_send(&m->em, &ev);
+    return 0;
+}
+
+EXPORT void libvlc_media_parse(libvlc_media_t *m)
+{
+    libvlc_media_parse_with_options(m, 0, -1);
+}
+
+EXPORT void libvlc_media_parse_async(libvlc_media_t *m)
+{
+    libvlc_media_parse_with_options(m, 0, -1);
+}
+
+EXPORT void libvlc_media_parse_stop(libvlc_media_t *m)
+{
+    (void)m;
+}
+
+EXPORT int libvlc_media_get_parsed_status(libvlc_media_t *m)
+{
+    latency();
+    return m->parsed_status;
+}
+
+EXPORT int libvlc_media_is_parsed(libvlc_media_t *m)
+{
+    return m->parsed_status != 0;
+}
+
+EXPORT void libvlc_media_set_user_data(libvlc_media_t *m, void *data)
+{
+    m->user_data = data;
+}
+
+EXPORT void *libvlc_media_get_user_data(libvlc_media_t *m)
+{
+    return m->user_data;
+}
+
+EXPORT int libvlc_media_get_type(libvlc_media_t *m)
+{
+    (void)m;
+    return 1; /* file */
+}
+
+/*
+ * Media player
+ */
+EXPORT libvlc_media_player_t *libvlc_media_player_new(libvlc_instance_t *i)
+{
+    (void)i;
+    libvlc_media_player_t *mp = calloc(1, sizeof(*mp));
+    mp->refs = 1;
+    mp->rate = 1.;
+    mp->volume = 100;
+    mp->state = NothingSpecial;
+    pthread_mutex_init(&mp->lock, NULL);
+    em_init(&mp->em, mp);
+    memcpy(mp->chroma, video_chroma, 5);
+    mp->audio_rate = audio_rate;
+    mp->audio_channels = 2;
+    count(K_PLAYER, 1);
+    return mp;
+}
+
+EXPORT void libvlc_media_player_set_media(libvlc_media_player_t *mp,
+                                          libvlc_media_t *m);
+
+EXPORT libvlc_media_player_t *
+libvlc_media_player_new_from_media(libvlc_media_t *m)
+{
+    libvlc_media_player_t *mp = libvlc_media_player_new(NULL);
+    libvlc_media_player_set_media(mp, m);
+    return mp;
+}
+
+EXPORT void libvlc_media_player_stop(libvlc_media_player_t *mp);
+
+EXPORT void libvlc_media_player_retain(libvlc_media_player_t *mp)
+{
+    __sync_add_and_fetch(&mp->refs, 1);
+}
+
+EXPORT void libvlc_media_player_release(libvlc_media_player_t *mp)
+{
+    if (!mp)
+        return;
+    if (__sync_sub_and_fetch(&mp->refs, 1) == 0) {
+        libvlc_media_player_stop(mp);
+        if (mp->media)
+            libvlc_media_release(mp->media);
+        em_clean(&mp->em);
+        pthread_mutex_destroy(&mp->lock);
+        free(mp);
+        count(K_PLAYER, -1);
+    }
+}
+
+EXPORT void libvlc_media_player_set_media(libvlc_media_player_t *mp,
+                                          libvlc_media_t *m)
+{
+    pthread_mutex_lock(&mp->lock);
+    libvlc_media_t *old = mp->media;
+    if (m)
+        libvlc_media_retain(m);
+    mp->media = m;
+    pthread_mutex_unlock(&mp->lock);
+    if (old)
+        libvlc_media_release(old);
+    libvlc_event_t ev;
+    memset(&ev, 0, sizeof(ev));
+    ev.type = MediaPlayerMediaChanged;
+    ev.u.p = m;
+    em_send(&mp->em, &ev);
+}
+
+EXPORT libvlc_media_t *libvlc_media_player_get_media(libvlc_media_player_t *mp)
+{
+    pthread_mutex_lock(&mp->lock);
+    libvlc_media_t *m = mp->media;
+    if (m)
+        libvlc_media_retain(m);
+    pthread_mutex_unlock(&mp->lock);
+    return m;
+}
+
+EXPORT libvlc_event_manager_t *
+libvlc_media_player_event_manager(libvlc_media_player_t *mp)
+{
+    return &mp->em;
+}
+
+static void set_state(libvlc_media_player_t *mp, int state, int event)
+{
+    pthread_mutex_lock(&mp->lock);
+    mp->state = state;
+    if (mp->media)
+        mp->media->state = state;
+    pthread_mutex_unlock(&mp->lock);
+    if (event >= 0)
+        send_simple(&mp->em, event);
+}
+
+/* Synthetic audio: a 440Hz tone, S16N stereo, 10ms per buffer */
+static int16_t pcm[48000 / 100 * 2 * 4];
+
+static unsigned audio_frames(libvlc_media_player_t *mp)
+{
+    unsigned n = mp->audio_rate / 100;
+    unsigned max = sizeof(pcm) / sizeof(pcm[0]) / 2;
+    if (n > max)
+        n = max;
+    if (pcm[1] == 0)
+        for (unsigned i = 0; i < max; i++)
+            pcm[2 * i] = pcm[2 * i + 1] =
+                (int16_t)(8000 * sin(2 * M_PI * 440 * i / 48000.));
+    return n;
+}
+
+static int vout_start(libvlc_media_player_t *mp)
+{
+    if (mp->vout_ready)
+        return 1;
+    if (!mp->lock_cb)
+        return 0;
+    mp->vout_opaque = mp->video_opaque;
+    if (mp->format_cb) {
+        char chroma[5];
+        unsigned w = video_width, h = video_height;
+        memcpy(chroma, video_chroma, 5);
+        memset(mp->pitches, 0, sizeof(mp->pitches));
+        memset(mp->lines, 0, sizeof(mp->lines));
+        if (mp->format_cb(&mp->vout_opaque, chroma, &w, &h, mp->pitches,
+                          mp->lines) == 0)
+            return 0;
+        memcpy(mp->chroma, chroma, 4);
+        mp->chroma[4] = 0;
+        mp->width = w;
+        mp->height = h;
+    } else if (!mp->width) {
+        mp->width = video_width;
+        mp->height = video_height;
+        mp->pitches[0] = video_width * 4;
+        mp->lines[0] = video_height;
+    }
+    mp->vout_ready = 1;
+    send_simple(&mp->em, MediaPlayerVout);
+    return 1;
+}
+
+static void vout_stop(libvlc_media_player_t *mp)
+{
+    if (mp->vout_ready && mp->format_cb && mp->cleanup_cb)
+        mp->cleanup_cb(mp->vout_opaque);
+    mp->vout_ready = 0;
+}
+
+static void vout_frame(libvlc_media_player_t *mp)
+{
+    void *planes[3] = {NULL, NULL, NULL};
+    void *pic = mp->lock_cb(mp->vout_opaque, planes);
+    for (int i = 0; i < 3; i++) {
+        size_t size = (size_t)mp->pitches[i] * mp->lines[i];
+        if (!planes[i] || !size)
+            continue;
+        if (fill_frames)
+            memset(planes[i], (int)(mp->frames & 0xff), size);
+        else {
+            ((unsigned char *)planes[i])[0] = (unsigned char)mp->frames;
+            ((unsigned char *)planes[i])[size - 1] = (unsigned char)mp->frames;
+        }
+    }
+    if (mp->unlock_cb)
+        mp->unlock_cb(mp->vout_opaque, pic, planes);
+    if (mp->display_cb)
+        mp->display_cb(mp->vout_opaque, pic);
+    mp->frames++;
+    if (mp->media) {
+        mp->media->stats.i_decoded_video++;
+        mp->media->stats.i_displayed_pictures++;
+    }
+}
+
+static int64_t media_read_all(libvlc_media_t *m, size_t chunk, int64_t max)
+{
+    void *data = m->opaque;
+    uint64_t size = 0;
+    int64_t total = 0;
+    if (!m->read)
+        return -1;
+    if (m->open && m->open(m->opaque, &data, &size) != 0)
+        return -1;
+    unsigned char *buf = malloc(chunk);
+    while (max < 0 || total < max) {
+        ssize_t n = m->read(data, buf, chunk);
+        if (n <= 0)
+            break;
+        total += n;
+    }
+    free(buf);
+    if (m->close)
+        m->close(data);
+    m->stats.i_read_bytes += (int)total;
+    return total;
+}
+
+static void *playback(void *arg)
+{
+    libvlc_media_player_t *mp = arg;
+    libvlc_media_t *m = mp->media;
+    int64_t frame_us = (int64_t)(1000000 / fps);
+    libvlc_event_t ev;
+
+    set_state(mp, Opening, MediaPlayerOpening);
+    if (m && m->read)
+        media_read_all(m, read_size, -1);
+    memset(&ev, 0, sizeof(ev));
+    ev.type = MediaPlayerLengthChanged;
+    ev.u.i64 = duration_ms;
+    em_send(&mp->em, &ev);
+    set_state(mp, Playing, MediaPlayerPlaying);
+    vout_start(mp);
+
+    int64_t next = now_us();
+    while (!mp->stopping) {
+        if (mp->paused) {
+            usleep(1000);
+            next = now_us();
+            continue;
+        }
+        if (mp->vout_ready)
+            vout_frame(mp);
+        if (mp->play_cb) {
+            unsigned n = audio_frames(mp);
+            mp->play_cb(mp->audio_opaque, pcm, n, now_us());
+            if (m)
+                m->stats.i_played_abuffers++;
+        }
+        pthread_mutex_lock(&mp->lock);
+        mp->time += (int64_t)(frame_us / 1000); /* no frame skipped at any rate */
+        if (mp->time > duration_ms)
+            mp->time = duration_ms;
+        mp->position = duration_ms ? (float)mp->time / duration_ms : 0.f;
+        int64_t t = mp->time;
+        float pos = mp->position;
+        float rate = mp->rate;
+        pthread_mutex_unlock(&mp->lock);
+
+        memset(&ev, 0, sizeof(ev));
+        ev.type = MediaPlayerTimeChanged;
+        ev.u.i64 = t;
+        em_send(&mp->em, &ev);
+        memset(&ev, 0, sizeof(ev));
+        ev.type = MediaPlayerPositionChanged;
+        ev.u.f = pos;
+        em_send(&mp->em, &ev);
+
+        if (t >= duration_ms) {
+            if (mp->drain_cb)
+                mp->drain_cb(mp->audio_opaque);
+            vout_stop(mp);
+            set_state(mp, Ended, MediaPlayerEndReached);
+            return NULL;
+        }
+        if (realtime) {
+            next += (int64_t)(frame_us / (rate > 0 ? rate : 1));
+            int64_t d = next - now_us();
+            if (d > 0)
+                usleep((useconds_t)d);
+        }
+    }
+    vout_stop(mp);
+    return NULL;
+}
+
+EXPORT int libvlc_media_player_play(libvlc_media_player_t *mp)
+{
+    if (mp->paused && mp->running) {
+        mp->paused = 0;
+        set_state(mp, Playing, MediaPlayerPlaying);
+        return 0;
+    }
+    if (!mp->media)
+        return -1;
+    if (mp->running)
+        libvlc_media_player_stop(mp);
+    mp->stopping = 0;
+    mp->paused = 0;
+    mp->time = 0;
+    mp->position = 0;
+    if (pthread_create(&mp->thread, NULL, playback, mp) != 0)
+        return -1;
+    mp->running = 1;
+    return 0;
+}
+
+EXPORT void libvlc_media_player_set_pause(libvlc_media_player_t *mp, int pause)
+{
+    if (!mp->running || mp->state == Ended)
+        return;
+    mp->paused = pause;
+    if (pause)
+        set_state(mp, Paused, MediaPlayerPaused);
+    else
+        set_state(mp, Playing, MediaPlayerPlaying);
+}
+
+EXPORT void libvlc_media_player_pause(libvlc_media_player_t *mp)
+{
+    libvlc_media_player_set_pause(mp, !mp->paused);
+}
+
+EXPORT void libvlc_media_player_stop(libvlc_media_player_t *mp)
+{
+    if (!mp->running)
+        return;
+    mp->stopping = 1;
+    if (!pthread_equal(pthread_self(), mp->thread))
+        pthread_join(mp->thread, NULL);
+    else
+        pthread_detach(mp->thread);
+    mp->running = 0;
+    mp->paused = 0;
+    set_state(mp, Stopped, MediaPlayerStopped);
+}
+
+EXPORT int libvlc_media_player_is_playing(libvlc_media_player_t *mp)
+{
+    latency();
+    return mp->state == Playing;
+}
+
+EXPORT int libvlc_media_player_will_play(libvlc_media_player_t *mp)
+{
+    latency();
+    return mp->media != NULL;
+}
+
+EXPORT int libvlc_media_player_get_state(libvlc_media_player_t *mp)
+{
+    latency();
+    return mp->state;
+}
+
+EXPORT int64_t libvlc_media_player_get_length(libvlc_media_player_t *mp)
+{
+    latency();
+    return mp->media ? duration_ms : -1;
+}
+
+EXPORT int64_t libvlc_media_player_get_time(libvlc_media_player_t *mp)
+{
+    latency();
+    return mp->media ? mp->time : -1;
+}
+
+EXPORT void libvlc_media_player_set_time(libvlc_media_player_t *mp,
+                                         int64_t time)
+{
+    latency();
+    pthread_mutex_lock(&mp->lock);
+    mp->time = time < 0 ? 0 : time > duration_ms ? duration_ms : time;
+    mp->position = duration_ms ? (float)mp->time / duration_ms : 0.f;
+    pthread_mutex_unlock(&mp->lock);
+}
+
+EXPORT float libvlc_media_player_get_position(libvlc_media_player_t *mp)
+{
+    latency();
+    return mp->media ? mp->position : -1.f;
+}
+
+EXPORT void libvlc_media_player_set_position(libvlc_media_player_t *mp,
+                                             float pos)
+{
+    libvlc_media_player_set_time(mp, (int64_t)(pos * duration_ms));
+}
+
+EXPORT float libvlc_media_player_get_rate(libvlc_media_player_t *mp)
+{
+    latency();
+    return mp->rate;
+}
+
+EXPORT int libvlc_media_player_set_rate(libvlc_media_player_t *mp, float rate)
+{
+    latency();
+    mp->rate = rate;
+    return 0;
+}
+
+EXPORT float libvlc_media_player_get_fps(libvlc_media_player_t *mp)
+{
+    latency();
+    return mp->media ? fps : 0.f;
+}
+
+EXPORT int libvlc_media_player_is_seekable(libvlc_media_player_t *mp)
+{
+    latency();
+    return mp->media != NULL;
+}
+
+EXPORT int libvlc_media_player_can_pause(libvlc_media_player_t *mp)
+{
+    latency();
+    return mp->media != NULL;
+}
+
+EXPORT int libvlc_media_player_has_vout(libvlc_media_player_t *mp)
+{
+    latency();
+    return mp->vout_ready;
+}
+
+EXPORT int libvlc_audio_get_volume(libvlc_media_player_t *mp)
+{
+    latency();
+    return mp->volume;
+}
+
+EXPORT int libvlc_audio_set_volume(libvlc_media_player_t *mp, int volume)
+{
+    latency();
+    if (volume < 0 || volume > 200)
+        return -1;
+    mp->volume = volume;
+    libvlc_event_t ev;
+    memset(&ev, 0, sizeof(ev));
+    ev.type = MediaPlayerAudioVolume;
+    ev.u.f = volume / 100.f;
+    em_send(&mp->em, &ev);
+    return 0;
+}
+
+EXPORT int libvlc_audio_get_mute(libvlc_media_player_t *mp)
+{
+    latency();
+    return mp->mute;
+}
+
+EXPORT void libvlc_audio_set_mute(libvlc_media_player_t *mp, int mute)
+{
+    latency();
+    mp->mute = mute != 0;
+    send_simple(&mp->em, mute ? MediaPlayerMuted : MediaPlayerUnmuted);
+}
+
+EXPORT void libvlc_audio_toggle_mute(libvlc_media_player_t *mp)
+{
+    libvlc_audio_set_mute(mp, !mp->mute);
+}
+
+EXPORT int libvlc_video_get_size(libvlc_media_player_t *mp, unsigned num,
+                                 unsigned *px, unsigned *py)
+{
+    latency();
+    if (num != 0 || !mp->media)
+        return -1;
+    *px = mp->width ? mp->width : video_width;
+    *py = mp->height ? mp->height : video_height;
+    return 0;
+}
+
+EXPORT void *libvlc_video_new_viewpoint(void)
+{
+    /* yaw, pitch, roll and field of view */
+    return calloc(4, sizeof(float));
+}
+
+EXPORT void libvlc_video_set_callbacks(libvlc_media_player_t *mp,
+                                       video_lock_cb lock,
+                                       video_unlock_cb unlock,
+                                       video_display_cb display, void *opaque)
+{
+    mp->lock_cb = lock;
+    mp->unlock_cb = unlock;
+    mp->display_cb = display;
+    mp->video_opaque = opaque;
+}
+
+EXPORT void libvlc_video_set_format(libvlc_media_player_t *mp,
+                                    const char *chroma, unsigned width,
+                                    unsigned height, unsigned pitch)
+{
+    memset(mp->chroma, 0, 5);
+    strncpy(mp->chroma, chroma, 4);
+    mp->width = width;
+    mp->height = height;
+    memset(mp->pitches, 0, sizeof(mp->pitches));
+    memset(mp->lines, 0, sizeof(mp->lines));
+    mp->pitches[0] = pitch;
+    mp->lines[0] = height;
+    mp->format_cb = NULL;
+    mp->cleanup_cb = NULL;
+}
+
+EXPORT void libvlc_video_set_format_callbacks(libvlc_media_player_t *mp,
+                                              video_format_cb setup,
+                                              video_cleanup_cb cleanup)
+{
+    mp->format_cb = setup;
+    mp->cleanup_cb = cleanup;
+}
+
+EXPORT void libvlc_audio_set_callbacks(libvlc_media_player_t *mp,
+                                       audio_play_cb play,
+                                       audio_pause_cb pause, void *resume,
+                                       void *flush, audio_drain_cb drain,
+                                       void *opaque)
+{
+    (void)resume;
+    (void)flush;
+    mp->play_cb = play;
+    mp->pause_cb = pause;
+    mp->drain_cb = drain;
+    mp->audio_opaque = opaque;
+}
+
+EXPORT void libvlc_audio_set_format(libvlc_media_player_t *mp,
+                                    const char *format, unsigned rate,
+                                    unsigned channels)
+{
+    (void)format;
+    mp->audio_rate = rate;
+    mp->audio_channels = channels;
+}
+
+/*
+ * Media list
+ */
+EXPORT libvlc_media_list_t *libvlc_media_list_new(libvlc_instance_t *i)
+{
+    (void)i;
+    libvlc_media_list_t *ml = calloc(1, sizeof(*ml));
+    ml->refs = 1;
+    pthread_mutex_init(&ml->lock, NULL);
+    em_init(&ml->em, ml);
+    count(K_LIST, 1);
+    return ml;
+}
+
+EXPORT void libvlc_media_list_retain(libvlc_media_list_t *ml)
+{
+    __sync_add_and_fetch(&ml->refs, 1);
+}
+
+EXPORT void libvlc_media_list_release(libvlc_media_list_t *ml)
+{
+    if (!ml)
+        return;
+    if (__sync_sub_and_fetch(&ml->refs, 1) == 0) {
+        for (int i = 0; i < ml->count; i++)
+            libvlc_media_release(ml->items[i]);
+        free(ml->items);
+        em_clean(&ml->em);
+        pthread_mutex_destroy(&ml->lock);
+        free(ml);
+        count(K_LIST, -1);
+    }
+}
+
+EXPORT void libvlc_media_list_lock(libvlc_media_list_t *ml)
+{
+    pthread_mutex_lock(&ml->lock);
+}
+
+EXPORT void libvlc_media_list_unlock(libvlc_media_list_t *ml)
+{
+    pthread_mutex_unlock(&ml->lock);
+}
+
+EXPORT int libvlc_media_list_insert_media(libvlc_media_list_t *ml,
+                                          libvlc_media_t *m, int pos)
+{
+    if (pos < 0 || pos > ml->count)
+        return -1;
+    if (ml->count == ml->size) {
+        ml->size = ml->size ? 2 * ml->size : 8;
+        ml->items = realloc(ml->items, ml->size * sizeof(*ml->items));
+    }
+    memmove(ml->items + pos + 1, ml->items + pos,
+            (ml->count - pos) * sizeof(*ml->items));
+    libvlc_media_retain(m);
+    ml->items[pos] = m;
+    ml->count++;
+    libvlc_event_t ev;
+    memset(&ev, 0, sizeof(ev));
+    ev.type = MediaListItemAdded;
+    ev.u.list.item = m;
+    ev.u.list.index = pos;
+    em_send(&ml->em, &ev);
+    return 0;
+}
+
+EXPORT int libvlc_media_list_add_media(libvlc_media_list_t *ml,
+                                       libvlc_media_t *m)
+{
+    return libvlc_media_list_insert_media(ml, m, ml->count);
+}
+
+EXPORT int libvlc_media_list_remove_index(libvlc_media_list_t *ml, int pos)
+{
+    if (pos < 0 || pos >= ml->count)
+        return -1;
+    libvlc_media_t *m = ml->items[pos];
+    ml->count--;
+    memmove(ml->items + pos, ml->items + pos + 1,
+            (ml->count - pos) * sizeof(*ml->items));
+    libvlc_event_t ev;
+    memset(&ev, 0, sizeof(ev));
+    ev.type = MediaListItemDeleted;
+    ev.u.list.item = m;
+    ev.u.list.index = pos;
+    em_send(&ml->em, &ev);
+    libvlc_media_release(m);
+    return 0;
+}
+
+EXPORT int libvlc_media_list_count(libvlc_media_list_t *ml)
+{
+    latency();
+    return ml->count;
+}
+
+EXPORT libvlc_media_t *libvlc_media_list_item_at_index(libvlc_media_list_t *ml,
+                                                       int pos)
+{
+    latency();
+    if (pos < 0 || pos >= ml->count)
+        return NULL;
+    libvlc_media_retain(ml->items[pos]);
+    return ml->items[pos];
+}
+
+EXPORT int libvlc_media_list_index_of_item(libvlc_media_list_t *ml,
+                                           libvlc_media_t *m)
+{
+    for (int i = 0; i < ml->count; i++)
+        if (ml->items[i] == m)
+            return i;
+    return -1;
+}
+
+EXPORT int libvlc_media_list_is_readonly(libvlc_media_list_t *ml)
+{
+    (void)ml;
+    return 0;
+}
+
+EXPORT libvlc_event_manager_t *
+libvlc_media_list_event_manager(libvlc_media_list_t *ml)
+{
+    return &ml->em;
+}
+
+/*
+ * Media list player
+ */
+EXPORT libvlc_media_list_player_t *
+libvlc_media_list_player_new(libvlc_instance_t *i)
+{
+    libvlc_media_list_player_t *mlp = calloc(1, sizeof(*mlp));
+    mlp->refs = 1;
+    mlp->mp = libvlc_media_player_new(i);
+    em_init(&mlp->em, mlp);
+    count(K_LIST_PLAYER, 1);
+    return mlp;
+}
+
+EXPORT void libvlc_media_list_player_retain(libvlc_media_list_player_t *mlp)
+{
+    __sync_add_and_fetch(&mlp->refs, 1);
+}
+
+EXPORT void libvlc_media_list_player_release(libvlc_media_list_player_t *mlp)
+{
+    if (!mlp)
+        return;
+    if (__sync_sub_and_fetch(&mlp->refs, 1) == 0) {
+        libvlc_media_player_release(mlp->mp);
+        if (mlp->ml)
+            libvlc_media_list_release(mlp->ml);
+        em_clean(&mlp->em);
+        free(mlp);
+        count(K_LIST_PLAYER, -1);
+    }
+}
+
+EXPORT libvlc_event_manager_t *
+libvlc_media_list_player_event_manager(libvlc_media_list_player_t *mlp)
+{
+    return &mlp->em;
+}
+
+EXPORT void libvlc_media_list_player_set_media_player(
+    libvlc_media_list_player_t *mlp, libvlc_media_player_t *mp)
+{
+    libvlc_media_player_retain(mp);
+    libvlc_media_player_release(mlp->mp);
+    mlp->mp = mp;
+}
+
+EXPORT libvlc_media_player_t *
+libvlc_media_list_player_get_media_player(libvlc_media_list_player_t *mlp)
+{
+    libvlc_media_player_retain(mlp->mp);
+    return mlp->mp;
+}
+
+EXPORT void libvlc_media_list_player_set_media_list(
+    libvlc_media_list_player_t *mlp, libvlc_media_list_t *ml)
+{
+    libvlc_media_list_retain(ml);
+    if (mlp->ml)
+        libvlc_media_list_release(mlp->ml);
+    mlp->ml = ml;
+}
+
+EXPORT int libvlc_media_list_player_play_item_at_index(
+    libvlc_media_list_player_t *mlp, int index)
+{
+    if (!mlp->ml || index < 0 || index >= mlp->ml->count)
+        return -1;
+    mlp->index = index;
+    libvlc_media_player_set_media(mlp->mp, mlp->ml->items[index]);
+    libvlc_event_t ev;
+    memset(&ev, 0, sizeof(ev));
+    ev.type = MediaListPlayerNextItemSet;
+    ev.u.p = mlp->ml->items[index];
+    em_send(&mlp->em, &ev);
+    send_simple(&mlp->em, MediaListPlayerPlayed);
+    return libvlc_media_player_play(mlp->mp);
+}
+
+EXPORT void libvlc_media_list_player_play(libvlc_media_list_player_t *mlp)
+{
+    libvlc_media_list_player_play_item_at_index(mlp, mlp->index);
+}
+
+EXPORT void libvlc_media_list_player_pause(libvlc_media_list_player_t *mlp)
+{
+    libvlc_media_player_pause(mlp->mp);
+}
+
+EXPORT void libvlc_media_list_player_set_pause(libvlc_media_list_player_t *mlp,
+                                               int pause)
+{
+    libvlc_media_player_set_pause(mlp->mp, pause);
+}
+
+EXPORT int libvlc_media_list_player_is_playing(libvlc_media_list_player_t *mlp)
+{
+    return libvlc_media_player_is_playing(mlp->mp);
+}
+
+EXPORT int libvlc_media_list_player_get_state(libvlc_media_list_player_t *mlp)
+{
+    return libvlc_media_player_get_state(mlp->mp);
+}
+
+EXPORT void libvlc_media_list_player_stop(libvlc_media_list_player_t *mlp)
+{
+    libvlc_media_player_stop(mlp->mp);
+    send_simple(&mlp->em, MediaListPlayerStopped);
+}
+
+EXPORT int libvlc_media_list_player_next(libvlc_media_list_player_t *mlp)
+{
+    return libvlc_media_list_player_play_item_at_index(mlp, mlp->index + 1);
+}
+
+EXPORT int libvlc_media_list_player_previous(libvlc_media_list_player_t *mlp)
+{
+    return libvlc_media_list_player_play_item_at_index(mlp, mlp->index - 1);
+}
+
+/*
+ * Equalizer
+ */
+EXPORT libvlc_equalizer_t *libvlc_audio_equalizer_new(void)
+{
+    count(K_EQUALIZER, 1);
+    return calloc(1, sizeof(libvlc_equalizer_t));
+}
+
+EXPORT libvlc_equalizer_t *libvlc_audio_equalizer_new_from_preset(unsigned i)
+{
+    (void)i;
+    return libvlc_audio_equalizer_new();
+}
+
+EXPORT void libvlc_audio_equalizer_release(libvlc_equalizer_t *eq)
+{
+    if (eq) {
+        free(eq);
+        count(K_EQUALIZER, -1);
+    }
+}
+
+EXPORT int libvlc_audio_equalizer_set_preamp(libvlc_equalizer_t *eq, float v)
+{
+    eq->preamp = v;
+    return 0;
+}
+
+EXPORT float libvlc_audio_equalizer_get_preamp(libvlc_equalizer_t *eq)
+{
+    return eq->preamp;
+}
+
+EXPORT int libvlc_audio_equalizer_set_amp_at_index(libvlc_equalizer_t *eq,
+                                                   float v, unsigned band)
+{
+    if (band >= 10)
+        return -1;
+    eq->amps[band] = v;
+    return 0;
+}
+
+EXPORT float libvlc_audio_equalizer_get_amp_at_index(libvlc_equalizer_t *eq,
+                                                     unsigned band)
+{
+    return band < 10 ? eq->amps[band] : NAN;
+}
+
+EXPORT unsigned libvlc_audio_equalizer_get_band_count(void)
+{
+    return 10;
+}
+
+EXPORT int libvlc_media_player_set_equalizer(libvlc_media_player_t *mp,
+                                             libvlc_equalizer_t *eq)
+{
+    (void)mp;
+    (void)eq;
+    return 0;
+}
+
+/*
+ * Test and benchmark hooks
+ */
+
+/* Send *n* events of *type* on the calling thread. Time and position
+ * events carry increasing values. Returns the number of listener calls. */
+EXPORT int fakevlc_emit(libvlc_event_manager_t *em, int type, int n)
+{
+    int calls = 0;
+    libvlc_event_t ev;
+    for (int i = 0; i < n; i++) {
+        memset(&ev, 0, sizeof(ev));
+        ev.type = type;
+        if (type == MediaPlayerTimeChanged || type == MediaPlayerLengthChanged ||
+            type == MediaDurationChanged)
+            ev.u.i64 = i;
+        else if (type == MediaPlayerPositionChanged ||
+                 type == MediaPlayerBuffering ||
+                 type == MediaPlayerAudioVolume)
+            ev.u.f = n > 1 ? (float)i / (n - 1) : 1.f;
+        else
+            ev.u.i = i;
+        calls += em_send(em, &ev);
+    }
+    return calls;
+}
+
+/* Run the video callbacks for *n* frames on the calling thread,
+ * negotiating the format first if needed. Returns the number of
+ * frames displayed, or -1 if no video callbacks are set. */
+EXPORT int fakevlc_run_video(libvlc_media_player_t *mp, int n)
+{
+    if (!vout_start(mp))
+        return -1;
+    for (int i = 0; i < n; i++)
+        vout_frame(mp);
+    return n;
+}
+
+/* Release the video output set up by fakevlc_run_video(). */
+EXPORT void fakevlc_stop_video(libvlc_media_player_t *mp)
+{
+    vout_stop(mp);
+}
+
+/* Run the audio play callback for *n* 10ms buffers on the calling
+ * thread. Returns the number of samples played. */
+EXPORT int64_t fakevlc_run_audio(libvlc_media_player_t *mp, int n)
+{
+    int64_t total = 0;
+    if (!mp->play_cb)
+        return -1;
+    for (int i = 0; i < n; i++) {
+        unsigned count = audio_frames(mp);
+        mp->play_cb(mp->audio_opaque, pcm, count, now_us());
+        total += count;
+    }
+    return total;
+}
+
+/* Open, read (by *chunk* bytes, up to *max* bytes or EOF if *max* < 0)
+ * and close a media created with libvlc_media_new_callbacks(), on the
+ * calling thread. Returns the number of bytes read. */
+EXPORT int64_t fakevlc_run_read(libvlc_media_t *m, size_t chunk, int64_t max)
+{
+    return media_read_all(m, chunk, max);
+}
+
+/* Number of live objects of the given kind ("media", "media_player",
+ * ...), or of all kinds if *kind* is NULL. */
+EXPORT int fakevlc_live_objects(const char *kind)
+{
+    int n = 0;
+    pthread_mutex_lock(&live_lock);
+    for (int k = 0; k < K_COUNT; k++)
+        if (!kind || !strcmp(kind, kind_names[k]))
+            n += live[k];
+    pthread_mutex_unlock(&live_lock);
+    return n;
+}
+
+/* Change the simulated cost of the getters and setters. */
+EXPORT void fakevlc_set_call_latency(long ns)
+{
+    call_latency_ns = ns;
+}
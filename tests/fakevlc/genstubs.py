@@ -0,0 +1,67 @@
+#! /usr/bin/env python3
+
+"""Generate the stubs.c file of the fake libvlc.
+
+It exports, as functions returning 0 (or NULL), all the libvlc
+functions bound by a generated vlc.py module which are not
+implemented in fakevlc.c, so that the module can be used with the fake
+library::
+
+    python3 tests/fakevlc/genstubs.py generated/3.0/vlc.py > tests/fakevlc/stubs.c
+"""
+
+import ast
+import os
+import re
+import sys
+
+# C return types of the stubs, by ctypes result type
+RESTYPES = {
+    "ctypes.c_float": "float",
+    "ctypes.c_double": "double",
+}
+
+
+def bound_functions(source):
+    """Return a dict mapping the names of the libvlc functions bound by
+    the module *source* to their ctypes result type.
+    """
+    functions = {}
+    for node in ast.walk(ast.parse(source)):
+        if not isinstance(node, ast.Call) or not isinstance(node.func, ast.Name):
+            continue
+        if node.func.id == "_Cfunction" and isinstance(node.args[0], ast.Constant):
+            functions[node.args[0].value] = ast.unparse(node.args[3])
+        elif node.func.id == "_Cstubs":  # generate.py --manifest
+            for entry in ast.literal_eval(node.args[0]):
+                functions[entry[0]] = entry[3]
+    return functions
+
+
+def implemented_functions(source):
+    """Return the names of the functions exported by the C *source*."""
+    return set(re.findall(r"^EXPORT\s[^(;]*?\b(\w+)\s*\(", source, re.M))
+
+
+def main(module, fakevlc=os.path.join(os.path.dirname(__file__), "fakevlc.c")):
+    with open(module, encoding="utf-8") as f:
+        functions = bound_functions(f.read())
+    with open(fakevlc, encoding="utf-8") as f:
+        implemented = implemented_functions(f.read())
+    print("/* Generated by genstubs.py from %s, do not edit */" % module)
+    print()
+    print('#define EXPORT __attribute__((visibility("default")))')
+    print()
+    for name, restype in sorted(functions.items()):
+        if name not in implemented:
+            print("EXPORT %s %s(void)" % (RESTYPES.get(restype, "long"), name))
+            print("{")
+            print("    return 0;")
+            print("}")
+            print()
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        sys.exit("Usage: %s vlc.py [fakevlc.c]" % sys.argv[0])
+    main(*sys.argv[1:])
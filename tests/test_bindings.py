@@ -25,10 +25,14 @@
 
 """Unittest module for testing the VLC bindings generated."""
 
+import collections
 import ctypes
+import gc
 import logging
 import os
+import tempfile
 import unittest
+import unittest.mock
 import urllib.parse as urllib  # python3
 from time import sleep
 
@@ -48,6 +52,9 @@ SONG = os.path.join(os.path.dirname(__file__), "samples/song.mp3")
 VIDEO = os.path.join(os.path.dirname(__file__), "samples/video.mp4")
 print("Checking " + vlc.__file__)
 
+# The fake libvlc of tests/fakevlc does not open any media
+FAKEVLC = hasattr(vlc.dll, "fakevlc_emit")
+
 __calls_stats__ = {}
 
 
@@ -114,6 +121,165 @@ class TestVLCAPI(unittest.TestCase):
         else:
             self.assertEqual(vlc.AudioOutputChannel.Dolbys.value, 5)
 
+    def test_cfunction_rebind(self):
+        f = vlc.libvlc_get_version
+        v = f()
+        self.assertEqual(vlc._Cfunctions["libvlc_get_version"](), v)
+        if vlc.rebind_functions:
+            g = vlc.libvlc_get_version
+            self.assertIs(g, vlc._Cfunctions["libvlc_get_version"])
+            self.assertEqual(g.__name__, "libvlc_get_version")
+            self.assertEqual(g.__doc__, f.__doc__)
+            self.assertEqual(g(), v)
+        # The signature is still available after rebinding
+        n = vlc.len_args(vlc.libvlc_media_list_new)
+        vlc.Instance().media_list_new()
+        self.assertEqual(vlc.len_args(vlc.libvlc_media_list_new), n)
+
+    def test_cstub(self):
+        name = "libvlc_media_player_get_time"
+        entry = (name, ((1, "p_mi"),), None, "ctypes.c_longlong", "MediaPlayer")
+        player = vlc.MediaPlayer()
+        with unittest.mock.patch.dict(vlc._Globals), unittest.mock.patch.dict(
+            vlc._Cfunctions, clear=True
+        ):
+            vlc._Cstubs((entry,))
+            self.assertIn(entry, vlc._Cmanifest)
+            f = vlc.libvlc_media_player_get_time
+            self.assertIsInstance(f, vlc._Cstub)
+            self.assertEqual(f.__name__, name)
+            self.assertEqual(f.__doc__, f.doc)
+            self.assertIn(name + "(p_mi)", f.__doc__)
+            self.assertEqual(vlc.len_args(f), 1)
+            self.assertEqual(f(player), -1)
+            self.assertEqual(f(p_mi=player), -1)
+            proto = vlc._Cprototypes[(ctypes.c_longlong, vlc.MediaPlayer)]
+            self.assertIsInstance(vlc._Cfunctions[name], proto)
+            if vlc.rebind_functions:
+                self.assertIs(vlc.libvlc_media_player_get_time, vlc._Cfunctions[name])
+                self.assertEqual(vlc.len_args(vlc.libvlc_media_player_get_time), 1)
+                self.assertEqual(
+                    vlc.libvlc_media_player_get_time.__doc__,
+                    "libvlc_media_player_get_time(p_mi): libvlc function,"
+                    " see the libvlc documentation.",
+                )
+
+    def test_find_lib_cache(self):
+        with tempfile.TemporaryDirectory() as d:
+            env = dict(os.environ, PYTHON_VLC_CACHE_DIR=d)
+            env.pop("PYTHON_VLC_LIB_PATH", None)
+            with unittest.mock.patch.dict(os.environ, env, clear=True):
+                dll, plugin_path = vlc.find_lib()
+                self.assertTrue(os.path.exists(vlc._lib_cache_file()))
+                dll2, plugin_path2 = vlc.find_lib()
+                self.assertTrue(dll2._lib.get("cached"))
+                self.assertEqual(dll2._lib["libs"], dll._lib["libs"])
+                self.assertEqual(plugin_path2, plugin_path)
+
+    def test_deferred_load(self):
+        lib = dict(libs=["/nonexistent/libvlc.so"], preload=[], chdir=None)
+        dll = vlc._Cdll(lib)
+        self.assertIn("not loaded", repr(dll))
+        env = {"PYTHON_VLC_LIB_PATH": lib["libs"][0]}
+        with unittest.mock.patch.dict(os.environ, env):
+            self.assertRaises(OSError, getattr, dll, "libvlc_new")
+        # the module library is loaded by now
+        self.assertTrue(hasattr(vlc.dll, "libvlc_new"))
+        self.assertEqual(vlc.dll._handle, vlc.dll._dll._handle)
+
+    def test_cmethod_binding(self):
+        player = vlc.MediaPlayer()
+        doc = vlc.MediaPlayer.get_time.__doc__
+        self.assertEqual(player.get_time(), -1)
+        self.assertEqual(player.get_time(), -1)
+        if vlc.rebind_functions:
+            f = vlc._Cfunctions["libvlc_media_player_get_time"]
+            self.assertIs(player.get_time.__func__, f)
+            self.assertIs(player.get_time.__self__, player)
+        # still callable and documented from the class
+        self.assertEqual(vlc.MediaPlayer.get_time(player), -1)
+        self.assertEqual(vlc.MediaPlayer.get_time.__doc__, doc)
+        player.set_time(i_time=0)
+        player.release()
+
+    def test_media_player_status(self):
+        player = vlc.MediaPlayer()
+        s = player.status()
+        self.assertIsInstance(s, vlc.MediaPlayerStatus)
+        self.assertEqual(s.time, player.get_time())
+        self.assertEqual(s.state, player.get_state())
+        self.assertEqual(s.length, player.get_length())
+        self.assertIs(s.is_playing, False)
+        self.assertIsNone(s.stats)
+        self.assertIsNone(player.status(stats=True).stats)  # no media
+        player.set_media(vlc.Media(VIDEO))
+        s = player.status(stats=True)
+        self.assertIsInstance(s.stats, vlc.MediaStats)
+        self.assertEqual(s._replace(stats=None), player.status())
+        player.release()
+
+    def test_wrapper_identity(self):
+        i = vlc.Instance()
+        ml = i.media_list_new()
+        m = i.media_new(SONG)
+        ml.add_media(m)
+        self.assertIs(ml.item_at_index(0), m)
+        self.assertIs(ml[0], m)
+        self.assertFalse(hasattr(m, "__dict__"))
+        mlp = i.media_list_player_new()
+        p = i.media_player_new()
+        mlp.set_media_player(p)
+        self.assertIs(mlp.get_media_player(), p)
+        self.assertIs(p.event_manager(), vlc.libvlc_media_player_event_manager(p))
+        mlp.release()
+        p.release()
+        p.release()
+        ml.release()
+
+        # dropped when no longer referenced, i.e. on the release of
+        # the last reference (item_at_index and [] return one each)
+        key = (vlc.Media, m._as_parameter_.value)
+        m.release()
+        m.release()
+        self.assertIs(vlc._Cinstances[key], m)
+        m.release()
+        self.assertNotIn(key, vlc._Cinstances)
+        m = i.media_new(SONG)
+        key = (vlc.Media, m._as_parameter_.value)
+        self.assertIn(key, vlc._Cinstances)
+        del m
+        gc.collect()
+        self.assertNotIn(key, vlc._Cinstances)
+
+    @unittest.mock.patch.object(vlc, "_Chandles", collections.Counter())
+    def test_release_lifecycle(self):
+        with vlc.Instance() as i:
+            with i.media_new(SONG) as m:
+                self.assertEqual(vlc.live_handles(), {"Instance": 1, "Media": 1})
+                # no reference of its own
+                self.assertIs(vlc.Media(m._as_parameter_.value), m)
+                self.assertEqual(vlc.live_handles(), {"Instance": 1, "Media": 1})
+                with self.assertRaises((AttributeError, TypeError)):
+                    with m.event_manager():
+                        pass
+            self.assertEqual(vlc.live_handles(), {"Instance": 1})
+            key = (vlc.Media, m._as_parameter_.value)
+            self.assertNotIn(key, vlc._Cinstances)
+
+            m = i.media_new(SONG).auto_release()
+            self.assertIs(m.auto_release(), m)
+            self.assertEqual(vlc.live_handles(), {"Instance": 1, "Media": 1})
+            del m
+            gc.collect()
+            self.assertEqual(vlc.live_handles(), {"Instance": 1})
+            # no second release
+            m = i.media_new(SONG).auto_release()
+            m.release()
+            del m
+            gc.collect()
+            self.assertEqual(vlc.live_handles(), {"Instance": 1})
+        self.assertEqual(vlc.live_handles(), {})
+
     # Basic libvlc tests
     def test_instance_creation(self):
         i = vlc.Instance()
@@ -193,6 +359,7 @@ class TestVLCAPI(unittest.TestCase):
         eq.set_amp_at_index(val, 1)
         self.assertEqual(eq.get_amp_at_index(1), val)
 
+    @unittest.skipIf(FAKEVLC, "needs a real libvlc")
     def test_tracks_get(self):
         self.assertTrue(os.path.exists(VIDEO))
         m = vlc.Media(VIDEO)
@@ -205,6 +372,7 @@ class TestVLCAPI(unittest.TestCase):
             self.assertEqual(audiotrack.i_original_fourcc, 0x6134706D)
         self.assertEqual(m.get_duration(), 5568)
 
+    @unittest.skipIf(FAKEVLC, "needs a real libvlc")
     def test_meta_get(self):
         self.assertTrue(os.path.exists(VIDEO))
         m = vlc.Media(VIDEO)
@@ -341,6 +509,7 @@ class TestVLCAPI(unittest.TestCase):
 
     @unittest.skipIf(vlc.__version__ >= "4",
             "PfDisplayError is not available in 4.0 - we have to port this test to the new dialog.set_error API")
+    @unittest.skipIf(FAKEVLC, "needs a real libvlc")
     def test_dialog_cbs(self):
         global __calls_stats__
         __calls_stats__ = {}
@@ -0,0 +1,841 @@
+#! /usr/bin/env python
+# This Python file uses the following encoding: utf-8
+
+#
+# Code generator for python ctypes bindings for VLC
+# Copyright (C) 2009 the VideoLAN team
+# $Id: $
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston MA 02110-1301, USA.
+#
+
+"""Unittest module for the bindings' own overhead, using the fake libvlc.
+
+Build it with ``make fakevlc`` and run the tests with
+``PYTHON_VLC_LIB_PATH=tests/fakevlc/libvlc.so``, or use ``make test_fakevlc``.
+The tests are skipped with a real libvlc.
+"""
+
+import asyncio
+import ctypes
+import gc
+import io
+import logging
+import os
+import subprocess
+import sys
+import threading
+import time
+import unittest
+import unittest.mock
+import weakref
+
+try:
+    import vlc
+except ImportError:
+    import generated.vlc as vlc
+
+FAKEVLC = hasattr(vlc.dll, "fakevlc_emit")
+
+
+def fakevlc(name, restype, *argtypes):
+    """Return the *name* hook of the fake libvlc, see fakevlc.c."""
+    f = getattr(vlc.dll, name)
+    f.restype = restype
+    f.argtypes = argtypes
+    return f
+
+
+if FAKEVLC:
+    emit = fakevlc(
+        "fakevlc_emit", ctypes.c_int, vlc.EventManager, ctypes.c_int, ctypes.c_int
+    )
+    run_video = fakevlc(
+        "fakevlc_run_video", ctypes.c_int, vlc.MediaPlayer, ctypes.c_int
+    )
+    stop_video = fakevlc("fakevlc_stop_video", None, vlc.MediaPlayer)
+    run_audio = fakevlc(
+        "fakevlc_run_audio", ctypes.c_int64, vlc.MediaPlayer, ctypes.c_int
+    )
+    run_read = fakevlc(
+        "fakevlc_run_read", ctypes.c_int64, vlc.Media, ctypes.c_size_t, ctypes.c_int64
+    )
+    live_objects = fakevlc("fakevlc_live_objects", ctypes.c_int, ctypes.c_char_p)
+
+
+@unittest.skipUnless(FAKEVLC, "needs the fake libvlc")
+class TestFakeVLC(unittest.TestCase):
+    def setUp(self):
+        # run playback as fast as possible
+        env = {"FAKEVLC_REALTIME": "0", "FAKEVLC_DURATION_MS": "1000"}
+        with unittest.mock.patch.dict(os.environ, env):
+            self.instance = vlc.Instance()
+        self.player = self.instance.media_player_new()
+
+    def tearDown(self):
+        self.player.release()
+        self.instance.release()
+
+    def test_events(self):
+        times = []
+        em = self.player.event_manager()
+        em.event_attach(
+            vlc.EventType.MediaPlayerTimeChanged,
+            lambda e: times.append(e.u.new_time),
+        )
+        self.assertEqual(emit(em, vlc.EventType.MediaPlayerTimeChanged.value, 100), 100)
+        self.assertEqual(times, list(range(100)))
+        em.event_detach(vlc.EventType.MediaPlayerTimeChanged)
+        self.assertEqual(emit(em, vlc.EventType.MediaPlayerTimeChanged.value, 10), 0)
+
+    def test_event_subscribers(self):
+        calls = []
+        em = self.player.event_manager()
+        event = vlc.EventType.MediaPlayerTimeChanged
+        subs = [
+            em.event_subscribe(event, lambda e, i: calls.append(i), i) for i in range(3)
+        ]
+        em.event_attach(event, lambda e: calls.append("attach"))
+        em.event_attach(event, lambda e: calls.append("attach again"))
+        # a single native callback
+        self.assertEqual(emit(em, event.value, 1), 1)
+        self.assertEqual(calls, [0, 1, 2, "attach again"])
+
+        del calls[:]
+        self.assertTrue(em.event_unsubscribe(subs[1]))
+        self.assertFalse(em.event_unsubscribe(subs[1]))
+        em.event_detach(event)
+        self.assertEqual(emit(em, event.value, 1), 1)
+        self.assertEqual(calls, [0, 2])
+
+        # a failing callback does not prevent the others
+        em.event_subscribe(event, lambda e: 1 / 0)
+        em.event_subscribe(event, lambda e: calls.append(3))
+        del calls[:]
+        with self.assertLogs(vlc.logger, logging.ERROR):
+            emit(em, event.value, 1)
+        self.assertEqual(calls, [0, 2, 3])
+        for s in em._callbacks[event.value]:
+            em.event_unsubscribe(s)
+        self.assertEqual(emit(em, event.value, 1), 0)
+
+        # libvlc called without the lock, which its callbacks may need
+        def unlocked(*args):
+            self.assertFalse(em._lock.locked())
+            return 0
+
+        with unittest.mock.patch.object(
+            vlc, "libvlc_event_attach", side_effect=unlocked
+        ) as attach, unittest.mock.patch.object(
+            vlc, "libvlc_event_detach", side_effect=unlocked
+        ) as detach:
+            em.event_unsubscribe(em.event_subscribe(event, lambda e: None))
+        self.assertEqual((attach.call_count, detach.call_count), (1, 1))
+        self.assertNotIn(em, vlc._Cmanagers)
+
+    def test_event_queue(self):
+        calls = []
+        em = self.player.event_manager()
+        event = vlc.EventType.MediaPlayerTimeChanged
+        em.event_subscribe(
+            event,
+            lambda e: calls.append((e.u.new_time, threading.current_thread().name)),
+        )
+        q = em.event_queue(4)
+        self.assertEqual(emit(em, event.value, 10), 10)
+        self.assertEqual((len(q), q.dropped, calls), (4, 6, []))
+        self.assertEqual(q.drain(), 4)
+        main = threading.current_thread().name
+        self.assertEqual(calls, [(t, main) for t in range(4)])
+        self.assertFalse(q.poll(0.01))
+
+        del calls[:]
+        q = em.event_queue(thread=True)
+        emit(em, event.value, 100)
+        q.close()
+        self.assertEqual(calls, [(t, "vlc-events") for t in range(100)])
+
+        del calls[:]
+        self.assertIsNone(em.event_queue(0))
+        emit(em, event.value, 1)
+        self.assertEqual(calls, [(0, main)])
+
+    def test_event_coalesce(self):
+        times = []
+        em = self.player.event_manager()
+        event = vlc.EventType.MediaPlayerTimeChanged
+        em.event_attach(event, lambda e: times.append(e.u.new_time))
+        p = em.event_coalesce(event, interval=60)
+        emit(em, event.value, 100)
+        self.assertEqual((times, p.delivered, p.coalesced), ([0], 1, 99))
+
+        del times[:]
+        p = em.event_coalesce(event, rate=1e-3, burst=5)
+        emit(em, event.value, 100)
+        self.assertEqual((times, p.delivered, p.coalesced), ([0, 1, 2, 3, 4], 5, 95))
+
+        # the latest queued value
+        del times[:]
+        q = em.event_queue(16)
+        p = em.event_coalesce(event, latest=True)
+        emit(em, event.value, 100)
+        self.assertEqual((len(q), p.delivered, p.coalesced), (1, 1, 99))
+        self.assertEqual(q.drain(), 1)
+        emit(em, event.value, 2)
+        self.assertEqual(q.drain(), 1)
+        self.assertEqual((times, p.delivered, p.coalesced), ([99, 1], 2, 100))
+        em.event_queue(0)
+
+        # and the last one coalesced, at the end of the interval
+        del times[:]
+        p = em.event_coalesce(event, interval=0.05, latest=True)
+        emit(em, event.value, 100)
+        self.assertEqual(times, [0])
+        for _ in range(100):
+            if len(times) > 1:
+                break
+            time.sleep(0.01)
+        self.assertEqual((times, p.delivered, p.coalesced), ([0, 99], 2, 98))
+        names = [t.name for t in threading.enumerate()]
+        self.assertEqual(names.count("vlc-event-timers"), 1)  # for all of them
+
+        del times[:]
+        p = em.event_coalesce(event, rate=1e-3, latest=True)
+        emit(em, event.value, 10)
+        em.event_coalesce(event)  # canceled
+        self.assertIsNone(p._timer)
+        self.assertEqual(times, [0])
+
+        del times[:]
+        self.assertIsNone(em.event_coalesce(event))
+        emit(em, event.value, 100)
+        self.assertEqual(len(times), 100)
+
+    def test_event_records(self):
+        events = []
+        em = self.player.event_manager()
+        em.event_attach(vlc.EventType.MediaPlayerTimeChanged, events.append)
+        em.event_attach(vlc.EventType.MediaPlayerPlaying, events.append)
+        em.event_records()
+        emit(em, vlc.EventType.MediaPlayerTimeChanged.value, 2)
+        emit(em, vlc.EventType.MediaPlayerPlaying.value, 1)
+        self.assertEqual([e.u.new_time for e in events[:2]], [0, 1])
+        e = events[1]
+        self.assertIsInstance(e, vlc.EventRecord)
+        self.assertEqual(
+            (e.type, e.obj, e.new_time),
+            (vlc.EventType.MediaPlayerTimeChanged, self.player._as_parameter_.value, 1),
+        )
+        self.assertEqual(events[2]._fields, ("type", "obj"))
+
+        del events[:]
+        q = em.event_queue()
+        emit(em, vlc.EventType.MediaPlayerTimeChanged.value, 2)
+        q.drain()
+        self.assertEqual([e.new_time for e in events], [0, 1])
+
+        del events[:]
+        em.event_queue(0)
+        em.event_records(False)
+        emit(em, vlc.EventType.MediaPlayerTimeChanged.value, 1)
+        self.assertIsInstance(events[0], vlc.Event)
+
+        # pointer and structure fields
+        class Pair(ctypes.Structure):
+            _fields_ = [("a", ctypes.c_int), ("b", ctypes.c_int)]
+
+        k = vlc.EventType.MediaPlayerTimeChanged.value
+        for t, value, read in (
+            (ctypes.POINTER(ctypes.c_int), 1234, lambda v: v),
+            (Pair, Pair(1, 2), lambda v: (v.a, v.b)),
+        ):
+
+            class Member(ctypes.Structure):
+                _fields_ = [("field", t)]
+
+            m = Member(value if t is Pair else ctypes.cast(value, t))
+            e = vlc.Event()
+            e.type = k
+            ctypes.memmove(
+                ctypes.addressof(e) + vlc.Event.u.offset,
+                ctypes.addressof(m),
+                ctypes.sizeof(m),
+            )
+            with unittest.mock.patch.object(vlc, "_event_member", return_value=Member):
+                with unittest.mock.patch.dict(vlc._event_layouts, clear=True):
+                    with unittest.mock.patch.dict(vlc._event_codecs, clear=True):
+                        r = vlc._event_decoder(k)(e)
+                        encode, decode = vlc._event_codec(k)
+                        d = decode(encode(r))
+                del vlc._event_decoders[k]
+            self.assertEqual(read(r.field), read(value))
+            self.assertEqual(read(d.field), read(value))
+
+    def test_event_recorder(self):
+        time_changed = vlc.EventType.MediaPlayerTimeChanged
+        em = self.player.event_manager()
+        f = io.BytesIO()
+        with vlc.EventRecorder(self.player, f) as recorder:
+            emit(em, time_changed.value, 3)
+            emit(em, vlc.EventType.MediaPlayerPlaying.value, 1)
+        emit(em, time_changed.value, 1)
+        self.assertEqual(recorder.recorded, 4)
+
+        f.seek(0)
+        replayer = vlc.EventReplayer(f)
+        records = [r for _, r in replayer.events()]
+        self.assertEqual(
+            [r.type for r in records],
+            [time_changed] * 3 + [vlc.EventType.MediaPlayerPlaying],
+        )
+        self.assertEqual([r.new_time for r in records[:3]], [0, 1, 2])
+        self.assertEqual(records[0].obj, self.player._as_parameter_.value)
+
+        events = []
+        replayer.event_attach(time_changed, lambda e: events.append(e.u.new_time))
+        f.seek(0)
+        self.assertEqual(replayer.replay(speed=0), 4)
+        self.assertEqual(events, [0, 1, 2])
+
+        # into the callbacks of a player, without its libvlc events
+        del events[:]
+        player = self.instance.media_player_new()
+        player.event_manager().event_attach(time_changed, events.append)
+        f.seek(0)
+        replayer.replay(speed=0, manager=player.event_manager())
+        self.assertEqual([e.u.new_time for e in events], [0, 1, 2])
+        player.release()
+
+        self.assertRaises(
+            vlc.VLCException, list, vlc.EventReplayer(io.BytesIO(b"x" * 20)).events()
+        )
+
+    def test_aio(self):
+        em = self.player.event_manager()
+        time_changed = vlc.EventType.MediaPlayerTimeChanged
+
+        async def events(n):
+            times = []
+            it = vlc.aio.events(self.player, time_changed)
+            async for e in it:
+                times.append(e.u.new_time)
+                if len(times) == n:
+                    await it.aclose()
+            return times
+
+        async def run():
+            task = asyncio.ensure_future(
+                vlc.aio.wait_for(self.player, (time_changed,), timeout=1)
+            )
+            await asyncio.sleep(0)  # subscribed
+            emit(em, time_changed.value, 2)
+            e = await task
+            self.assertEqual((e.type, e.u.new_time), (time_changed, 0))
+            with self.assertRaises(asyncio.TimeoutError):
+                await vlc.aio.wait_for(self.player, time_changed, timeout=0.01)
+
+            task = asyncio.ensure_future(events(3))
+            await asyncio.sleep(0)
+            emit(em, time_changed.value, 5)
+            self.assertEqual(await task, [0, 1, 2])
+            self.assertFalse(em._callbacks.get(time_changed.value))
+
+            m = self.instance.media_new("fake://")
+            status = await vlc.aio.parse(m, timeout=1)
+            self.assertEqual(status, vlc.MediaParsedStatus.done)
+            ml = self.instance.media_list_new()
+            ml.add_media(m)
+            mlp = self.instance.media_list_player_new()
+            mlp.set_media_list(ml)
+            e = await vlc.aio.play_item_at_index(mlp, 0, timeout=1)
+            self.assertEqual(e.type, vlc.EventType.MediaListPlayerNextItemSet)
+            with self.assertRaises(vlc.VLCException):
+                await vlc.aio.play_item_at_index(mlp, 1, timeout=1)
+            await vlc.aio.stop(mlp)
+            self.assertEqual(mlp.get_state(), vlc.State.Stopped)
+            for o in (mlp, ml, m):
+                o.release()
+
+        asyncio.run(run())
+
+    def test_playback(self):
+        ended = threading.Event()
+        em = self.player.event_manager()
+        em.event_attach(vlc.EventType.MediaPlayerEndReached, lambda e: ended.set())
+        self.player.set_media(self.instance.media_new("fake://"))
+        self.assertEqual(self.player.play(), 0)
+        self.assertTrue(ended.wait(10))
+        self.assertEqual(self.player.get_state(), vlc.State.Ended)
+        self.assertEqual(self.player.get_time(), 1000)
+        self.assertEqual(self.player.get_length(), 1000)
+        self.player.stop()
+
+    def test_playback_clock(self):
+        now = [0.0]
+        clock = vlc.PlaybackClock(self.player, clock=lambda: now[0])
+        self.assertEqual(clock.time(), -1)
+        self.player.set_media(self.instance.media_new("fake://"))
+        clock.sync()
+        self.assertEqual(clock.length, 1000)
+        em = self.player.event_manager()
+        emit(em, vlc.EventType.MediaPlayerPlaying.value, 1)
+        self.assertTrue(clock.is_playing())
+        now[0] = 0.1
+        self.assertAlmostEqual(clock.time(), 100)
+        self.assertEqual(clock.set_rate(2), 0)
+        now[0] = 0.2
+        self.assertAlmostEqual(clock.time(), 300)
+        self.assertAlmostEqual(clock.position(), 0.3)
+        emit(em, vlc.EventType.MediaPlayerTimeChanged.value, 3)
+        self.assertEqual(clock.time(), 2)
+        now[0] = 10
+        self.assertEqual(clock.time(), 1000)  # no further than the end
+        now[0] = 0.3
+        emit(em, vlc.EventType.MediaPlayerPaused.value, 1)
+        now[0] = 0.5
+        self.assertAlmostEqual(clock.time(), 202)
+        self.assertFalse(clock.is_playing())
+        emit(em, vlc.EventType.MediaPlayerEndReached.value, 1)
+        self.assertEqual(clock.time(), 1000)
+        clock.close()
+        emit(em, vlc.EventType.MediaPlayerTimeChanged.value, 1)
+        self.assertEqual(clock.time(), 1000)
+
+        # closed by the release of its player
+        player = self.instance.media_player_new()
+        clock = vlc.PlaybackClock(player)
+        em = player.event_manager()
+        player.release()
+        self.assertNotIn(em, vlc._Cmanagers)
+        with unittest.mock.patch.object(vlc, "libvlc_event_detach") as detach:
+            clock.close()
+        detach.assert_not_called()
+
+    def test_video_callbacks(self):
+        buf = ctypes.create_string_buffer(320 * 240 * 4)
+        calls = {"lock": 0, "unlock": 0, "display": 0}
+
+        @vlc.CallbackDecorators.VideoLockCb
+        def lock(opaque, planes):
+            calls["lock"] += 1
+            planes[0] = ctypes.addressof(buf)
+
+        @vlc.CallbackDecorators.VideoUnlockCb
+        def unlock(opaque, picture, planes):
+            calls["unlock"] += 1
+
+        @vlc.CallbackDecorators.VideoDisplayCb
+        def display(opaque, picture):
+            calls["display"] += 1
+
+        self.player.set_media(self.instance.media_new("fake://"))
+        self.player.video_set_callbacks(lock, unlock, display, None)
+        self.player.video_set_format("RV32", 320, 240, 320 * 4)
+        self.assertEqual(run_video(self.player, 10), 10)
+        stop_video(self.player)
+        self.assertEqual(calls, {"lock": 10, "unlock": 10, "display": 10})
+        self.assertEqual(buf.raw[0], 9)
+
+    def test_video_frame_sink(self):
+        self.player.set_media(self.instance.media_new("fake://"))
+        sink = vlc.VideoFrameSink(self.player, "RV24", width=160, buffers=2)
+        self.assertEqual(run_video(self.player, 2), 2)
+        frames = [sink.get(timeout=1) for _ in range(2)]
+        self.assertEqual([f.number for f in frames], [0, 1])
+        f = frames[1]
+        self.assertEqual((f.chroma, f.width, f.height), (b"RV24", 160, 120))
+        self.assertEqual((f.pitches, f.lines), ((480,), (128,)))
+        self.assertTrue(f.planes[0].readonly)
+        self.assertEqual((f.planes[0][0], f.planes[0][-1]), (1, 1))
+        self.assertGreater(f.pts, 0)
+
+        # dropped, without free buffers
+        self.assertEqual(run_video(self.player, 1), 1)
+        self.assertEqual((sink.frames, sink.dropped), (3, 1))
+        self.assertIsNone(sink.get(timeout=0))
+        for f in frames:
+            f.release()
+        run_video(self.player, 1)
+        with sink.get(timeout=1) as f:
+            self.assertEqual(f.planes[0][0], 3)
+            try:
+                import numpy  # noqa: F401
+            except ImportError:
+                pass
+            else:
+                a = f.array()
+                self.assertEqual(a.shape, (120, 160, 3))
+                self.assertEqual(a[0, 0, 0], 3)
+        stop_video(self.player)
+
+        emit(self.player.event_manager(), vlc.EventType.MediaPlayerEndReached.value, 1)
+        self.assertEqual(list(sink), [])
+        del frames, f  # referring to it
+        sink = weakref.ref(sink)
+        sink().close()
+        gc.collect()
+        self.assertIsNone(sink())
+
+        # or dropped with its player
+        player = self.instance.media_player_new()
+        sink = weakref.ref(vlc.VideoFrameSink(player))
+        player.release()
+        del player
+        gc.collect()
+        self.assertIsNone(sink())
+
+    def test_video_sink_policies(self):
+        self.player.set_media(self.instance.media_new("fake://"))
+        for policy, numbers, dropped in (
+            ("drop-newest", [0, 1], 3),
+            ("drop-oldest", [3, 4], 3),
+            ("latest", [4], 4),
+        ):
+            sink = vlc.VideoFrameSink(
+                self.player, buffers=3, queue=2, policy=policy, deadline=0
+            )
+            self.assertEqual(run_video(self.player, 5), 5)
+            stop_video(self.player)
+            sink.close()
+            time.sleep(0.001)
+            frames = list(sink)
+            self.assertEqual([f.number for f in frames], numbers, policy)
+            self.assertEqual(
+                (sink.frames, sink.dropped, sink.delivered, sink.late),
+                (5, dropped, len(numbers), len(numbers)),
+            )
+
+        # the buffers held by the consumer are not reused
+        sink = vlc.VideoFrameSink(self.player, buffers=2, policy="latest")
+        run_video(self.player, 1)
+        f = sink.get(timeout=1)
+        pixel = f.planes[0][0]
+        run_video(self.player, 3)
+        stop_video(self.player)
+        self.assertEqual((f.number, f.planes[0][0]), (0, pixel))
+        self.assertEqual(sink.get(timeout=1).number, 3)
+        sink.close()
+        self.assertRaises(
+            vlc.VLCException, vlc.VideoFrameSink, self.player, policy="wait"
+        )
+
+    def test_video_planes(self):
+        self.assertEqual(vlc.video_planes("RV32", 100, 50), ((416,), (64,)))
+        self.assertEqual(
+            vlc.video_planes(b"I420", 320, 240), ((320, 160, 160), (256, 128, 128))
+        )
+        self.assertEqual(vlc.video_planes("NV12", 33, 17), ((64, 64), (32, 16)))
+        self.assertRaises(vlc.VLCException, vlc.video_planes, "H264", 320, 240)
+
+        self.player.set_media(self.instance.media_new("fake://"))
+        sink = vlc.VideoFrameSink(self.player, "I420")
+        run_video(self.player, 2)
+        sink.get(timeout=1).release()
+        f = sink.get(timeout=1)
+        self.assertEqual((f.pitches, f.lines), vlc.video_planes("I420", 320, 240))
+        self.assertEqual([len(p) for p in f.planes], [320 * 256, 160 * 128, 160 * 128])
+        self.assertEqual([(p[0], p[-1]) for p in f.planes], [(1, 1)] * 3)
+        try:
+            import numpy  # noqa: F401
+        except ImportError:
+            pass
+        else:
+            self.assertEqual(f.array(1).shape, (120, 160, 1))
+        f.release()
+        stop_video(self.player)
+        sink.close()
+
+    def test_iter_frames(self):
+        frames = []
+        sinks = len(vlc._video_sinks)
+        with unittest.mock.patch.object(
+            vlc, "libvlc_media_add_option", wraps=vlc.libvlc_media_add_option
+        ) as add_option, unittest.mock.patch.object(
+            vlc, "libvlc_media_player_set_rate", wraps=vlc.libvlc_media_player_set_rate
+        ) as set_rate:
+            for f in vlc.iter_frames(
+                "fake://", size=(160, 0), every_n=5, buffers=2, instance=self.instance
+            ):
+                time.sleep(0.001)  # slower than the decoder
+                frames.append((f.number, f.width, f.height, f.planes[0][0]))
+        self.assertEqual(frames, [(n, 160, 120, n) for n in range(0, 25, 5)])
+        self.assertEqual(add_option.call_args[0][1], b":no-audio")
+        self.assertEqual(set_rate.call_args[0][1], 32.0)  # not real time
+        self.assertEqual(len(vlc._video_sinks), sinks)
+
+        # stopped before the end, unblocking the decoder
+        it = vlc.iter_frames("fake://", instance=self.instance, buffers=1)
+        self.assertEqual(next(it).number, 0)
+        it.close()
+
+    def test_shared_frames(self):
+        self.player.set_media(self.instance.media_new("fake://"))
+        sink = vlc.SharedFrameSink(self.player, 160, 120, "I420", slots=4)
+        reader = vlc.SharedFrameReader(sink.name)
+        self.assertEqual(
+            (reader.width, reader.height, reader.chroma), (160, 120, b"I420")
+        )
+        self.assertEqual(
+            (reader.pitches, reader.lines), vlc.video_planes("I420", 160, 120)
+        )
+
+        with unittest.mock.patch.object(vlc, "libvlc_media_player_get_time") as get:
+            run_video(self.player, 3)
+        get.assert_not_called()  # unless asked for with times=True
+        frames = [reader.get(timeout=1) for _ in range(3)]
+        self.assertEqual([f.number for f in frames], [0, 1, 2])
+        self.assertEqual(frames[0].time, 0)
+        first = frames[0].planes[0][0]
+        self.assertEqual(
+            [(p[0], p[-1]) for p in frames[2].planes], [((first + 2) & 0xFF,) * 2] * 3
+        )
+        self.assertTrue(frames[2].valid())
+        self.assertIsNone(reader.get(timeout=0))
+
+        # overwritten frames, skipped
+        run_video(self.player, 6)
+        self.assertFalse(frames[2].valid())
+        self.assertEqual([reader.get(timeout=1).number for _ in range(4)], [5, 6, 7, 8])
+        self.assertEqual(reader.missed, 2)
+
+        # read by another process, until the end
+        emit(self.player.event_manager(), vlc.EventType.MediaPlayerEndReached.value, 1)
+        code = (
+            "import vlc\n"
+            "with vlc.SharedFrameReader(%r) as r:\n"
+            "    print([(f.number, f.planes[1][0]) for f in r], r.missed)" % sink.name
+        )
+        out = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, timeout=60
+        )
+        self.assertEqual(out.stderr, "")
+        numbers = [(n, (first + n) & 0xFF) for n in range(5, 9)]
+        self.assertEqual(out.stdout, "%r 5\n" % (numbers,))
+
+        reader.close()
+        stop_video(self.player)
+        sink.close()
+        self.assertRaises(FileNotFoundError, vlc.SharedFrameReader, sink.name)
+        self.assertNotIn(self.player, vlc._video_sinks)
+
+        # played again, without the sink nor its callbacks
+        self.assertEqual(run_video(self.player, 2), -1)
+        self.assertEqual(sink.frames, 9)
+        planes = (ctypes.c_void_p * 3)()
+        self.assertIsNone(sink._lock(None, planes))  # a video output still running
+        sink._display(None, None)
+
+    def test_audio_callbacks(self):
+        samples = []
+
+        @vlc.CallbackDecorators.AudioPlayCb
+        def play(data, buf, count, pts):
+            samples.append(count)
+
+        self.player.audio_set_callbacks(play, None, None, None, None, None)
+        self.player.audio_set_format("S16N", 48000, 2)
+        self.assertEqual(run_audio(self.player, 5), 5 * 480)
+        self.assertEqual(samples, [480] * 5)
+
+    def test_media_callbacks(self):
+        remaining = [100000]
+
+        @vlc.CallbackDecorators.MediaReadCb
+        def read(opaque, buf, size):
+            n = min(size, remaining[0])
+            remaining[0] -= n
+            return n
+
+        m = self.instance.media_new_callbacks(None, read, None, None, None)
+        self.assertEqual(run_read(m, 4096, -1), 100000)
+        m.release()
+
+    def test_event_hub(self):
+        time_changed = vlc.EventType.MediaPlayerTimeChanged
+        playing = vlc.EventType.MediaPlayerPlaying
+        players = [self.instance.media_player_new() for _ in range(3)]
+        hub = vlc.EventHub()
+        events = []
+        all_time = hub.event_subscribe(
+            time_changed, lambda e: events.append((hub.owner(e), e.u.new_time))
+        )
+        for p in players[:2]:
+            hub.add(p)
+        own = hub.event_subscribe_to(players[2], playing, events.append)
+        self.assertEqual(len(hub), 3)
+        self.assertIn(players[2], hub)
+
+        ems = [p.event_manager() for p in players]
+        self.assertEqual([emit(em, time_changed.value, 1) for em in ems], [1, 1, 1])
+        self.assertEqual(emit(ems[0], playing.value, 1), 0)
+        self.assertEqual(emit(ems[2], playing.value, 1), 1)
+        self.assertEqual(events[:3], [(p, 0) for p in players])
+        self.assertIsInstance(events[3], vlc.Event)
+
+        # detached when released, by the last reference
+        m = self.instance.media_new("fake://")
+        hub.add(m)
+        self.player.set_media(m)
+        self.player.get_media().release()
+        self.assertIn(m, hub)
+        m.release()
+        self.assertNotIn(m, hub)
+        players[0].release()
+        self.assertEqual(len(hub), 2)
+        self.assertEqual(emit(ems[0], time_changed.value, 1), 0)
+        # added by its event manager
+        slots = dict(hub._slots)
+        p = self.instance.media_player_new()
+        hub.add(p.event_manager())
+        self.assertEqual(len(hub), 3)
+        p.release()
+        self.assertEqual(len(hub), 2)
+        self.assertEqual(hub._slots, slots)
+
+        self.assertTrue(hub.event_unsubscribe(own))
+        self.assertFalse(hub.event_unsubscribe(own))
+        self.assertEqual(emit(ems[2], playing.value, 1), 0)
+        self.assertTrue(hub.event_unsubscribe(all_time))
+        self.assertEqual(emit(ems[1], time_changed.value, 1), 0)
+        hub.event_subscribe(time_changed, lambda e: None)
+        self.assertEqual(emit(ems[1], time_changed.value, 1), 1)
+        hub.close()
+        self.assertEqual(len(hub), 0)
+        self.assertEqual(emit(ems[1], time_changed.value, 1), 0)
+        for p in players[1:]:
+            p.release()
+
+    def test_callback_latency(self):
+        exceeded = []
+        latency = vlc.CallbackLatency(
+            budget=0.01, exceeded=lambda kind, t: exceeded.append(kind)
+        )
+        em = self.player.event_manager()
+        em.event_attach(vlc.EventType.MediaPlayerTimeChanged, lambda e: None)
+        em.event_attach(vlc.EventType.MediaPlayerPlaying, lambda e: time.sleep(0.02))
+        em.event_latency(latency)
+        emit(em, vlc.EventType.MediaPlayerTimeChanged.value, 3)
+        emit(em, vlc.EventType.MediaPlayerPlaying.value, 1)
+
+        @vlc.CallbackDecorators.AudioPlayCb
+        @latency.wrap("audio.play")
+        def play(data, buf, count, pts):
+            pass
+
+        self.player.audio_set_callbacks(play, None, None, None, None, None)
+        self.player.audio_set_format("S16N", 48000, 2)
+        run_audio(self.player, 5)
+
+        s = latency.snapshot(reset=True)
+        h = s["event.MediaPlayerTimeChanged"]
+        self.assertEqual((h.count, h.over_budget), (3, 0))
+        self.assertLessEqual(h.percentile(50), h.max)
+        h = s["event.MediaPlayerPlaying"]
+        self.assertEqual((h.count, h.over_budget), (1, 1))
+        self.assertGreaterEqual(h.percentile(99), 0.02e9 * 63 / 64)
+        self.assertEqual(s["audio.play"].count, 5)
+        self.assertEqual(exceeded, ["event.MediaPlayerPlaying"])
+        self.assertEqual(latency.snapshot()["audio.play"].count, 0)
+
+        em.event_latency(None)
+        emit(em, vlc.EventType.MediaPlayerTimeChanged.value, 1)
+        self.assertEqual(latency.snapshot()["event.MediaPlayerTimeChanged"].count, 0)
+
+        h = vlc.LatencyHistogram("test")
+        for ns in range(1, 100001):
+            h.record(ns)
+        for p in (1, 50, 99, 100):
+            self.assertAlmostEqual(h.percentile(p), p * 1000, delta=p * 1000 / 64)
+
+    def test_live_objects(self):
+        n = live_objects(b"media")
+        m = self.instance.media_new("fake://")
+        self.assertEqual(live_objects(b"media"), n + 1)
+        m.release()
+        self.assertEqual(live_objects(b"media"), n)
+        m = self.instance.media_new("fake://").auto_release()
+        self.assertEqual(live_objects(b"media"), n + 1)
+        del m
+        gc.collect()
+        self.assertEqual(live_objects(b"media"), n)
+
+    def test_release_references(self):
+        # the media is still referenced, by the application and the player
+        m = self.instance.media_new("fake://")
+        em = m.event_manager()
+        event = vlc.EventType.MediaParsedChanged
+        em.event_attach(event, lambda e: None)
+        self.player.set_media(m)
+        self.player.get_media().release()
+        self.assertIs(m.event_manager(), em)
+        self.assertEqual(emit(em, event.value, 1), 1)
+
+        # the player of a list player, obtained twice
+        mlp = self.instance.media_list_player_new()
+        p = mlp.get_media_player()
+        pem = p.event_manager()
+        pem.event_attach(vlc.EventType.MediaPlayerStopped, lambda e: None)
+        mlp.get_media_player().release()
+        self.assertEqual(emit(pem, vlc.EventType.MediaPlayerStopped.value, 1), 1)
+        # the last one: still attached, the list player holding it
+        p.release()
+        self.assertEqual(emit(pem, vlc.EventType.MediaPlayerStopped.value, 1), 1)
+        self.assertIn(pem, vlc._Cmanagers)
+        pem.event_detach(vlc.EventType.MediaPlayerStopped)
+        self.assertNotIn(pem, vlc._Cmanagers)
+        mlp.release()
+
+        # kept alive while attached, even if the wrapper is not
+        m.retain()
+        m.release()
+        self.assertEqual(emit(em, event.value, 1), 1)
+        del m, em
+        gc.collect()
+        m = self.player.get_media()
+        em = m.event_manager()
+        self.assertEqual(emit(em, event.value, 1), 1)
+        m.release()
+        self.assertIs(m.event_manager(), em)
+        m.release()  # the reference of media_new(), the player has one
+        self.assertEqual(emit(em, event.value, 1), 1)
+        self.assertIsNot(self.player.get_media(), m)
+        em.event_detach(event)
+        self.assertEqual(emit(em, event.value, 1), 0)
+
+    def test_soak_players(self):
+        # the callback refers back to its player, through the memoized
+        # event manager: the wrappers must still go away on release,
+        # once the callback is detached (libvlc may still call it)
+        def soak(n):
+            for _ in range(n):
+                p = self.instance.media_player_new()
+                em = p.event_manager()
+                em.event_attach(vlc.EventType.MediaPlayerStopped, lambda e, p=p: None)
+                em.event_detach(vlc.EventType.MediaPlayerStopped)
+                p.release()
+
+        soak(1000)
+        gc.collect()
+        before = len(gc.get_objects()), len(vlc._Cinstances)
+        soak(100000)
+        gc.collect()
+        self.assertLess(len(gc.get_objects()) - before[0], 100)
+        self.assertEqual(len(vlc._Cinstances), before[1])
+        self.assertFalse(any(map(len, vlc.memoize_parameterless._caches)))
+
+
+if __name__ == "__main__":
+    logging.basicConfig()
+    unittest.main()
@@ -25,7 +25,11 @@
 
 """Unittest module for testing the generator."""
 
+import ast
+import io
 import logging
+import sys
+import types
 import unittest
 from pathlib import Path
 
@@ -34,12 +38,14 @@ from generator.generate import (
     Func,
     Par,
     Parser,
+    PythonGenerator,
     Struct,
     Union,
     Val,
     class_re,
     clean_doxygen_comment,
     def_re,
+    make_lazy,
     snake_to_camel_case,
     strip_whitespaces,
 )
@@ -1138,6 +1144,129 @@ played
             self.assertEqual(snake_to_camel_case(input), expected_output)
 
 
+class TestPythonGenerator(unittest.TestCase):
+    def get_generator(self, code_file: Path | str) -> PythonGenerator:
+        g = PythonGenerator(
+            Parser(
+                code_file,
+                "./tests/test_parser_inputs/libvlc_version_without_extra.h",
+            )
+        )
+        g.file = io.StringIO()
+        return g
+
+    def test_generate_funcs_flags(self):
+        g = self.get_generator("./tests/test_parser_inputs/wrappers.h")
+        g.generate_funcs()
+        code = g.file.getvalue()
+        self.assertIn("((1, 'p_mi'), (1, 'i_time'),)", code)
+        self.assertIn("((1, 'p_mi'), (1, 'num'), (2, 'px'), (2, 'py'),)", code)
+
+    def test_generate_funcs_manifest(self):
+        g = self.get_generator("./tests/test_parser_inputs/wrappers.h")
+        g.manifest = True
+        g.generate_funcs()
+        code = g.file.getvalue()
+        self.assertNotIn("def ", code)
+        manifest = ast.literal_eval(code[code.index("((") + 1 : code.rindex(")")])
+        entries = {e[0]: e for e in manifest}
+        self.assertEqual(
+            entries["libvlc_media_player_set_time"],
+            (
+                "libvlc_media_player_set_time",
+                ((1, "p_mi"), (1, "i_time")),
+                None,
+                "None",
+                "MediaPlayer",
+                "ctypes.c_longlong",
+            ),
+        )
+        self.assertEqual(
+            entries["libvlc_media_player_event_manager"][2:4],
+            ("class_result(EventManager)", "ctypes.c_void_p"),
+        )
+
+    def test_generate_wrappers_cmethod(self):
+        g = self.get_generator("./tests/test_parser_inputs/wrappers.h")
+        g.generate_wrappers()
+        code = g.file.getvalue()
+        self.assertIn(
+            "    @_Cmethod('libvlc_media_player_get_time')\n    def get_time(self):",
+            code,
+        )
+        self.assertIn(
+            "    @_Cmethod('libvlc_media_player_set_time')\n    def set_time(self, i_time):",
+            code,
+        )
+        # arguments converted before the call
+        self.assertIn("\n    def video_set_aspect_ratio(self, psz_aspect):", code)
+        self.assertNotIn("@_Cmethod('libvlc_video_set_aspect_ratio')", code)
+        # memoized
+        self.assertIn("    @memoize_parameterless\n    def event_manager(self):", code)
+        self.assertNotIn("@_Cmethod('libvlc_media_player_event_manager')", code)
+        # forgotten by the _Cinstances map on release
+        self.assertIn("    '''\n    __slots__ = ()\n", code)
+        self.assertIn(
+            "        _Crelease(self)\n        return libvlc_media_player_release(self)",
+            code,
+        )
+        self.assertNotIn("@_Cmethod('libvlc_media_player_release')", code)
+        self.assertIn("    __enter__ = _Center\n    __exit__ = _Cexit\n", code)
+        # counted as released
+        self.assertIn(
+            "        _Cacquire(self)\n        return libvlc_media_player_retain(self)",
+            code,
+        )
+
+    def test_make_lazy(self):
+        source = '''import sys
+_Clazy = {}
+_Cmodule = sys.modules[__name__]
+
+
+def __getattr__(name):
+    _Clazy[name]()
+    return globals()[name]
+
+
+class Equalizer(object):
+    """Equalizer docstring."""
+
+    def __init__(self):
+        self.bands = libvlc_equalizer_bands()
+
+
+def libvlc_equalizer_bands():
+    return 10
+
+
+class Player(object):
+    def set_equalizer(self, eq):
+        return isinstance(eq, Equalizer)
+
+
+# End of generated functions #
+'''
+        names = {"Equalizer": "equalizer", "libvlc_equalizer_bands": "equalizer"}
+        code = make_lazy(source, names)
+        self.assertIn("def _load_equalizer():", code)
+        self.assertIn("    global Equalizer, libvlc_equalizer_bands", code)
+        self.assertIn("return isinstance(eq, _Cmodule.Equalizer)", code)
+        self.assertIn("        self.bands = libvlc_equalizer_bands()", code)
+        self.assertLess(code.index("def _load_equalizer"), code.index("# End of"))
+
+        module = types.ModuleType("lazy")
+        sys.modules["lazy"] = module
+        try:
+            exec(code, module.__dict__)
+            self.assertNotIn("Equalizer", module.__dict__)
+            self.assertTrue(module.Player().set_equalizer(module.Equalizer()))
+            self.assertEqual(module.Equalizer.__doc__, "Equalizer docstring.")
+            self.assertEqual(module.Equalizer().bands, 10)
+        finally:
+            del sys.modules["lazy"]
+
+
 if __name__ == "__main__":
     logging.basicConfig()
     unittest.main()
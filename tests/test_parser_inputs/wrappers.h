@@ -0,0 +1,62 @@
+typedef struct libvlc_media_player_t libvlc_media_player_t;
+typedef struct libvlc_event_manager_t libvlc_event_manager_t;
+typedef int64_t libvlc_time_t;
+
+/** Get the Event Manager from which the media player send event.
+ *
+ * \param p_mi the Media Player
+ * \return the event manager associated with p_mi
+ */
+__attribute__((visibility("default"))) libvlc_event_manager_t *
+libvlc_media_player_event_manager(libvlc_media_player_t *p_mi);
+
+/** Get the current movie time (in ms).
+ *
+ * \param p_mi the Media Player
+ * \return the movie time (in ms), or -1 if there is no media.
+ */
+__attribute__((visibility("default"))) libvlc_time_t
+libvlc_media_player_get_time(libvlc_media_player_t *p_mi);
+
+/** Set the movie time (in ms).
+ *
+ * \param p_mi the Media Player
+ * \param i_time the movie time (in ms).
+ */
+__attribute__((visibility("default"))) void
+libvlc_media_player_set_time(libvlc_media_player_t *p_mi, libvlc_time_t i_time);
+
+/** Set new video aspect ratio.
+ *
+ * \param p_mi the media player
+ * \param psz_aspect new video aspect-ratio or NULL to reset to default
+ */
+__attribute__((visibility("default"))) void
+libvlc_video_set_aspect_ratio(libvlc_media_player_t *p_mi,
+                              const char *psz_aspect);
+
+/** Get the mouse pointer coordinates over a video.
+ *
+ * \param p_mi media player
+ * \param num number of the video (starting from, and most commonly 0)
+ * \param px abscissa [OUT]
+ * \param py ordinate [OUT]
+ * \return 0 on success, -1 if the specified video does not exist
+ */
+__attribute__((visibility("default"))) int
+libvlc_video_get_cursor(libvlc_media_player_t *p_mi, unsigned num, int *px,
+                        int *py);
+
+/** Release a media_player after use.
+ *
+ * \param p_mi the Media Player to free
+ */
+__attribute__((visibility("default"))) void
+libvlc_media_player_release(libvlc_media_player_t *p_mi);
+
+/** Retain a reference to a media player object.
+ *
+ * \param p_mi media player object
+ */
+__attribute__((visibility("default"))) void
+libvlc_media_player_retain(libvlc_media_player_t *p_mi);